@@ -0,0 +1,101 @@
+import threading
+from functools import cached_property
+import numpy as np
+import pandas as pd
+
+from data_handler import SeasonalView
+from trends import batch_trends
+
+# Mindestanzahl gültiger Tage im 365-Tage-Fenster des gleitenden Mittels;
+# einzelne fehlende Tage sollen die Kurve nicht unterbrechen
+ROLLING_MIN_DAYS = 330
+
+class AnalysisBundle:
+    """
+    Auswertungen einer Datenladung, die von allen Diagrammen gemeinsam genutzt werden
+
+    Gleitende Mittel, Jahresmittel, Trendgeraden, die saisonale Sicht und die
+    Monatssummen werden beim ersten Zugriff einmal berechnet und danach
+    wiederverwendet.
+    """
+
+    def __init__(self, daily_data, monthly_data=None):
+        """
+        Args:
+            daily_data: DataFrame mit täglichen Wetterdaten und DateTimeIndex
+            monthly_data: DataFrame mit monatlichen Wetterdaten (aus den Tagesdaten aggregiert)
+        """
+        self.daily = daily_data
+        self.monthly = monthly_data if monthly_data is not None else pd.DataFrame()
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    @cached_property
+    def rolling_tavg(self):
+        """Gleitender 365-Tage-Mittelwert der Durchschnittstemperatur"""
+        return self.daily['tavg'].rolling(window=365, center=True, min_periods=ROLLING_MIN_DAYS).mean()
+
+    @cached_property
+    def monthly_prcp(self):
+        """Monatliche Niederschlagssummen"""
+        if 'prcp' in self.monthly.columns:
+            return self.monthly['prcp'].dropna()
+        return self.daily['prcp'].resample('MS').sum()
+
+    @cached_property
+    def rolling_monthly_prcp(self):
+        """Gleitender 12-Monats-Mittelwert der Niederschlagssummen"""
+        return self.monthly_prcp.rolling(window=12, center=True).mean()
+
+    @cached_property
+    def seasonal(self):
+        """Saisonale Sicht auf die Tagesdaten"""
+        return SeasonalView(self.daily)
+
+    @cached_property
+    def yearly_means(self):
+        """Jahresmittel aller numerischen Variablen in einem groupby-Durchlauf"""
+        numeric = self.daily.select_dtypes(include='number')
+        return numeric.groupby(self.daily.index.year).mean()
+
+    def trend(self, variable):
+        """
+        Lineare Trendgerade der Jahresmittel einer Variable
+
+        Returns:
+            np.poly1d mit Steigung pro Jahr (über den Jahresindex 0..n-1)
+        """
+        def fit():
+            yearly = self.yearly_means[variable]
+            return np.poly1d(np.polyfit(range(len(yearly)), yearly.values, 1))
+
+        return self.cached(('trend', variable), fit)
+
+    def trend_test(self, variable):
+        """
+        Sen-Steigung und Mann-Kendall-Test der Jahresmittel einer Variable
+
+        Returns:
+            Dictionary mit den Kennzahlen aus trends.TREND_COLUMNS (NaN bei zu wenigen Jahren)
+        """
+        def compute():
+            yearly = self.yearly_means[variable]
+            result = batch_trends(yearly.to_numpy(dtype=float)[np.newaxis], yearly.index.to_numpy())
+            return {name: values[0] for name, values in result.items()}
+
+        return self.cached(('trend_test', variable), compute)
+
+    def cached(self, key, compute):
+        """
+        Gibt ein zwischengespeichertes Ergebnis zurück oder berechnet es einmalig
+
+        Args:
+            key: Schlüssel des Ergebnisses
+            compute: Funktion ohne Argumente, die das Ergebnis berechnet
+        """
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        result = compute()
+        with self._lock:
+            return self._cache.setdefault(key, result)
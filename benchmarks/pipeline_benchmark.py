@@ -0,0 +1,360 @@
+"""
+Misst Laufzeit, Spitzenspeicher und Figurgröße der Datenpipeline bei wachsender Datenmenge
+
+Gemessen werden das Laden über KasselWeatherData (leerer und gefüllter Speicher),
+calculate_statistics, get_seasonal_data und die Plot-Methoden des WeatherVisualizer
+für 10, 50 und 100 Jahre sowie das Laden und Auswerten von 1, 10 und 100 Stationen.
+Meteostat wird durch den deterministischen Generator in synthetic_meteostat.py ersetzt,
+es wird keine Netzwerkverbindung benötigt.
+
+Die Ergebnisse werden je Commit gespeichert und können mit einem früheren Lauf
+verglichen werden (Rückgabewert 1 bei Verschlechterungen über der Schwelle):
+
+Aufruf (im Projektordner):
+    python benchmarks/pipeline_benchmark.py --save
+    python benchmarks/pipeline_benchmark.py --years 10 50 --stations 1 10 --compare benchmarks/results/pipeline-<commit>.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import plotly
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import data_sources
+from analysis import AnalysisBundle
+from data_handler import KasselWeatherData
+from synthetic_meteostat import CALLS, STATION_COUNT, install, reset_calls, synthetic_stations
+from trends import TrendEngine
+from visualizations import WeatherVisualizer
+
+# Größenstufen: Anzahl Jahre (eine Station) und Anzahl Stationen (STATION_YEARS Jahre)
+YEAR_SIZES = [10, 50, 100]
+STATION_SIZES = [1, 10, 100]
+STATION_YEARS = 30
+
+# Letztes Jahr aller Zeiträume, damit die Läufe unabhängig vom Datum vergleichbar sind
+END_YEAR = 2023
+
+# Punktzahl der Zeitreihen wie in dashboard.py
+MAX_PLOT_POINTS = 2000
+
+# Standardschwelle für den Vergleich (Verhältnis neu/alt, ab dem eine Kennzahl als verschlechtert gilt)
+REGRESSION_THRESHOLD = 1.25
+
+# Kennzahlen eines Ergebnisses, die verglichen werden
+METRICS = ['seconds', 'peak_bytes', 'json_seconds', 'json_bytes']
+
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+
+def git_revision():
+    """Kurzer Hash des aktuellen Commits (mit '-dirty' bei lokalen Änderungen) oder 'unknown'"""
+    cwd = os.path.dirname(BENCHMARK_DIR)
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=cwd, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=cwd,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        return f"{revision}-dirty" if status else revision
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def measure(stage, repeat, setup=None):
+    """
+    Misst eine Stufe: minimale Laufzeit über mehrere Wiederholungen und den Spitzenspeicher
+
+    Der Spitzenspeicher wird in einem zusätzlichen Lauf mit tracemalloc ermittelt, da die
+    Speicherverfolgung die Laufzeit verfälschen würde.
+
+    Args:
+        stage: Funktion, die die gemessene Arbeit ausführt
+        repeat: Anzahl der Zeitmessungen (das Minimum zählt)
+        setup: Funktion ohne Argumente, die vor jedem Lauf ungemessen die Argumente für stage liefert
+
+    Returns:
+        Tupel (Ergebnis des letzten Laufs, Dictionary mit 'seconds' und 'peak_bytes')
+    """
+    timings = []
+    for _ in range(repeat):
+        args = setup() if setup is not None else ()
+        start = time.perf_counter()
+        result = stage(*args)
+        timings.append(time.perf_counter() - start)
+
+    args = setup() if setup is not None else ()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        result = stage(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, {'seconds': min(timings), 'peak_bytes': peak}
+
+def measure_figure(build, repeat):
+    """
+    Misst den Aufbau einer Figur und zusätzlich deren JSON-Serialisierung wie bei der Auslieferung durch Dash
+
+    Args:
+        build: Funktion ohne Argumente, die die Figur mit einem frischen AnalysisBundle erzeugt
+
+    Returns:
+        Dictionary mit 'seconds', 'peak_bytes', 'json_seconds' und 'json_bytes'
+    """
+    fig, metrics = measure(build, repeat)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payload = fig.to_json()
+        timings.append(time.perf_counter() - start)
+    metrics['json_seconds'] = min(timings)
+    metrics['json_bytes'] = len(payload.encode('utf-8'))
+    return metrics
+
+class Workspace:
+    """Temporäre Speicherordner; jeder Lauf mit leerem Speicher erhält einen neuen Ordner"""
+
+    def __init__(self):
+        self._root = tempfile.TemporaryDirectory(prefix='wetter-bench-')
+        self._count = 0
+
+    def handler(self):
+        """KasselWeatherData mit einem neuen, leeren Speicher"""
+        self._count += 1
+        return KasselWeatherData(cache_dir=os.path.join(self._root.name, str(self._count)))
+
+    def cleanup(self):
+        self._root.cleanup()
+
+def year_suite(workspace, years, repeat, station_id):
+    """
+    Stufen für eine Station über `years` Jahre
+
+    Returns:
+        Liste von Ergebnissen (Dictionary je Stufe)
+    """
+    start_date, end_date = datetime(END_YEAR - years + 1, 1, 1), datetime(END_YEAR, 12, 31)
+    visualizer = WeatherVisualizer()
+    results = []
+
+    def record(stage, metrics):
+        results.append({'suite': 'years', 'size': years, 'stage': stage, **metrics})
+
+    def cold_handler():
+        # Stationskatalog vorab laden, gemessen wird nur der Datenabruf
+        handler = workspace.handler()
+        handler.get_station_info()
+        return (handler,)
+
+    _, metrics = measure(lambda handler: handler.get_daily_and_monthly_data(start_date, end_date, station_id),
+                         repeat, setup=cold_handler)
+    record('get_daily_and_monthly_data (leer)', metrics)
+
+    handler = cold_handler()[0]
+    handler.get_daily_and_monthly_data(start_date, end_date, station_id)
+    (daily, monthly), metrics = measure(lambda: handler.get_daily_and_monthly_data(start_date, end_date, station_id), repeat)
+    record('get_daily_and_monthly_data (Speicher)', metrics)
+
+    _, metrics = measure(lambda: handler.calculate_statistics(daily), repeat)
+    record('calculate_statistics', metrics)
+
+    # Die saisonale Sicht ist verzögert, gemessen wird daher auch der Zugriff auf alle Jahreszeiten
+    _, metrics = measure(lambda: dict(handler.get_seasonal_data(daily).items()), repeat)
+    record('get_seasonal_data', metrics)
+
+    # Normalwerte einmal vorab berechnen, gemessen wird die Abweichung mit gespeicherter Normalwerttabelle
+    handler.get_normals(station_id)
+    _, metrics = measure(lambda: handler.get_anomalies(daily, station_id), repeat)
+    record('get_anomalies', metrics)
+    anomaly_data = handler.get_anomalies(daily, station_id)
+
+    # Jede Figur mit eigenem Bundle, damit die gemeinsamen Auswertungen der Figur zugerechnet werden
+    figures = {
+        'plot_weather_dashboard': lambda: visualizer.plot_weather_dashboard(
+            daily, monthly, max_points=MAX_PLOT_POINTS, bundle=AnalysisBundle(daily, monthly)),
+        'plot_temperature_trend': lambda: visualizer.plot_temperature_trend(
+            daily, max_points=MAX_PLOT_POINTS, bundle=AnalysisBundle(daily, monthly)),
+        'plot_precipitation': lambda: visualizer.plot_precipitation(daily, bundle=AnalysisBundle(daily, monthly)),
+        'plot_seasonal_comparison': lambda: visualizer.plot_seasonal_comparison(
+            None, 'tavg', bundle=AnalysisBundle(daily, monthly)),
+        'plot_yearly_trend': lambda: visualizer.plot_yearly_trend(daily, 'tavg', bundle=AnalysisBundle(daily, monthly)),
+        'plot_anomalies': lambda: visualizer.plot_anomalies(anomaly_data, 'tavg')
+    }
+    for name, build in figures.items():
+        record(name, measure_figure(build, repeat))
+    return results
+
+def station_suite(workspace, stations, repeat, years=STATION_YEARS):
+    """
+    Stufen für die `stations` nächsten Stationen über `years` Jahre
+
+    Returns:
+        Liste von Ergebnissen (Dictionary je Stufe)
+    """
+    start_date, end_date = datetime(END_YEAR - years + 1, 1, 1), datetime(END_YEAR, 12, 31)
+    results = []
+
+    def record(stage, metrics):
+        results.append({'suite': 'stations', 'size': stations, 'stage': stage, **metrics})
+
+    handler = workspace.handler()
+    handler.get_station_info()
+    _, metrics = measure(lambda: handler.find_stations(k=stations), repeat)
+    record('find_stations', metrics)
+
+    def cold_handler():
+        cold = workspace.handler()
+        cold.get_station_info()
+        return (cold,)
+
+    _, metrics = measure(lambda cold: cold.load_station_array(start_date, end_date, k=stations), repeat, setup=cold_handler)
+    record('load_station_array (leer)', metrics)
+
+    handler.load_station_array(start_date, end_date, k=stations)
+    array, metrics = measure(lambda: handler.load_station_array(start_date, end_date, k=stations), repeat)
+    record('load_station_array (Speicher)', metrics)
+
+    _, metrics = measure(lambda: array.station_statistics(), repeat)
+    record('station_statistics', metrics)
+
+    _, metrics = measure(lambda: array.regional_mean(), repeat)
+    record('regional_mean', metrics)
+
+    _, metrics = measure(lambda: array.events(), repeat)
+    record('events', metrics)
+
+    # Neue Engine je Lauf, damit nicht der Ergebnis-Cache gemessen wird; ohne Prozess-Pool für vergleichbare Zeiten
+    _, metrics = measure(lambda engine: engine.station_table(array), repeat,
+                         setup=lambda: (TrendEngine(max_workers=1),))
+    record('trend_table', metrics)
+    return results
+
+def run(year_sizes=YEAR_SIZES, station_sizes=STATION_SIZES, repeat=3, station_years=STATION_YEARS, latency=0.0):
+    """
+    Führt beide Messreihen aus
+
+    Returns:
+        Dictionary mit 'meta' (Commit, Umgebung, Parameter) und 'results' (Liste je Stufe und Größe)
+    """
+    workspace = Workspace()
+    results = []
+    reset_calls()
+    try:
+        with install(data_sources, stations=max([STATION_COUNT] + list(station_sizes)), latency=latency):
+            station_id = synthetic_stations(1).index[0]
+            for years in year_sizes:
+                print(f"Jahre: {years}")
+                results += year_suite(workspace, years, repeat, station_id)
+            for stations in station_sizes:
+                print(f"Stationen: {stations}")
+                results += station_suite(workspace, stations, repeat, station_years)
+    finally:
+        workspace.cleanup()
+
+    meta = {
+        'commit': git_revision(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'plotly': plotly.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'repeat': repeat,
+        'station_years': station_years,
+        'end_year': END_YEAR,
+        'latency': latency,
+        'meteostat_calls': dict(CALLS)
+    }
+    return {'meta': meta, 'results': results}
+
+def compare(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Vergleicht zwei Läufe je Stufe, Größe und Kennzahl
+
+    Returns:
+        DataFrame mit Spalten 'suite', 'size', 'stage', 'metric', 'baseline', 'current', 'ratio', 'regression'
+    """
+    def frame(run):
+        return pd.DataFrame(run['results']).melt(id_vars=['suite', 'size', 'stage'], var_name='metric').dropna(subset=['value'])
+
+    merged = frame(baseline).merge(frame(current), on=['suite', 'size', 'stage', 'metric'],
+                                   suffixes=('_baseline', '_current'))
+    merged = merged.rename(columns={'value_baseline': 'baseline', 'value_current': 'current'})
+    merged = merged[merged['metric'].isin(METRICS)]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        merged['ratio'] = merged['current'].astype(float) / merged['baseline'].astype(float)
+    merged['regression'] = merged['ratio'] > threshold
+    return merged.reset_index(drop=True)
+
+def format_value(metric, value):
+    """Kennzahl lesbar formatieren"""
+    if metric.endswith('seconds'):
+        return f"{value * 1000:9.1f} ms"
+    return f"{value / 1024:9.0f} kB"
+
+def main():
+    parser = argparse.ArgumentParser(description="Laufzeit, Speicher und Figurgröße der Datenpipeline messen")
+    parser.add_argument('--years', type=int, nargs='+', default=YEAR_SIZES, help="Anzahl Jahre für eine Station")
+    parser.add_argument('--stations', type=int, nargs='+', default=STATION_SIZES, help="Anzahl Stationen")
+    parser.add_argument('--station-years', type=int, default=STATION_YEARS, help="Jahre je Station in der Stationsreihe")
+    parser.add_argument('--repeat', type=int, default=3, help="Wiederholungen je Stufe (das Minimum zählt)")
+    parser.add_argument('--latency', type=float, default=0.0, help="Künstliche Antwortzeit je Abruf in Sekunden")
+    parser.add_argument('--save', action='store_true', help=f"Ergebnisse als {RESULTS_DIR}/pipeline-<commit>.json speichern")
+    parser.add_argument('--output', help="Ergebnisse unter diesem Pfad als JSON speichern")
+    parser.add_argument('--compare', help="Früheres Ergebnis (JSON), mit dem verglichen wird")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="Verhältnis neu/alt, ab dem eine Kennzahl als verschlechtert gilt")
+    args = parser.parse_args()
+
+    current = run(args.years, args.stations, args.repeat, args.station_years, args.latency)
+
+    print(f"\nCommit {current['meta']['commit']}, Minimum aus {args.repeat} Läufen")
+    for suite, group in pd.DataFrame(current['results']).groupby('suite', sort=False):
+        print(f"\n{'Jahre' if suite == 'years' else 'Stationen'}")
+        for _, row in group.iterrows():
+            line = f"  {row['size']:>4} {row['stage']:<40} {format_value('seconds', row['seconds'])} " \
+                   f"{format_value('peak_bytes', row['peak_bytes'])}"
+            if not pd.isna(row.get('json_bytes', np.nan)):
+                line += f"  JSON {format_value('json_bytes', row['json_bytes'])}"
+            print(line)
+
+    paths = []
+    if args.save:
+        paths.append(os.path.join(RESULTS_DIR, f"pipeline-{current['meta']['commit']}.json"))
+    if args.output:
+        paths.append(args.output)
+    for path in paths:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+        print(f"\nErgebnisse gespeichert: {path}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        comparison = compare(current, baseline, args.threshold)
+        regressions = comparison[comparison['regression']]
+        print(f"\nVergleich mit {baseline['meta']['commit']}: {len(comparison)} Kennzahlen, "
+              f"{len(regressions)} über Faktor {args.threshold}")
+        for _, row in regressions.iterrows():
+            print(f"  {row['suite']:<8} {row['size']:>4} {row['stage']:<40} {row['metric']:<12} "
+                  f"{format_value(row['metric'], row['baseline'])} -> {format_value(row['metric'], row['current'])} "
+                  f"(x{row['ratio']:.2f})")
+        if not regressions.empty:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Misst den Durchsatz des Bildexports (Grafiken pro Sekunde) für beide Renderer
+
+Verglichen werden der Plotly/Kaleido-Export des WeatherVisualizer und der
+Matplotlib-Renderer (Agg) für alle Grafiken des Exports. Die Daten sind
+synthetisch, es wird keine Verbindung zu Meteostat benötigt.
+
+Aufruf (im Projektordner):
+    python benchmarks/render_benchmark.py --years 30 --repeat 3 --output benchmarks/results/render.json
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis import AnalysisBundle
+from data_handler import KasselWeatherData
+from static_renderer import StaticWeatherRenderer
+from visualizations import WeatherVisualizer
+
+# Grafiken des Exports: (Figurtyp, Variable)
+CHARTS = [
+    ('dashboard', None),
+    ('temperature', 'tavg'),
+    ('precipitation', 'prcp'),
+    ('seasonal', 'tavg'),
+    ('seasonal', 'prcp'),
+    ('trend', 'tavg'),
+    ('trend', 'prcp')
+]
+
+def synthetic_daily(years, seed=0):
+    """Erzeugt plausible Tageswerte (Jahresgang plus Rauschen) für die angegebene Anzahl Jahre"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(f"{2024 - years}-01-01", "2023-12-31", freq='D', name='time')
+    doy = index.dayofyear.to_numpy()
+    tavg = 9 + 9 * np.sin(2 * np.pi * (doy - 110) / 365.25) + rng.normal(0, 3, len(index))
+    return pd.DataFrame({
+        'tavg': tavg.round(1),
+        'tmin': (tavg - rng.uniform(2, 6, len(index))).round(1),
+        'tmax': (tavg + rng.uniform(3, 7, len(index))).round(1),
+        'prcp': np.where(rng.random(len(index)) < 0.5, 0.0, rng.gamma(1, 4, len(index))).round(1),
+        'wspd': rng.gamma(3, 4, len(index)).round(1),
+        'wpgt': np.nan,
+        'pres': rng.normal(1015, 8, len(index)).round(1),
+        'tsun': rng.uniform(0, 600, len(index)).round(0)
+    }, index=index)
+
+def plotly_render(visualizer, bundle, figure_type, variable, to_image):
+    """Erzeugt eine Plotly-Figur wie die App und rendert sie optional über Kaleido"""
+    daily, monthly = bundle.daily, bundle.monthly
+    if figure_type == 'dashboard':
+        fig = visualizer.plot_weather_dashboard(daily, monthly, max_points=2000, bundle=bundle)
+    elif figure_type == 'temperature':
+        fig = visualizer.plot_temperature_trend(daily, max_points=2000, bundle=bundle)
+    elif figure_type == 'precipitation':
+        fig = visualizer.plot_precipitation(daily, bundle=bundle)
+    elif figure_type == 'seasonal':
+        fig = visualizer.plot_seasonal_comparison(None, variable, bundle=bundle)
+    else:
+        fig = visualizer.plot_yearly_trend(daily, variable, bundle=bundle)
+    return fig.to_image(format='png') if to_image else fig.to_json()
+
+def matplotlib_render(renderer, bundle, figure_type, variable):
+    """Rendert eine Grafik mit Matplotlib als PNG in den Speicher"""
+    buffer = io.BytesIO()
+    renderer.render(figure_type, variable, bundle).savefig(buffer, format='png', dpi=renderer.dpi)
+    return buffer.getvalue()
+
+def kaleido_available(visualizer, bundle):
+    """Prüft, ob Kaleido Bilder erzeugen kann (benötigt Chrome)"""
+    try:
+        plotly_render(visualizer, bundle, 'trend', 'tavg', to_image=True)
+        return True
+    except Exception as e:
+        print(f"Kaleido nicht verfügbar, gemessen wird nur der Figurenaufbau: {str(e).strip().splitlines()[0]}")
+        return False
+
+def measure(render, repeat):
+    """Minimale Laufzeit über mehrere Wiederholungen in Sekunden"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def run(years, repeat):
+    """
+    Führt den Benchmark aus
+
+    Returns:
+        Dictionary mit Laufzeiten je Renderer und Grafik sowie dem Durchsatz
+    """
+    daily = synthetic_daily(years)
+    monthly = KasselWeatherData().aggregate(daily, 'M')
+    visualizer = WeatherVisualizer()
+    renderer = StaticWeatherRenderer(visualizer)
+    to_image = kaleido_available(visualizer, AnalysisBundle(daily, monthly))
+
+    backends = {
+        'plotly_kaleido' if to_image else 'plotly_json': lambda bundle, t, v: plotly_render(visualizer, bundle, t, v, to_image),
+        'matplotlib_agg': lambda bundle, t, v: matplotlib_render(renderer, bundle, t, v)
+    }
+
+    results = {'years': years, 'days': len(daily), 'repeat': repeat, 'backends': {}}
+    for name, render in backends.items():
+        # Wie beim Export: ein Bundle je Auftrag, die Auswertungen werden einmal berechnet
+        bundle = AnalysisBundle(daily, monthly)
+        charts = {}
+        for figure_type, variable in CHARTS:
+            charts[f"{figure_type}:{variable}"] = measure(lambda: render(bundle, figure_type, variable), repeat)
+        total = sum(charts.values())
+        results['backends'][name] = {
+            'seconds': charts,
+            'total_seconds': total,
+            'charts_per_second': len(CHARTS) / total if total else float('inf')
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Durchsatz des Grafikexports messen")
+    parser.add_argument('--years', type=int, default=30, help="Anzahl Jahre synthetischer Tagesdaten")
+    parser.add_argument('--repeat', type=int, default=3, help="Wiederholungen je Grafik (das Minimum zählt)")
+    parser.add_argument('--output', help="Ergebnisse zusätzlich als JSON speichern")
+    args = parser.parse_args()
+
+    results = run(args.years, args.repeat)
+
+    print(f"{results['days']} Tage ({results['years']} Jahre), Minimum aus {results['repeat']} Läufen")
+    for name, backend in results['backends'].items():
+        print(f"\n{name}: {backend['charts_per_second']:.1f} Grafiken/s ({backend['total_seconds']:.2f} s gesamt)")
+        for chart, seconds in backend['seconds'].items():
+            print(f"  {chart:<20} {seconds * 1000:8.1f} ms")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
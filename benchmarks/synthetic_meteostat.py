@@ -0,0 +1,304 @@
+"""
+Deterministischer Ersatz für die Meteostat-Klassen Point, Daily, Monthly, Hourly und Stations
+
+Die Werte werden aus einem einfachen Klimamodell (Jahresgang, Erwärmungstrend,
+Höhenkorrektur, Rauschen, Datenlücken) erzeugt. Der Zufallsgenerator wird je Station
+und Jahr aus den Koordinaten initialisiert, sodass ein Tag unabhängig vom abgefragten
+Zeitraum immer denselben Wert hat und gespeicherte Partitionen zu späteren Abrufen passen.
+
+Verwendung (nur in Benchmarks, die App verwendet weiterhin Meteostat):
+    import data_sources
+    from synthetic_meteostat import install
+    with install(data_sources, stations=100):
+        KasselWeatherData(cache_dir=...).get_daily_data(...)
+"""
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Startwert aller Zufallsgeneratoren
+SEED = 2024
+
+# Mittelpunkt des synthetischen Stationsnetzes (Kassel-Mitte)
+CENTER = (51.3127, 9.4797)
+
+# Anzahl der Stationen im synthetischen Katalog
+STATION_COUNT = 120
+
+# Klimamodell: Jahresmittel in 200 m Höhe, Amplitude des Jahresgangs, Erwärmung ab 1950 je Jahr
+BASE_TEMPERATURE = 9.0
+ANNUAL_AMPLITUDE = 9.0
+WARMING_PER_YEAR = 0.025
+LAPSE_RATE = 0.0065
+
+# Anteil fehlender Tage und erstes Jahr mit Spitzenböen bzw. Sonnenscheindauer
+MISSING_FRACTION = 0.01
+WPGT_START_YEAR = 1990
+TSUN_START_YEAR = 1950
+
+DAILY_COLUMNS = ['tavg', 'tmin', 'tmax', 'prcp', 'snow', 'wdir', 'wspd', 'wpgt', 'pres', 'tsun']
+HOURLY_COLUMNS = ['temp', 'dwpt', 'rhum', 'prcp', 'snow', 'wdir', 'wspd', 'wpgt', 'pres', 'tsun', 'coco']
+
+# Anzahl der Abrufe je Klasse (z.B. um Cache-Treffer im Benchmark zu prüfen)
+CALLS = {'daily': 0, 'monthly': 0, 'hourly': 0, 'stations': 0}
+_calls_lock = threading.Lock()
+
+# Künstliche Antwortzeit je Abruf in Sekunden (simuliert die Netzwerklatenz)
+LATENCY = 0.0
+
+def _count(kind):
+    """Zählt einen Abruf und wartet die eingestellte Latenz ab"""
+    with _calls_lock:
+        CALLS[kind] += 1
+    if LATENCY > 0:
+        time.sleep(LATENCY)
+
+def reset_calls():
+    """Setzt die Abrufzähler zurück"""
+    with _calls_lock:
+        for kind in CALLS:
+            CALLS[kind] = 0
+
+def synthetic_stations(count=STATION_COUNT, seed=SEED):
+    """
+    Erzeugt einen Stationskatalog im Format von Stations.fetch()
+
+    Die erste Station liegt nahe Kassel-Mitte, die übrigen zufällig in bis zu etwa 150 km Entfernung.
+    Jede Station hat einen eigenen Zufallsgenerator, sodass die ersten Stationen nicht von `count` abhängen.
+
+    Returns:
+        DataFrame mit Index 'id' und den Spalten des Meteostat-Katalogs
+    """
+    draws = np.array([np.random.default_rng([seed, i]).uniform(0, 1, 3) for i in range(count)]).reshape(count, 3)
+    distance = np.sqrt(draws[:, 0]) * 150.0
+    distance[:1] = 2.0
+    bearing = 2 * np.pi * draws[:, 1]
+    latitude = CENTER[0] + distance * np.cos(bearing) / 111.2
+    longitude = CENTER[1] + distance * np.sin(bearing) / (111.2 * np.cos(np.radians(CENTER[0])))
+    elevation = 100 + 700 * draws[:, 2]
+    ids = [f"{10400 + i:05d}" for i in range(count)]
+    return pd.DataFrame({
+        'name': [f"Station {i + 1}" for i in range(count)],
+        'country': 'DE',
+        'region': 'HE',
+        'wmo': ids,
+        'icao': None,
+        'latitude': latitude.round(4),
+        'longitude': longitude.round(4),
+        'elevation': elevation.round(0),
+        'timezone': 'Europe/Berlin',
+        'hourly_start': pd.Timestamp('1950-01-01'),
+        'hourly_end': pd.Timestamp('2099-12-31'),
+        'daily_start': pd.Timestamp('1900-01-01'),
+        'daily_end': pd.Timestamp('2099-12-31'),
+        'monthly_start': pd.Timestamp('1900-01-01'),
+        'monthly_end': pd.Timestamp('2099-12-31')
+    }, index=pd.Index(ids, name='id'))
+
+_catalog = synthetic_stations()
+
+def _location(loc):
+    """Koordinaten und Höhe eines Orts (Point, auch von meteostat, oder Stations-ID)"""
+    if not isinstance(loc, str):
+        # meteostat speichert die Koordinaten je nach Version als lat/lon oder _lat/_lon
+        lat, lon = getattr(loc, 'lat', getattr(loc, '_lat', None)), getattr(loc, 'lon', getattr(loc, '_lon', None))
+        alt = getattr(loc, 'alt', getattr(loc, '_alt', None))
+        return lat, lon, alt if alt is not None else 200.0
+    station = _catalog.loc[str(loc)]
+    return station['latitude'], station['longitude'], station['elevation']
+
+def _station_key(lat, lon):
+    """Reproduzierbarer Schlüssel aus den Koordinaten"""
+    return zlib.crc32(f"{lat:.4f},{lon:.4f}".encode())
+
+def _daily_year(lat, lon, alt, year):
+    """Tageswerte eines Kalenderjahres für einen Ort"""
+    rng = np.random.default_rng([SEED, _station_key(lat, lon), year])
+    index = pd.date_range(f"{year}-01-01", f"{year}-12-31", freq='D', name='time')
+    n = len(index)
+    phase = 2 * np.pi * (index.dayofyear.to_numpy() - 110) / 365.25
+
+    # Temperatur: Jahresgang, Höhen- und Breitenkorrektur, Erwärmung und autokorreliertes Rauschen
+    mean = BASE_TEMPERATURE - LAPSE_RATE * (alt - 200.0) - 0.6 * (lat - CENTER[0]) \
+        + WARMING_PER_YEAR * max(year - 1950, 0)
+    noise = rng.normal(0, 2.0, n)
+    noise[1:] += 0.6 * noise[:-1]
+    tavg = mean + ANNUAL_AMPLITUDE * np.sin(phase) + noise
+    spread = rng.uniform(2, 6, n) + 2 * np.sin(phase)
+
+    wet = rng.random(n) < 0.45
+    prcp = np.where(wet, rng.gamma(0.8, 5, n), 0.0)
+    data = pd.DataFrame({
+        'tavg': tavg,
+        'tmin': tavg - spread,
+        'tmax': tavg + spread + rng.uniform(0, 2, n),
+        'prcp': prcp,
+        'snow': np.where(tavg < -1, rng.uniform(0, 150, n), 0.0),
+        'wdir': rng.uniform(0, 360, n),
+        'wspd': rng.gamma(3, 4, n),
+        'wpgt': rng.gamma(5, 8, n) if year >= WPGT_START_YEAR else np.nan,
+        'pres': rng.normal(1015, 8, n),
+        'tsun': np.clip(rng.normal(300 + 200 * np.sin(phase), 150, n), 0, None) if year >= TSUN_START_YEAR else np.nan
+    }, index=index)
+
+    # Auflösung wie bei Meteostat (eine Nachkommastelle bzw. ganze Zahlen) und einzelne fehlende Tage
+    data = data.round({'tavg': 1, 'tmin': 1, 'tmax': 1, 'prcp': 1, 'snow': 0, 'wdir': 0, 'wspd': 1,
+                       'wpgt': 1, 'pres': 1, 'tsun': 0})
+    data[rng.random(n) < MISSING_FRACTION] = np.nan
+    return data
+
+def daily_frame(lat, lon, alt, start, end):
+    """
+    Tageswerte eines Orts im Format von Daily.fetch()
+
+    Returns:
+        DataFrame mit Index 'time' und den Spalten aus DAILY_COLUMNS
+    """
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    if end < start:
+        return pd.DataFrame(columns=DAILY_COLUMNS, index=pd.DatetimeIndex([], name='time'))
+    frames = [_daily_year(lat, lon, alt, year) for year in range(start.year, end.year + 1)]
+    return pd.concat(frames).loc[start:end]
+
+class Point:
+    """Ersatz für meteostat.Point"""
+
+    def __init__(self, lat, lon, alt=None):
+        self.lat = lat
+        self.lon = lon
+        self.alt = alt
+
+class Daily:
+    """Ersatz für meteostat.Daily (ein Ort je Abfrage)"""
+
+    def __init__(self, loc, start=None, end=None, model=True, flags=False):
+        self._location = _location(loc)
+        self._start = start if start is not None else datetime(1890, 1, 1)
+        self._end = end if end is not None else datetime.now()
+
+    def fetch(self):
+        _count('daily')
+        return daily_frame(*self._location, self._start, self._end)
+
+class Monthly(Daily):
+    """Ersatz für meteostat.Monthly (Monatsmittel bzw. -summen der synthetischen Tageswerte)"""
+
+    def fetch(self):
+        _count('monthly')
+        daily = daily_frame(*self._location, self._start, self._end)
+        monthly = daily[['tavg', 'tmin', 'tmax', 'wspd', 'pres']].resample('MS').mean().round(1)
+        monthly['prcp'] = daily['prcp'].resample('MS').sum(min_count=1)
+        # Meteostat liefert die Sonnenscheindauer monatlich in Minuten
+        monthly['tsun'] = daily['tsun'].resample('MS').sum(min_count=1)
+        monthly.index.name = 'time'
+        return monthly[['tavg', 'tmin', 'tmax', 'prcp', 'wspd', 'pres', 'tsun']]
+
+class Hourly:
+    """Ersatz für meteostat.Hourly (Tagesgang um die synthetischen Tageswerte, Index in UTC)"""
+
+    def __init__(self, loc, start=None, end=None, timezone=None, model=True, flags=False):
+        self._location = _location(loc)
+        self._start = pd.Timestamp(start if start is not None else datetime(1950, 1, 1))
+        self._end = pd.Timestamp(end if end is not None else datetime.now())
+
+    def fetch(self):
+        _count('hourly')
+        index = pd.date_range(self._start, self._end, freq='h', name='time')
+        if index.empty:
+            return pd.DataFrame(columns=HOURLY_COLUMNS, index=index)
+        daily = daily_frame(*self._location, index[0], index[-1])
+        days = daily.reindex(index.normalize())
+        # Tiefstwert gegen 4 Uhr, Höchstwert gegen 14 Uhr Ortszeit (UTC+1)
+        diurnal = np.sin(2 * np.pi * (index.hour.to_numpy() - 8) / 24)
+        amplitude = (days['tmax'] - days['tmin']).to_numpy() / 2
+        temp = days['tavg'].to_numpy() + amplitude * diurnal
+        rhum = np.clip(80 - 15 * diurnal, 20, 100)
+        return pd.DataFrame({
+            'temp': temp.round(1),
+            'dwpt': (temp - (100 - rhum) / 5).round(1),
+            'rhum': rhum.round(0),
+            'prcp': (days['prcp'].to_numpy() / 24).round(1),
+            'snow': days['snow'].to_numpy(),
+            'wdir': days['wdir'].to_numpy(),
+            'wspd': days['wspd'].to_numpy(),
+            'wpgt': days['wpgt'].to_numpy(),
+            'pres': days['pres'].to_numpy(),
+            'tsun': np.where(diurnal > 0, 60 * diurnal, 0.0).round(0),
+            'coco': 1.0
+        }, index=index)
+
+class Stations:
+    """Ersatz für meteostat.Stations mit den Filtern nearby, region, bounds, id und inventory"""
+
+    def __init__(self):
+        _count('stations')
+        self._data = _catalog.copy()
+
+    def nearby(self, lat, lon, radius=None):
+        # Meteostat gibt die Entfernung in Metern an
+        lat1, lon1 = np.radians(lat), np.radians(lon)
+        lat2, lon2 = np.radians(self._data['latitude']), np.radians(self._data['longitude'])
+        a = np.sin((lat2 - lat1) / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2)**2
+        self._data = self._data.assign(distance=2 * 6371000.0 * np.arcsin(np.sqrt(a))).sort_values('distance')
+        if radius is not None:
+            self._data = self._data[self._data['distance'] <= radius]
+        return self
+
+    def region(self, country, state=None):
+        self._data = self._data[self._data['country'] == country]
+        if state is not None:
+            self._data = self._data[self._data['region'] == state]
+        return self
+
+    def bounds(self, top_left, bottom_right):
+        self._data = self._data[
+            (self._data['latitude'] <= top_left[0]) & (self._data['latitude'] >= bottom_right[0]) &
+            (self._data['longitude'] >= top_left[1]) & (self._data['longitude'] <= bottom_right[1])
+        ]
+        return self
+
+    def id(self, *args):
+        # meteostat erlaubt id(organization, code); der Code steht immer an letzter Stelle
+        codes = args[-1] if isinstance(args[-1], (list, tuple)) else [args[-1]]
+        self._data = self._data[self._data.index.isin([str(code) for code in codes])]
+        return self
+
+    def inventory(self, freq, required=True):
+        return self
+
+    def count(self):
+        return len(self._data)
+
+    def fetch(self, limit=None, sample=False):
+        if sample and limit:
+            return self._data.sample(limit, random_state=SEED)
+        return self._data.head(limit) if limit else self._data.copy()
+
+@contextmanager
+def install(module, stations=STATION_COUNT, latency=0.0):
+    """
+    Ersetzt die Meteostat-Klassen eines Moduls vorübergehend durch die synthetischen Klassen
+
+    Args:
+        module: Modul, das die Meteostat-Klassen importiert (z.B. data_sources)
+        stations: Anzahl der Stationen im synthetischen Katalog
+        latency: Künstliche Antwortzeit je Abruf in Sekunden
+    """
+    global _catalog, LATENCY
+    replacements = {'Point': Point, 'Daily': Daily, 'Monthly': Monthly, 'Hourly': Hourly, 'Stations': Stations}
+    originals = {name: getattr(module, name) for name in replacements if hasattr(module, name)}
+    previous = (_catalog, LATENCY)
+    _catalog, LATENCY = synthetic_stations(stations), latency
+    for name in originals:
+        setattr(module, name, replacements[name])
+    try:
+        yield
+    finally:
+        for name, original in originals.items():
+            setattr(module, name, original)
+        _catalog, LATENCY = previous
@@ -0,0 +1,177 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+from metrics import CACHE_REQUESTS
+
+# WMO-Referenzperiode für Klimanormalwerte
+REFERENCE_PERIOD = (1991, 2020)
+
+# Variablen, für die Normalwerte berechnet werden
+NORMAL_VARIABLES = ['tavg', 'tmin', 'tmax', 'prcp', 'wspd', 'pres', 'tsun']
+
+# Anzahl der Harmonischen des Jahresgangs für die Glättung der Tagesnormalwerte
+NORMAL_HARMONICS = 3
+
+# Mindestanzahl Jahre mit Daten in der Referenzperiode, sonst bleibt der Normalwert fehlend
+MIN_REFERENCE_YEARS = 10
+
+def calendar_index(index):
+    """
+    Position jedes Datums im Kalender eines Schaltjahres (0-365)
+
+    Der 29. Februar hat eine eigene Position, alle anderen Tage liegen in allen Jahren
+    auf derselben Position, sodass eine Normalwerttabelle mit 366 Zeilen für jedes Jahr passt.
+    """
+    index = pd.DatetimeIndex(index)
+    position = index.dayofyear.to_numpy() - 1
+    return position + ((~index.is_leap_year) & (index.month > 2)).astype(int)
+
+def _annual_phase():
+    """Phase des Jahresgangs (Bogenmaß) für die 366 Kalenderpositionen; der 29.02. liegt zwischen 28.02. und 01.03."""
+    days = np.arange(366, dtype=float)
+    days = np.where(days > 59, days - 1, np.where(days == 59, 58.5, days))
+    return 2 * np.pi * days / 365.0
+
+def compute_normals(data, variables=None, reference=REFERENCE_PERIOD, harmonics=NORMAL_HARMONICS,
+                    min_years=MIN_REFERENCE_YEARS):
+    """
+    Berechnet geglättete Tagesnormalwerte für die Referenzperiode
+
+    Die Mittel je Kalendertag werden über alle Variablen gleichzeitig mit np.bincount
+    gebildet und anschließend durch eine gewichtete Regression auf die ersten
+    Harmonischen des Jahresgangs geglättet.
+
+    Args:
+        data: DataFrame mit täglichen Wetterdaten und DateTimeIndex
+        variables: Variablen (default: alle vorhandenen aus NORMAL_VARIABLES)
+        reference: Referenzperiode (Startjahr, Endjahr)
+        harmonics: Anzahl der Harmonischen (0: nur Tagesmittel ohne Glättung)
+        min_years: Mindestanzahl Jahre mit Daten je Variable
+
+    Returns:
+        DataFrame mit 366 Zeilen (Index 'day': Position im Schaltjahreskalender) und einer Spalte je Variable
+    """
+    if variables is None:
+        variables = [col for col in NORMAL_VARIABLES if col in data.columns]
+    normals = pd.DataFrame(np.nan, index=pd.RangeIndex(366, name='day'), columns=variables)
+    if data.empty or not variables:
+        return normals
+
+    period = data.loc[f'{reference[0]}-01-01':f'{reference[1]}-12-31', variables]
+    if period.empty:
+        return normals
+
+    position = calendar_index(period.index)
+    values = period.to_numpy(dtype=float, na_value=np.nan)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+
+    sums = np.stack([np.bincount(position, weights=filled[:, i], minlength=366) for i in range(len(variables))], axis=1)
+    counts = np.stack([np.bincount(position, weights=valid[:, i], minlength=366) for i in range(len(variables))], axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        raw = sums / counts
+
+    if harmonics > 0:
+        phase = _annual_phase()
+        design = np.column_stack([np.ones(366)] + [f(k * phase) for k in range(1, harmonics + 1) for f in (np.cos, np.sin)])
+        for i in range(len(variables)):
+            # Kalendertage mit mehr Jahren gehen stärker in die Anpassung ein (der 29.02. entsprechend schwächer)
+            weights = np.sqrt(counts[:, i])
+            fit = weights > 0
+            if fit.sum() < design.shape[1]:
+                raw[:, i] = np.nan
+                continue
+            coefficients = np.linalg.lstsq(design[fit] * weights[fit, np.newaxis], raw[fit, i] * weights[fit], rcond=None)[0]
+            raw[:, i] = design @ coefficients
+
+    years = period.index.year.to_numpy()
+    for i in range(len(variables)):
+        if len(np.unique(years[valid[:, i]])) < min_years:
+            raw[:, i] = np.nan
+
+    normals[:] = raw
+    return normals
+
+def anomalies(data, normals, variables=None):
+    """
+    Abweichungen der Tageswerte von den Normalwerten
+
+    Die Normalwerttabelle wird über die Kalenderposition jedes Tages in einem Schritt
+    auf alle Tage verteilt und abgezogen.
+
+    Args:
+        data: DataFrame mit täglichen Wetterdaten und DateTimeIndex
+        normals: Normalwerttabelle aus compute_normals
+        variables: Variablen (default: alle in Daten und Normalwerten vorhandenen)
+
+    Returns:
+        DataFrame mit demselben Index und einer Spalte je Variable
+    """
+    if variables is None:
+        variables = [col for col in normals.columns if col in data.columns]
+    if data.empty or not variables:
+        return pd.DataFrame(index=data.index, columns=variables, dtype=float)
+
+    table = normals[variables].to_numpy(dtype=float)
+    values = data[variables].to_numpy(dtype=float, na_value=np.nan)
+    return pd.DataFrame(values - table[calendar_index(data.index)], index=data.index, columns=variables)
+
+class NormalsCache:
+    """Persistenter Speicher für berechnete Normalwerttabellen (eine Parquet-Datei je Station und Referenz)"""
+
+    def __init__(self, base_dir='cache/normals'):
+        """
+        Args:
+            base_dir: Verzeichnis der Normalwertdateien
+        """
+        self.base_dir = base_dir
+        self._memory = {}
+
+    def _path(self, station_key, reference, harmonics):
+        """Pfad der Normalwertdatei"""
+        return os.path.join(self.base_dir, f"station={station_key}",
+                            f"ref={reference[0]}-{reference[1]}_h{harmonics}.parquet")
+
+    def get(self, station_key, reference, harmonics, compute):
+        """
+        Gibt die Normalwerte aus dem Speicher zurück oder berechnet und speichert sie einmalig
+
+        Args:
+            station_key: Schlüssel der Station
+            reference: Referenzperiode (Startjahr, Endjahr)
+            harmonics: Anzahl der Harmonischen
+            compute: Funktion ohne Argumente, die die Normalwerttabelle berechnet
+
+        Returns:
+            DataFrame mit 366 Zeilen und einer Spalte je Variable
+        """
+        path = self._path(station_key, reference, harmonics)
+        normals = self._memory.get(path)
+        if normals is not None:
+            CACHE_REQUESTS.inc(cache='normals', result='hit')
+            return normals
+
+        if os.path.exists(path):
+            CACHE_REQUESTS.inc(cache='normals', result='hit')
+            normals = pd.read_parquet(path)
+        else:
+            CACHE_REQUESTS.inc(cache='normals', result='miss')
+            normals = compute()
+            # Tabellen ohne einen einzigen Normalwert (z.B. nach einem fehlgeschlagenen Abruf) nicht festhalten
+            if not normals.notna().any().any():
+                return normals
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            os.close(fd)
+            try:
+                normals.to_parquet(tmp_path)
+                os.replace(tmp_path, path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        self._memory[path] = normals
+        return normals
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+
+# Auflösung der Meteostat-Werte als Skalierungsfaktor für die ganzzahlige Speicherung
+# (z.B. 10 = eine Nachkommastelle). Die Faktoren dürfen nicht geändert werden, da
+# gespeicherte Partitionen beim Lesen mit denselben Faktoren zurückgerechnet werden.
+STORAGE_SCALES = {
+    'tavg': 10,
+    'tmin': 10,
+    'tmax': 10,
+    'prcp': 10,
+    'snow': 1,
+    'wdir': 1,
+    'wspd': 10,
+    'wpgt': 10,
+    'pres': 10,
+    'tsun': 1,
+    'temp': 10,
+    'dwpt': 10,
+    'rhum': 1,
+    'coco': 1
+}
+
+# Anteil fehlender Werte, ab dem eine Spalte bei aktivierter Sparse-Speicherung dünn besetzt gehalten wird
+SPARSE_THRESHOLD = 0.9
+
+def _integer_dtype(values):
+    """Kleinster ganzzahliger Typ für die skalierten Werte (int16 oder int32)"""
+    limit = np.abs(values).max() if len(values) else 0
+    return np.int16 if limit <= np.iinfo(np.int16).max else np.int32
+
+def encode_frame(data):
+    """
+    Wandelt Messwerte für die Speicherung in skalierte Ganzzahlen mit Null-Maske um
+
+    Spalten mit bekannter Auflösung (STORAGE_SCALES) werden als Int16/Int32 gespeichert,
+    sofern die Skalierung verlustfrei ist; alle übrigen Gleitkommaspalten als float32.
+
+    Args:
+        data: DataFrame mit Messwerten
+
+    Returns:
+        DataFrame mit kompakten Spaltentypen
+    """
+    columns = {}
+    for col in data.columns:
+        series = data[col]
+        if not pd.api.types.is_float_dtype(series.dtype):
+            continue
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        valid = ~np.isnan(values)
+        scale = STORAGE_SCALES.get(col)
+        if scale is not None:
+            scaled = values[valid] * scale
+            rounded = np.round(scaled)
+            if np.all(np.abs(scaled - rounded) < 1e-3) and np.all(np.abs(rounded) <= np.iinfo(np.int32).max):
+                integers = np.zeros(len(values), dtype=_integer_dtype(rounded))
+                integers[valid] = rounded
+                # Fehlende Werte stehen in der Maske, nicht als Sonderwert in den Daten
+                columns[col] = pd.arrays.IntegerArray(integers, ~valid)
+                continue
+        columns[col] = values.astype(np.float32)
+
+    if not columns:
+        return data
+    return data.assign(**{col: pd.Series(array, index=data.index) for col, array in columns.items()})
+
+def compact_frame(data, sparse_threshold=None):
+    """
+    Bringt Messwerte in die kompakte Darstellung für den Arbeitsspeicher
+
+    Skalierte Ganzzahlspalten aus dem Speicher werden in float32 zurückgerechnet,
+    float64-Spalten auf float32 verkleinert. Optional werden fast leere Spalten
+    (z.B. Böen oder Schneehöhe) dünn besetzt gehalten.
+
+    Args:
+        data: DataFrame mit Messwerten (gespeichert oder direkt von Meteostat)
+        sparse_threshold: Anteil fehlender Werte, ab dem eine Spalte dünn besetzt wird (None: nie)
+
+    Returns:
+        DataFrame mit float32- bzw. Sparse-Spalten
+    """
+    columns = {}
+    for col in data.columns:
+        series = data[col]
+        if isinstance(series.dtype, pd.SparseDtype):
+            continue
+        if col in STORAGE_SCALES and pd.api.types.is_integer_dtype(series.dtype):
+            values = series.to_numpy(dtype=np.float32, na_value=np.nan) / np.float32(STORAGE_SCALES[col])
+        elif pd.api.types.is_float_dtype(series.dtype):
+            values = series.to_numpy(dtype=np.float32, na_value=np.nan)
+        else:
+            continue
+        if sparse_threshold is not None and len(values) and np.isnan(values).mean() >= sparse_threshold:
+            values = pd.arrays.SparseArray(values, fill_value=np.nan)
+        columns[col] = values
+
+    if not columns:
+        return data
+    return data.assign(**{col: pd.Series(values, index=data.index) for col, values in columns.items()})
+
+def dense_frame(data):
+    """Wandelt dünn besetzte Spalten für Gruppierungen und Fensterfunktionen in dichte Spalten um"""
+    sparse = {col: data[col].dtype.subtype for col in data.columns if isinstance(data[col].dtype, pd.SparseDtype)}
+    return data.astype(sparse) if sparse else data
+
+def frame_nbytes(data):
+    """Speicherbedarf eines DataFrames einschließlich Index in Bytes"""
+    return int(data.memory_usage(index=True, deep=True).sum())
+
+def memory_report(datasets):
+    """
+    Speicherbedarf geladener Datensätze im Vergleich zur float64-Darstellung
+
+    Args:
+        datasets: Dictionary {Name: DataFrame}
+
+    Returns:
+        DataFrame mit einer Zeile je Datensatz und den Spalten 'rows', 'columns', 'bytes',
+        'float64_bytes', 'ratio' und 'sparse_columns'
+    """
+    rows = []
+    for name, data in datasets.items():
+        if data is None:
+            continue
+        numeric = [col for col in data.columns
+                   if pd.api.types.is_numeric_dtype(data[col].dtype) and not pd.api.types.is_bool_dtype(data[col].dtype)]
+        actual = frame_nbytes(data)
+        # Referenz: dieselben Messwerte als dichte float64-Spalten
+        baseline = actual - sum(int(data[col].memory_usage(index=False, deep=True)) for col in numeric) \
+            + 8 * len(data) * len(numeric)
+        rows.append({
+            'name': name,
+            'rows': len(data),
+            'columns': len(data.columns),
+            'bytes': actual,
+            'float64_bytes': baseline,
+            'ratio': actual / baseline if baseline else np.nan,
+            'sparse_columns': [col for col in data.columns if isinstance(data[col].dtype, pd.SparseDtype)]
+        })
+    return pd.DataFrame(rows, columns=['name', 'rows', 'columns', 'bytes', 'float64_bytes', 'ratio',
+                                       'sparse_columns']).set_index('name')
@@ -0,0 +1,1164 @@
+import dash
+from dash import dcc, html, callback, Output, Input
+import dash_bootstrap_components as dbc
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import os
+import re
+import threading
+import time
+import uuid
+from urllib.parse import urlencode
+from flask import Response, abort, g, request, stream_with_context
+
+# Eigene Module importieren
+from data_handler import KasselWeatherData
+from visualizations import WeatherVisualizer, VAR_TITLES
+from figure_cache import FigureCache, data_version
+from session_store import SessionDataStore
+from downsampling import parse_x_range
+from analysis import AnalysisBundle
+from export_jobs import ExportJobManager
+from data_export import EXPORT_FORMATS, STREAM_WRITERS
+from interpolation import IDWGrid, ELEVATION_DEPENDENT
+from compact import memory_report
+from climatology import REFERENCE_PERIOD
+from trends import TREND_PERIODS, TrendEngine
+from data_sources import source_from_spec
+from metrics import PROMETHEUS_CONTENT_TYPE, REGISTRY, RESPONSE_BYTES, STAGE_SECONDS, finished_traces, span, traced
+
+# Standardmäßige Zeiträume für die Analyse
+DEFAULT_START_YEAR = 2000
+DEFAULT_END_YEAR = datetime.now().year
+
+# Punktbudget je Linie für lange Tagesreihen (entspricht etwa der Breite eines Diagramms in Pixeln)
+MAX_PLOT_POINTS = 2000
+
+# Stationen für die Karte des Landkreises: Suchradius um Kassel, Höchstzahl und Gitterabstand
+MAP_RADIUS_KM = 60
+MAP_MAX_STATIONS = 20
+MAP_RESOLUTION_KM = 2.0
+
+# Höchstzahl zwischengespeicherter Interpolationsgitter (je Stationsmenge)
+MAP_GRID_CACHE_SIZE = 8
+
+# Initialisiere Datenhandler und Visualisierer
+# Datenquelle über WETTER_DATENQUELLE wählbar: 'meteostat' (Standard), 'local:<Verzeichnis>' oder 'dwd:<Verzeichnis>'
+data_handler = KasselWeatherData(source=source_from_spec(os.environ.get('WETTER_DATENQUELLE', 'meteostat')))
+visualizer = WeatherVisualizer()
+
+# Bereits erzeugte Figuren werden bei wiederholten Ansichten und beim Export wiederverwendet
+figure_cache = FigureCache()
+
+# Geladene Daten je Browser-Sitzung serverseitig ablegen (auch über mehrere Worker hinweg)
+session_store = SessionDataStore('sessions')
+
+# Trendanalyse aller Variablen und Jahreszeiten, Ergebnisse nach Datenversion zwischengespeichert
+trend_engine = TrendEngine()
+
+# Ordner für das Speichern von Grafiken erstellen
+EXPORT_FOLDER = 'exports'
+os.makedirs(EXPORT_FOLDER, exist_ok=True)
+
+# Exporte laufen im Hintergrund in einem Prozess-Pool, jeder Auftrag in einem eigenen Unterordner
+export_manager = ExportJobManager(EXPORT_FOLDER)
+
+# Dash-App initialisieren
+app = dash.Dash(
+    __name__,
+    external_stylesheets=[dbc.themes.BOOTSTRAP],
+    meta_tags=[{"name": "viewport", "content": "width=device-width, initial-scale=1"}],
+)
+app.title = "Wetteranalyse Kassel"
+server = app.server
+
+# Layout der App definieren
+main_layout = dbc.Container([
+    dbc.Row([
+        dbc.Col([
+            html.H1("Wetteranalyse Kassel und Landkreis", className="text-center my-4"),
+            html.P("Historische Datenanalyse und Visualisierung des Wetters in der Region Kassel", 
+                   className="text-center lead mb-4")
+        ], width=12)
+    ]),
+    
+    dbc.Row([
+        dbc.Col([
+            dbc.Card([
+                dbc.CardHeader("Datenauswahl"),
+                dbc.CardBody([
+                    html.P("Wählen Sie den Zeitraum für die Analyse:"),
+                    dbc.Row([
+                        dbc.Col([
+                            html.Label("Von Jahr:"),
+                            dcc.Dropdown(
+                                id="start-year-dropdown",
+                                options=[{"label": str(year), "value": year} for year in range(1980, datetime.now().year + 1)],
+                                value=DEFAULT_START_YEAR,
+                                clearable=False
+                            )
+                        ], width=6),
+                        dbc.Col([
+                            html.Label("Bis Jahr:"),
+                            dcc.Dropdown(
+                                id="end-year-dropdown",
+                                options=[{"label": str(year), "value": year} for year in range(1980, datetime.now().year + 1)],
+                                value=DEFAULT_END_YEAR,
+                                clearable=False
+                            )
+                        ], width=6)
+                    ]),
+                    html.Div(className="mt-3"),
+                    html.P("Wählen Sie eine Wetterstation in der Nähe von Kassel:"),
+                    dcc.Loading(
+                        id="loading-stations",
+                        type="default",
+                        children=[
+                            dcc.Dropdown(
+                                id="station-dropdown",
+                                placeholder="Wetterstation wird geladen...",
+                                value=None
+                            )
+                        ]
+                    ),
+                    html.Div(className="mt-3"),
+                    dbc.Button("Daten laden", id="load-data-button", color="primary", className="w-100 mt-2")
+                ])
+            ]),
+            
+            dbc.Card([
+                dbc.CardHeader("Statistiken"),
+                dbc.CardBody([
+                    dcc.Loading(
+                        id="loading-stats",
+                        type="default",
+                        children=[
+                            html.Div(id="statistics-container")
+                        ]
+                    )
+                ])
+            ], className="mt-3"),
+            
+            dbc.Card([
+                dbc.CardHeader("Datenexport"),
+                dbc.CardBody([
+                    dbc.RadioItems(
+                        id="export-backend",
+                        options=[
+                            {"label": "Matplotlib (schnell)", "value": "matplotlib"},
+                            {"label": "Plotly (wie Anzeige, benötigt Chrome)", "value": "plotly"}
+                        ],
+                        value="matplotlib",
+                        className="mb-2"
+                    ),
+                    dbc.Button("Grafiken exportieren", id="export-button", color="success", className="w-100"),
+                    dbc.Progress(id="export-progress", value=0, className="mt-2", style={"display": "none"}),
+                    dbc.Button("Export abbrechen", id="export-cancel-button", color="secondary", size="sm",
+                               className="w-100 mt-2", style={"display": "none"}),
+                    html.Div(id="export-status", className="mt-2"),
+                    dcc.Store(id="export-job-id"),
+                    dcc.Interval(id="export-progress-interval", interval=1000, disabled=True),
+                    html.Hr(),
+                    html.P("Rohdaten der Auswahl herunterladen:", className="mb-1"),
+                    html.Div(id="download-links")
+                ])
+            ], className="mt-3")
+        ], width=3),
+        
+        dbc.Col([
+            # Eingaben, mit denen die rechenintensiven Tabs zuletzt gezeichnet wurden
+            dcc.Store(id="map-rendered"),
+            dcc.Store(id="diurnal-rendered"),
+            dcc.Store(id="anomaly-rendered"),
+            dcc.Store(id="trend-rendered"),
+            dbc.Tabs([
+                dbc.Tab([
+                    dcc.Loading(
+                        id="loading-dashboard",
+                        type="default",
+                        children=[
+                            dcc.Graph(id="dashboard-graph", style={"height": "80vh"})
+                        ]
+                    )
+                ], label="Dashboard", tab_id="dashboard"),
+                
+                dbc.Tab([
+                    dcc.Loading(
+                        id="loading-temp",
+                        type="default",
+                        children=[
+                            dcc.Graph(id="temperature-graph", style={"height": "80vh"})
+                        ]
+                    )
+                ], label="Temperatur", tab_id="temperatur"),
+                
+                dbc.Tab([
+                    dcc.Loading(
+                        id="loading-precip",
+                        type="default",
+                        children=[
+                            dcc.Graph(id="precipitation-graph", style={"height": "80vh"})
+                        ]
+                    )
+                ], label="Niederschlag", tab_id="niederschlag"),
+                
+                dbc.Tab([
+                    dcc.Loading(
+                        id="loading-seasons",
+                        type="default",
+                        children=[
+                            dcc.Graph(id="seasonal-graph", style={"height": "80vh"})
+                        ]
+                    )
+                ], label="Jahreszeiten", tab_id="jahreszeiten"),
+                
+                dbc.Tab([
+                    dcc.Loading(
+                        id="loading-trend",
+                        type="default",
+                        children=[
+                            dcc.Graph(id="trend-graph", style={"height": "80vh"}),
+                            html.Div(id="trend-table", className="mt-3")
+                        ]
+                    )
+                ], label="Trends", tab_id="trends"),
+                
+                dbc.Tab([
+                    dbc.Row([
+                        dbc.Col([
+                            dcc.Dropdown(
+                                id="map-variable-dropdown",
+                                options=[
+                                    {"label": "Durchschnittstemperatur", "value": "tavg"},
+                                    {"label": "Maximale Temperatur", "value": "tmax"},
+                                    {"label": "Minimale Temperatur", "value": "tmin"},
+                                    {"label": "Niederschlag (Jahressumme)", "value": "prcp"}
+                                ],
+                                value="tavg",
+                                clearable=False
+                            )
+                        ], width=6),
+                        dbc.Col([
+                            dbc.Checklist(
+                                id="map-elevation-check",
+                                options=[{"label": "Höhenkorrektur (Temperatur)", "value": "elevation"}],
+                                value=["elevation"],
+                                switch=True
+                            )
+                        ], width=6)
+                    ], className="mt-2"),
+                    dcc.Loading(
+                        id="loading-map",
+                        type="default",
+                        children=[
+                            dcc.Graph(id="map-graph", style={"height": "75vh"})
+                        ]
+                    )
+                ], label="Karte", tab_id="karte"),
+                
+                dbc.Tab([
+                    dbc.Row([
+                        dbc.Col([
+                            dcc.Dropdown(
+                                id="diurnal-variable-dropdown",
+                                options=[
+                                    {"label": "Lufttemperatur", "value": "temp"},
+                                    {"label": "Relative Luftfeuchte", "value": "rhum"},
+                                    {"label": "Windgeschwindigkeit", "value": "wspd"}
+                                ],
+                                value="temp",
+                                clearable=False
+                            )
+                        ], width=6)
+                    ], className="mt-2"),
+                    dcc.Loading(
+                        id="loading-diurnal",
+                        type="default",
+                        children=[
+                            dcc.Graph(id="diurnal-graph", style={"height": "75vh"})
+                        ]
+                    )
+                ], label="Tagesgang", tab_id="tagesgang"),
+                
+                dbc.Tab([
+                    dbc.Row([
+                        dbc.Col([
+                            dcc.Dropdown(
+                                id="anomaly-variable-dropdown",
+                                options=[
+                                    {"label": "Durchschnittstemperatur", "value": "tavg"},
+                                    {"label": "Maximale Temperatur", "value": "tmax"},
+                                    {"label": "Minimale Temperatur", "value": "tmin"},
+                                    {"label": "Niederschlag", "value": "prcp"}
+                                ],
+                                value="tavg",
+                                clearable=False
+                            )
+                        ], width=6)
+                    ], className="mt-2"),
+                    dcc.Loading(
+                        id="loading-anomaly",
+                        type="default",
+                        children=[
+                            dcc.Graph(id="anomaly-graph", style={"height": "70vh"}),
+                            html.Div(id="anomaly-statistics")
+                        ]
+                    )
+                ], label="Anomalien", tab_id="anomalien")
+            ], id="tabs", active_tab="dashboard")
+        ], width=9)
+    ]),
+    
+    dbc.Row([
+        dbc.Col([
+            html.Hr(),
+            html.P([
+                "Datenquelle: ",
+                html.A("Meteostat", href="https://meteostat.net/de/", target="_blank"),
+                " | Daten aus offiziellen Wetterstationen des Deutschen Wetterdienstes (DWD) und anderen Quellen"
+            ], className="text-center text-muted")
+        ], width=12)
+    ])
+], fluid=True)
+
+def serve_layout():
+    """Erzeugt das Layout bei jedem Seitenaufruf mit einer eigenen Sitzungs-ID"""
+    return html.Div([
+        dcc.Store(id="session-id", data=uuid.uuid4().hex),
+        main_layout
+    ])
+
+app.layout = serve_layout
+
+# Callback zum Laden der Wetterstationen
+@app.callback(
+    [Output("station-dropdown", "options"),
+     Output("station-dropdown", "placeholder"),
+     Output("station-dropdown", "value"),
+     Output("load-data-button", "disabled")],
+    [Input("start-year-dropdown", "value")]
+)
+@traced('load_stations')
+def load_stations(start_year):
+    try:
+        with span('station_catalog'):
+            stations_df = data_handler.get_station_info()
+        
+        if stations_df.empty:
+            # Falls keine Stationen gefunden wurden, verwende eine Standardstation (Kassel Flughafen)
+            fallback_stations = [
+                {"label": "Kassel-Calden (10438) - Fallback", "value": "10438"},
+                {"label": "Fritzlar (10439) - Fallback", "value": "10439"},
+                {"label": "Kassel (03164) - Fallback", "value": "03164"}
+            ]
+            return fallback_stations, "Fallback-Station auswählen (API-Verbindungsproblem)", fallback_stations[0]["value"], False
+        
+        # Stationen nach Entfernung sortieren und in Dropdown-Optionen umwandeln
+        with span('options'):
+            options = [{"label": f"{row['name']} ({row['id']}) - {row['distance']:.1f} km", "value": row['id']} 
+                    for _, row in stations_df.iterrows()]
+        
+        if not options:
+            # Falls keine Stationen gefunden wurden, verwende eine Standardstation (Kassel Flughafen)
+            fallback_stations = [
+                {"label": "Kassel-Calden (10438) - Fallback", "value": "10438"},
+                {"label": "Fritzlar (10439) - Fallback", "value": "10439"},
+                {"label": "Kassel (03164) - Fallback", "value": "03164"}
+            ]
+            return fallback_stations, "Fallback-Station auswählen (keine Station gefunden)", fallback_stations[0]["value"], False
+        
+        # Automatisch die nächste Station auswählen (erste Station in der sortierten Liste)
+        default_station = options[0]["value"] if options else None
+        
+        return options, "Wetterstation auswählen", default_station, False
+    except Exception as e:
+        print(f"Fehler beim Laden der Stationen: {str(e)}")
+        # Falls ein Fehler auftritt, verwende eine Standardstation (Kassel Flughafen)
+        fallback_stations = [
+            {"label": "Kassel-Calden (10438) - Fallback", "value": "10438"},
+            {"label": "Fritzlar (10439) - Fallback", "value": "10439"},
+            {"label": "Kassel (03164) - Fallback", "value": "03164"}
+        ]
+        return fallback_stations, f"Fallback-Station auswählen (Fehler: {str(e)})", fallback_stations[0]["value"], False
+
+# Titel der Grafiken je (Figurtyp, Variable); gemeinsam für die Anzeige und beide Export-Renderer
+FIGURE_TITLES = {
+    ('dashboard', None): "Wetterdashboard Kassel ({start}-{end})",
+    ('temperature', 'tavg'): "Temperaturverlauf Kassel ({start}-{end})",
+    ('precipitation', 'prcp'): "Niederschlag Kassel ({start}-{end})",
+    ('seasonal', 'tavg'): "Temperaturverteilung nach Jahreszeiten ({start}-{end})",
+    ('seasonal', 'prcp'): "Niederschlagsverteilung nach Jahreszeiten ({start}-{end})",
+    ('trend', 'tavg'): "Jährlicher Temperaturtrend ({start}-{end})",
+    ('trend', 'prcp'): "Jährlicher Niederschlagstrend Kassel ({start}-{end})"
+}
+
+def build_figures(context, daily_data, monthly_data):
+    """
+    Gibt die Figuren der geladenen Daten zurück und nutzt dabei den Figuren-Cache
+    
+    Args:
+        context: Tupel (Station, Startjahr, Endjahr, Datenversion)
+        daily_data: DataFrame mit täglichen Wetterdaten
+        monthly_data: DataFrame mit monatlichen Wetterdaten
+        
+    Returns:
+        Funktion (Figurtyp, Variable) -> Plotly Figure-Objekt
+    """
+    station_id, start_year, end_year, version = context
+    # Gemeinsame Auswertungen der Datenladung; sie werden nur bei Cache-Fehlgriffen und dann einmal berechnet
+    bundle = AnalysisBundle(daily_data, monthly_data)
+    
+    titles = {key: template.format(start=start_year, end=end_year) for key, template in FIGURE_TITLES.items()}
+    
+    builders = {
+        ('dashboard', None): lambda: visualizer.plot_weather_dashboard(
+            daily_data,
+            monthly_data,
+            title=titles[('dashboard', None)],
+            max_points=MAX_PLOT_POINTS,
+            bundle=bundle
+        ),
+        ('temperature', 'tavg'): lambda: visualizer.plot_temperature_trend(
+            daily_data,
+            title=titles[('temperature', 'tavg')],
+            max_points=MAX_PLOT_POINTS,
+            bundle=bundle
+        ),
+        ('precipitation', 'prcp'): lambda: visualizer.plot_precipitation(
+            daily_data,
+            title=titles[('precipitation', 'prcp')],
+            bundle=bundle
+        ),
+        ('seasonal', 'tavg'): lambda: visualizer.plot_seasonal_comparison(
+            bundle.seasonal,
+            variable='tavg',
+            title=titles[('seasonal', 'tavg')],
+            bundle=bundle
+        ),
+        ('seasonal', 'prcp'): lambda: visualizer.plot_seasonal_comparison(
+            bundle.seasonal,
+            variable='prcp',
+            title=titles[('seasonal', 'prcp')],
+            bundle=bundle
+        ),
+        ('trend', 'tavg'): lambda: visualizer.plot_yearly_trend(
+            daily_data,
+            variable='tavg',
+            title=titles[('trend', 'tavg')],
+            bundle=bundle
+        ),
+        ('trend', 'prcp'): lambda: visualizer.plot_yearly_trend(
+            daily_data,
+            variable='prcp',
+            title=titles[('trend', 'prcp')],
+            bundle=bundle
+        )
+    }
+    
+    def get_figure(figure_type, variable=None):
+        key = FigureCache.make_key(station_id, start_year, end_year, figure_type, variable, version)
+        return figure_cache.get_or_create(key, builders[(figure_type, variable)])
+    
+    return get_figure
+
+# Callback zum Laden der Daten und Aktualisieren der Diagramme
+@app.callback(
+    [Output("dashboard-graph", "figure"),
+     Output("temperature-graph", "figure"),
+     Output("precipitation-graph", "figure"),
+     Output("seasonal-graph", "figure"),
+     Output("trend-graph", "figure"),
+     Output("statistics-container", "children")],
+    [Input("load-data-button", "n_clicks")],
+    [dash.dependencies.State("start-year-dropdown", "value"),
+     dash.dependencies.State("end-year-dropdown", "value"),
+     dash.dependencies.State("station-dropdown", "value"),
+     dash.dependencies.State("station-dropdown", "options"),
+     dash.dependencies.State("session-id", "data")]
+)
+@traced('update_data_and_visualizations')
+def update_data_and_visualizations(n_clicks, start_year, end_year, station_id, station_options, session_id):
+    if n_clicks is None:
+        # Standardmäßige leere Figuren zurückgeben, wenn noch nicht geklickt wurde
+        empty_fig = go.Figure()
+        empty_fig.update_layout(
+            title="Keine Daten geladen",
+            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            annotations=[dict(
+                text="Bitte klicken Sie auf 'Daten laden', um Wetterdaten anzuzeigen",
+                showarrow=False,
+                xref="paper",
+                yref="paper",
+                x=0.5,
+                y=0.5
+            )]
+        )
+        return empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, "Keine Daten geladen"
+    
+    # Prüfen, ob Wetterstationen verfügbar sind
+    if not station_options:
+        empty_fig = go.Figure()
+        empty_fig.update_layout(
+            title="Keine Wetterstationen verfügbar",
+            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            annotations=[dict(
+                text="Es wurden keine Wetterstationen für die Region Kassel gefunden. Bitte versuchen Sie es später erneut.",
+                showarrow=False,
+                xref="paper",
+                yref="paper",
+                x=0.5,
+                y=0.5
+            )]
+        )
+        return empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, "Keine Wetterstationen verfügbar"
+    
+    # Zeitraum basierend auf den ausgewählten Jahren erstellen
+    start_date = datetime(start_year, 1, 1)
+    end_date = datetime(end_year, 12, 31)
+    
+    # Daten laden
+    try:
+        # Tägliche und monatliche Daten gleichzeitig abrufen
+        with span('load_data'):
+            daily_data, monthly_data = data_handler.get_daily_and_monthly_data(start_date, end_date, station_id)
+    except Exception as e:
+        empty_fig = go.Figure()
+        empty_fig.update_layout(
+            title="Fehler beim Laden der Daten",
+            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            annotations=[dict(
+                text=f"Beim Laden der Daten ist ein Fehler aufgetreten: {str(e)}",
+                showarrow=False,
+                xref="paper",
+                yref="paper",
+                x=0.5,
+                y=0.5
+            )]
+        )
+        return empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, f"Fehler: {str(e)}"
+    
+    # Überprüfen, ob Daten erfolgreich geladen wurden
+    if daily_data.empty or monthly_data.empty:
+        empty_fig = go.Figure()
+        empty_fig.update_layout(
+            title="Keine Daten verfügbar",
+            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            annotations=[dict(
+                text="Für den ausgewählten Zeitraum und/oder die Wetterstation sind keine Daten verfügbar",
+                showarrow=False,
+                xref="paper",
+                yref="paper",
+                x=0.5,
+                y=0.5
+            )]
+        )
+        return empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, "Keine Daten verfügbar"
+    
+    # Statistiken berechnen
+    with span('statistics'):
+        stats = data_handler.calculate_statistics(daily_data)
+    
+    # Visualisierungen erstellen bzw. aus dem Cache holen
+    data_context = (station_id, start_year, end_year, data_version(daily_data, monthly_data))
+    get_figure = build_figures(data_context, daily_data, monthly_data)
+    
+    # Daten der Sitzung für Export und weitere Callbacks serverseitig speichern
+    with span('session_store'):
+        try:
+            session_store.save(
+                session_id,
+                {'daily': daily_data, 'monthly': monthly_data},
+                {'station_id': station_id, 'start_year': start_year, 'end_year': end_year, 'version': data_context[3]}
+            )
+        except Exception as e:
+            print(f"Fehler beim Speichern der Sitzungsdaten: {e}")
+    
+    with span('figures'):
+        dashboard_fig = get_figure('dashboard')
+        temp_fig = get_figure('temperature', 'tavg')
+        precip_fig = get_figure('precipitation', 'prcp')
+        seasonal_fig = get_figure('seasonal', 'tavg')
+        trend_fig = get_figure('trend', 'tavg')
+    
+    with span('layout'):
+        # Speicherbedarf der geladenen Datensätze
+        memory = memory_report({'daily': daily_data, 'monthly': monthly_data})
+    
+        # Statistik-Layout erstellen
+        stats_layout = html.Div([
+            html.H5("Temperaturen:"),
+            html.Ul([
+                html.Li(f"Durchschnitt: {stats.get('temp_mean', 'N/A'):.1f} °C"),
+                html.Li(f"Maximum: {stats.get('temp_max', 'N/A'):.1f} °C ({(stats.get('hottest_day') or {}).get('date', 'N/A').strftime('%d.%m.%Y') if (stats.get('hottest_day') or {}).get('date') else 'N/A'})"),
+                html.Li(f"Minimum: {stats.get('temp_min', 'N/A'):.1f} °C ({(stats.get('coldest_day') or {}).get('date', 'N/A').strftime('%d.%m.%Y') if (stats.get('coldest_day') or {}).get('date') else 'N/A'})"),
+                html.Li(f"Frosttage: {stats.get('frost_days', 'N/A')} | Sommertage: {stats.get('summer_days', 'N/A')}"),
+            ]),
+            
+            html.H5("Niederschlag:"),
+            html.Ul([
+                html.Li(f"Gesamtniederschlag: {stats.get('prcp_total', 'N/A'):.1f} mm"),
+                html.Li(f"Regentage: {stats.get('rainy_days', 'N/A')} Tage"),
+                html.Li(f"Stärkster Niederschlag: {stats.get('prcp_max', 'N/A'):.1f} mm ({(stats.get('rainiest_day') or {}).get('date', 'N/A').strftime('%d.%m.%Y') if (stats.get('rainiest_day') or {}).get('date') else 'N/A'})"),
+            ]),
+            
+            html.H5("Wind:") if 'wind_mean' in stats else html.Div(),
+            html.Ul([
+                html.Li(f"Durchschnittsgeschwindigkeit: {stats.get('wind_mean', 'N/A'):.1f} km/h"),
+                html.Li(f"Maximum: {stats.get('wind_max', 'N/A'):.1f} km/h ({(stats.get('windiest_day') or {}).get('date', 'N/A').strftime('%d.%m.%Y') if (stats.get('windiest_day') or {}).get('date') else 'N/A'})"),
+            ]) if 'wind_mean' in stats else html.Div(),
+            
+            html.H5("Sonnenschein:") if 'sunshine_total' in stats else html.Div(),
+            html.Ul([
+                html.Li(f"Gesamte Sonnenscheindauer: {stats.get('sunshine_total', 'N/A'):.1f} Stunden"),
+                html.Li(f"Durchschnitt pro Tag: {stats.get('sunshine_mean', 'N/A'):.1f} Stunden"),
+            ]) if 'sunshine_total' in stats else html.Div(),
+            
+            html.H5("Ereignisse:") if any(f"{name}s" in stats for name in EVENT_LABELS) else html.Div(),
+            html.Ul([event_item(stats, name) for name in EVENT_LABELS if f"{name}s" in stats]),
+            
+            html.Small(
+                f"Speicherbedarf: {memory['bytes'].sum() / 1024**2:.2f} MB "
+                f"(float64: {memory['float64_bytes'].sum() / 1024**2:.2f} MB)",
+                className="text-muted"
+            ),
+        ])
+    
+    return dashboard_fig, temp_fig, precip_fig, seasonal_fig, trend_fig, stats_layout
+
+# Beschriftung der Ereignisse im Statistikbereich
+EVENT_LABELS = {
+    'heat_wave': "Hitzewellen (≥ 3 Tage ≥ 30 °C)",
+    'frost_period': "Frostperioden (≥ 3 Tage Tiefstwert < 0 °C)",
+    'dry_spell': "Trockenperioden (≥ 5 Tage ohne Niederschlag)"
+}
+
+def event_item(stats, name):
+    """Listeneintrag mit Anzahl und längstem Ereignis eines Typs"""
+    text = f"{EVENT_LABELS[name]}: {stats[f'{name}s']}"
+    longest = stats.get(f'longest_{name}')
+    if longest:
+        text += f", längste: {longest['duration']} Tage ab {longest['start'].strftime('%d.%m.%Y')}"
+    return html.Li(text)
+
+# Callback zum Nachladen der vollen Auflösung im sichtbaren Ausschnitt des Temperaturverlaufs
+@app.callback(
+    Output("temperature-graph", "figure", allow_duplicate=True),
+    [Input("temperature-graph", "relayoutData")],
+    [dash.dependencies.State("session-id", "data")],
+    prevent_initial_call=True
+)
+def zoom_temperature_trend(relayout_data, session_id):
+    x_range = parse_x_range(relayout_data)
+    if x_range is None:
+        return dash.no_update
+    
+    session = session_store.load(session_id)
+    if session is None:
+        return dash.no_update
+    
+    datasets, meta = session
+    daily_data = datasets['daily']
+    start_year, end_year = meta['start_year'], meta['end_year']
+    
+    if x_range == 'reset':
+        # Gesamtansicht kommt reduziert aus dem Figuren-Cache
+        data_context = (meta['station_id'], start_year, end_year, meta['version'])
+        return build_figures(data_context, daily_data, datasets['monthly'])('temperature', 'tavg')
+    
+    return visualizer.plot_temperature_trend(
+        daily_data,
+        title=f"Temperaturverlauf Kassel ({start_year}-{end_year})",
+        max_points=MAX_PLOT_POINTS,
+        x_range=x_range
+    )
+
+# Dateinamen der exportierten Grafiken: (Dateiname, Figurtyp, Variable)
+EXPORT_FIGURES = [
+    ("wetterdashboard_kassel.png", 'dashboard', None),
+    ("temperaturverlauf_kassel.png", 'temperature', 'tavg'),
+    ("niederschlag_kassel.png", 'precipitation', 'prcp'),
+    ("temperatur_nach_jahreszeit_kassel.png", 'seasonal', 'tavg'),
+    ("temperaturtrend_kassel.png", 'trend', 'tavg'),
+    ("niederschlagstrend_kassel.png", 'trend', 'prcp'),
+    ("niederschlag_nach_jahreszeit_kassel.png", 'seasonal', 'prcp')
+]
+
+# Callback zum Starten des Exports der Grafiken
+@app.callback(
+    [Output("export-job-id", "data"),
+     Output("export-progress-interval", "disabled"),
+     Output("export-status", "children")],
+    [Input("export-button", "n_clicks")],
+    [dash.dependencies.State("session-id", "data"),
+     dash.dependencies.State("export-backend", "value")]
+)
+@traced('export_graphics')
+def export_graphics(n_clicks, session_id, backend="matplotlib"):
+    with span('load_session'):
+        session = session_store.load(session_id) if n_clicks is not None else None
+    if session is None:
+        return None, True, html.Div("Keine Daten zum Exportieren verfügbar", className="text-warning")
+    
+    datasets, meta = session
+    daily_data, monthly_data = datasets['daily'], datasets['monthly']
+    data_context = (meta['station_id'], meta['start_year'], meta['end_year'], meta['version'])
+    
+    selected = [
+        (filename, figure_type, variable)
+        for filename, figure_type, variable in EXPORT_FIGURES
+        if variable != 'prcp' or 'prcp' in daily_data.columns
+    ]
+    
+    try:
+        if backend == "plotly":
+            # Bereits angezeigte Figuren kommen aus dem Cache, gerendert wird im Hintergrund über Kaleido
+            get_figure = build_figures(data_context, daily_data, monthly_data)
+            with span('figures'):
+                figures = {
+                    filename: get_figure(figure_type, variable)
+                    for filename, figure_type, variable in selected
+                }
+            with span('submit'):
+                job_id = export_manager.submit(figures)
+        else:
+            # Matplotlib rendert direkt aus den Daten, ohne Plotly-JSON und Browser
+            with span('submit'):
+                job_id = export_manager.submit_static(
+                    {
+                        filename: (figure_type, variable,
+                                   FIGURE_TITLES[(figure_type, variable)].format(start=meta['start_year'], end=meta['end_year']))
+                        for filename, figure_type, variable in selected
+                    },
+                    daily_data,
+                    monthly_data,
+                    meta['version']
+                )
+    except Exception as e:
+        return None, True, html.Div(f"Fehler beim Exportieren: {str(e)}", className="text-danger")
+    
+    return job_id, False, html.Div("Export gestartet ...", className="text-muted")
+
+# Callback zur Fortschrittsanzeige des laufenden Exports
+@app.callback(
+    [Output("export-progress", "value"),
+     Output("export-progress", "label"),
+     Output("export-progress", "style"),
+     Output("export-cancel-button", "style"),
+     Output("export-progress-interval", "disabled", allow_duplicate=True),
+     Output("export-status", "children", allow_duplicate=True)],
+    [Input("export-progress-interval", "n_intervals")],
+    [dash.dependencies.State("export-job-id", "data")],
+    prevent_initial_call=True
+)
+def update_export_progress(n_intervals, job_id):
+    hidden = {"display": "none"}
+    status = export_manager.status(job_id) if job_id else None
+    if status is None:
+        return 0, "", hidden, hidden, True, dash.no_update
+    
+    # Abgebrochene Grafiken zählen nicht als Fortschritt
+    rendered = len(status['files']) + len(status['errors'])
+    progress = int(100 * rendered / status['total']) if status['total'] else 100
+    label = f"{rendered}/{status['total']}"
+    
+    if status['state'] == 'running':
+        return progress, label, {}, {}, False, html.Div("Export läuft ...", className="text-muted")
+    
+    if status['state'] == 'cancelled':
+        message = html.Div(f"Export abgebrochen ({len(status['files'])} Grafiken bereits gespeichert)",
+                           className="text-warning")
+    elif status['state'] == 'error':
+        message = html.Div([
+            html.P(f"Export mit Fehlern beendet (Ordner '{status['directory']}')", className="text-danger"),
+            html.Ul([html.Li(error) for error in status['errors']])
+        ])
+    else:
+        message = html.Div([
+            html.P(f"Grafiken erfolgreich exportiert in den Ordner '{status['directory']}'", className="text-success"),
+            html.Ul([html.Li(filename) for filename in status['files']])
+        ])
+    return progress, label, {}, hidden, True, message
+
+# Callback zum Abbrechen des laufenden Exports
+@app.callback(
+    Output("export-status", "children", allow_duplicate=True),
+    [Input("export-cancel-button", "n_clicks")],
+    [dash.dependencies.State("export-job-id", "data")],
+    prevent_initial_call=True
+)
+def cancel_export(n_clicks, job_id):
+    if not job_id:
+        return dash.no_update
+    export_manager.cancel(job_id)
+    return html.Div("Export wird abgebrochen ...", className="text-warning")
+
+# Gewichtsmatrizen der Interpolation je Stationsmenge (werden über alle Zeiträume wiederverwendet),
+# die am längsten ungenutzten werden ab MAP_GRID_CACHE_SIZE Einträgen verdrängt
+_map_grids = OrderedDict()
+_map_grids_lock = threading.Lock()
+
+def get_map_grid(stations):
+    """
+    Gibt das IDW-Gitter für eine Stationsmenge zurück und berechnet die Gewichte nur einmal
+    
+    Args:
+        stations: DataFrame der Stationen (Index: Stations-ID) mit Koordinaten und Höhe
+    """
+    key = tuple(stations.index)
+    with _map_grids_lock:
+        grid = _map_grids.get(key)
+        if grid is not None:
+            _map_grids.move_to_end(key)
+            return grid
+    
+    grid = IDWGrid.for_stations(stations, resolution_km=MAP_RESOLUTION_KM)
+    with _map_grids_lock:
+        _map_grids[key] = grid
+        while len(_map_grids) > MAP_GRID_CACHE_SIZE:
+            _map_grids.popitem(last=False)
+    return grid
+
+def tab_request(active_tab, tab_id, rendered, *inputs):
+    """
+    Prüft, ob ein rechenintensiver Tab neu gezeichnet werden muss
+    
+    Solche Tabs laden ihre Daten erst, wenn sie geöffnet sind, damit sie das Laden des
+    Dashboards nicht verzögern. Beim erneuten Öffnen mit unveränderten Eingaben bleibt
+    die gezeichnete Grafik stehen.
+    
+    Args:
+        active_tab: tab_id des geöffneten Tabs
+        tab_id: tab_id des Tabs, der gezeichnet werden soll
+        rendered: Eingaben der letzten Zeichnung (aus dem dcc.Store des Tabs)
+        inputs: Aktuelle Eingaben (Klickzähler, Auswahl, ...)
+        
+    Returns:
+        Liste der Eingaben zum Speichern im dcc.Store oder None, wenn nichts zu tun ist
+    """
+    request_inputs = list(inputs)
+    if active_tab != tab_id or request_inputs == rendered:
+        return None
+    return request_inputs
+
+# Callback für die Karte des Landkreises (interpolierte Werte aller umliegenden Stationen)
+@app.callback(
+    [Output("map-graph", "figure"),
+     Output("map-rendered", "data")],
+    [Input("load-data-button", "n_clicks"),
+     Input("map-variable-dropdown", "value"),
+     Input("map-elevation-check", "value"),
+     Input("tabs", "active_tab")],
+    [dash.dependencies.State("start-year-dropdown", "value"),
+     dash.dependencies.State("end-year-dropdown", "value"),
+     dash.dependencies.State("map-rendered", "data")]
+)
+def update_map(n_clicks, variable, elevation, active_tab, start_year, end_year, rendered):
+    if n_clicks is None:
+        empty_fig = go.Figure()
+        empty_fig.update_layout(
+            title="Keine Daten geladen",
+            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False)
+        )
+        return empty_fig, None
+    
+    # Die Stationen der Karte erst laden, wenn die Karte geöffnet ist
+    request_inputs = tab_request(active_tab, "karte", rendered, n_clicks, variable, elevation)
+    if request_inputs is None:
+        return dash.no_update, dash.no_update
+    
+    start_date = datetime(start_year, 1, 1)
+    end_date = min(datetime(end_year, 12, 31), datetime.now())
+    
+    try:
+        array = data_handler.load_station_array(start_date, end_date, k=MAP_MAX_STATIONS, radius_km=MAP_RADIUS_KM,
+                                                variables=[variable])
+        stations = array.stations.dropna(subset=['latitude', 'longitude'])
+        values = array.variable(variable)[[array.station_ids.index(station_id) for station_id in stations.index]]
+        
+        grid = get_map_grid(stations)
+        # Alle Tage in einem Schritt interpolieren und danach über den Zeitraum mitteln
+        daily_grid = grid.interpolate(values, elevation_correction=bool(elevation) and variable in ELEVATION_DEPENDENT)
+        with np.errstate(invalid='ignore'):
+            period_grid = np.nanmean(daily_grid, axis=0)
+            station_values = np.nanmean(values, axis=1)
+        if variable == 'prcp':
+            # Mittlere Tagessumme in mittlere Jahressumme umrechnen
+            period_grid = period_grid * 365.25
+            station_values = station_values * 365.25
+    except Exception as e:
+        print(f"Fehler bei der Interpolation: {e}")
+        empty_fig = go.Figure()
+        empty_fig.update_layout(title=f"Fehler bei der Interpolation: {e}")
+        return empty_fig, None
+    
+    label = {"tavg": "Mittlere Temperatur", "tmax": "Mittlere Maximaltemperatur",
+             "tmin": "Mittlere Minimaltemperatur", "prcp": "Mittlere Jahressumme Niederschlag"}[variable]
+    return visualizer.plot_grid_map(
+        grid.to_frame(period_grid),
+        stations.assign(value=station_values),
+        variable=variable,
+        title=f"{label} im Landkreis Kassel ({start_year}-{end_year}, {len(stations)} Stationen)"
+    ), request_inputs
+
+# Callback für den Tagesgang (Stundenwerte werden jahresweise gelesen und sofort aggregiert)
+@app.callback(
+    [Output("diurnal-graph", "figure"),
+     Output("diurnal-rendered", "data")],
+    [Input("load-data-button", "n_clicks"),
+     Input("diurnal-variable-dropdown", "value"),
+     Input("tabs", "active_tab")],
+    [dash.dependencies.State("start-year-dropdown", "value"),
+     dash.dependencies.State("end-year-dropdown", "value"),
+     dash.dependencies.State("station-dropdown", "value"),
+     dash.dependencies.State("diurnal-rendered", "data")]
+)
+def update_diurnal(n_clicks, variable, active_tab, start_year, end_year, station_id, rendered):
+    if n_clicks is None:
+        empty_fig = go.Figure()
+        empty_fig.update_layout(
+            title="Keine Daten geladen",
+            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False)
+        )
+        return empty_fig, None
+    
+    # Stundenwerte erst laden, wenn der Tagesgang geöffnet ist
+    request_inputs = tab_request(active_tab, "tagesgang", rendered, n_clicks, variable)
+    if request_inputs is None:
+        return dash.no_update, dash.no_update
+    
+    start_date = datetime(start_year, 1, 1)
+    end_date = min(datetime(end_year, 12, 31), datetime.now())
+    
+    try:
+        _, hour_month = data_handler.get_hourly_aggregates(start_date, end_date, station_id, variables=[variable])
+    except Exception as e:
+        print(f"Fehler beim Laden der stündlichen Daten: {e}")
+        empty_fig = go.Figure()
+        empty_fig.update_layout(title=f"Fehler beim Laden der stündlichen Daten: {e}")
+        return empty_fig, None
+    
+    return visualizer.plot_diurnal_cycle(
+        hour_month,
+        variable=variable,
+        title=f"Tagesgang Kassel ({start_year}-{end_year})"
+    ), request_inputs
+
+# Callback für die Abweichungen vom Normalwert (Normalwerte kommen aus dem Normalwertspeicher)
+@app.callback(
+    [Output("anomaly-graph", "figure"),
+     Output("anomaly-statistics", "children"),
+     Output("anomaly-rendered", "data")],
+    [Input("load-data-button", "n_clicks"),
+     Input("anomaly-variable-dropdown", "value"),
+     Input("tabs", "active_tab")],
+    [dash.dependencies.State("start-year-dropdown", "value"),
+     dash.dependencies.State("end-year-dropdown", "value"),
+     dash.dependencies.State("station-dropdown", "value"),
+     dash.dependencies.State("anomaly-rendered", "data")]
+)
+def update_anomalies(n_clicks, variable, active_tab, start_year, end_year, station_id, rendered):
+    if n_clicks is None:
+        empty_fig = go.Figure()
+        empty_fig.update_layout(
+            title="Keine Daten geladen",
+            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False)
+        )
+        return empty_fig, "", None
+    
+    # Die Referenzperiode für die Normalwerte erst laden, wenn die Anomalien geöffnet sind
+    request_inputs = tab_request(active_tab, "anomalien", rendered, n_clicks, variable)
+    if request_inputs is None:
+        return dash.no_update, dash.no_update, dash.no_update
+    
+    start_date = datetime(start_year, 1, 1)
+    end_date = min(datetime(end_year, 12, 31), datetime.now())
+    
+    daily_data = data_handler.get_daily_data(start_date, end_date, station_id)
+    anomaly_data = data_handler.get_anomalies(daily_data, station_id, variables=[variable])
+    if anomaly_data.empty or anomaly_data[variable].isna().all():
+        empty_fig = go.Figure()
+        empty_fig.update_layout(title="Für die Station liegen keine Normalwerte der Referenzperiode vor")
+        return empty_fig, "", request_inputs
+    
+    fig = visualizer.plot_anomalies(
+        anomaly_data,
+        variable=variable,
+        reference=REFERENCE_PERIOD,
+        title=f"Abweichung vom Normalwert {REFERENCE_PERIOD[0]}-{REFERENCE_PERIOD[1]} ({start_year}-{end_year})"
+    )
+    
+    yearly = anomaly_data[variable].groupby(anomaly_data.index.year).mean().dropna()
+    unit = "mm/Tag" if variable == "prcp" else "°C"
+    statistics = html.Ul([
+        html.Li(f"Mittlere Abweichung im Zeitraum: {anomaly_data[variable].mean():+.2f} {unit}"),
+        html.Li(f"Höchstes Jahresmittel: {yearly.idxmax()} ({yearly.max():+.2f} {unit})"),
+        html.Li(f"Niedrigstes Jahresmittel: {yearly.idxmin()} ({yearly.min():+.2f} {unit})"),
+        html.Li(f"Jahre über dem Normalwert: {(yearly > 0).sum()} von {len(yearly)}")
+    ]) if not yearly.empty else ""
+    return fig, statistics, request_inputs
+
+# Callback für die Trendtabelle (Sen-Steigung und Mann-Kendall-Test je Variable und Jahreszeit)
+# Ausgelöst durch die Trendgrafik, damit die Sitzungsdaten bereits gespeichert sind
+@app.callback(
+    [Output("trend-table", "children"),
+     Output("trend-rendered", "data")],
+    [Input("trend-graph", "figure"),
+     Input("tabs", "active_tab")],
+    [dash.dependencies.State("load-data-button", "n_clicks"),
+     dash.dependencies.State("session-id", "data"),
+     dash.dependencies.State("trend-rendered", "data")]
+)
+def update_trend_table(trend_figure, active_tab, n_clicks, session_id, rendered):
+    if n_clicks is None:
+        return "", None
+    
+    # Die Tests über alle Jahreszeiten erst rechnen, wenn die Trends geöffnet sind
+    request_inputs = tab_request(active_tab, "trends", rendered, n_clicks)
+    if request_inputs is None:
+        return dash.no_update, dash.no_update
+    
+    session = session_store.load(session_id)
+    if session is None:
+        return html.P("Keine Daten geladen.", className="text-muted"), request_inputs
+    
+    datasets, meta = session
+    table = trend_engine.table(datasets['daily'], version=meta['version'])
+    if table.empty or table['sen_slope'].isna().all():
+        return html.P("Für eine Trendanalyse werden mindestens 8 vollständige Jahre benötigt.", className="text-muted"), request_inputs
+    
+    def cell(variable, period):
+        row = table.loc[(variable, period)]
+        if np.isnan(row['sen_slope']):
+            return html.Td("–")
+        # Steigung pro Jahrzehnt, signifikante Trends (Mann-Kendall, p < 0,05) fett
+        text = f"{row['sen_slope'] * 10:+.2f} (p = {row['mk_p']:.2f})"
+        return html.Td(html.B(text) if row['significant'] else text)
+    
+    variables = table.index.get_level_values('variable').unique()
+    return html.Div([
+        html.H6("Trends pro Jahrzehnt (Sen-Steigung, Mann-Kendall-Test; signifikante Trends fett)"),
+        dbc.Table(
+            [html.Thead(html.Tr([html.Th("Variable")] + [html.Th(period) for period in TREND_PERIODS]))] +
+            [html.Tbody([
+                html.Tr([html.Td(VAR_TITLES.get(variable, variable))] + [cell(variable, period) for period in TREND_PERIODS])
+                for variable in variables
+            ])],
+            bordered=True, size="sm", striped=True
+        )
+    ]), request_inputs
+
+# Callback für die Download-Links der Rohdaten (Station und Zeitraum der aktuellen Auswahl)
+@app.callback(
+    Output("download-links", "children"),
+    [Input("start-year-dropdown", "value"),
+     Input("end-year-dropdown", "value"),
+     Input("station-dropdown", "value")]
+)
+def update_download_links(start_year, end_year, station_id):
+    params = {"start": start_year, "end": end_year}
+    if station_id:
+        params["station"] = station_id
+    query = urlencode(params)
+    
+    rows = []
+    for product, label in [("daily", "Tageswerte"), ("monthly", "Monatswerte")]:
+        links = [html.A(fmt.upper() if fmt == "csv" else fmt.capitalize(),
+                        href=f"/download/{product}.{fmt}?{query}", className="me-2")
+                 for fmt in EXPORT_FORMATS]
+        rows.append(html.Div([html.Span(f"{label}: ", className="me-1")] + links))
+    return rows
+
+# Stations-IDs werden als Verzeichnisnamen im Datenspeicher verwendet
+_STATION_ID_PATTERN = re.compile(r'^[A-Za-z0-9]{1,10}$')
+
+# Höchstzahl an Stationen je Download
+MAX_DOWNLOAD_STATIONS = 50
+
+# Download der Rohdaten als CSV, Parquet oder Arrow IPC
+@server.route("/download/<product>.<fmt>")
+def download_data(product, fmt):
+    """
+    Streamt Tages- oder Monatswerte einer oder mehrerer Stationen
+    
+    Die Daten werden jahresweise aus dem Datenspeicher gelesen, kodiert und sofort
+    gesendet; der Speicherbedarf hängt daher nicht von der Länge des Zeitraums ab.
+    
+    Query-Parameter: start, end (Jahre), station (mehrfach möglich; ohne Angabe: Kassel-Koordinaten)
+    """
+    if product not in ("daily", "monthly") or fmt not in STREAM_WRITERS:
+        abort(404)
+    
+    try:
+        start_year = int(request.args.get("start", DEFAULT_START_YEAR))
+        end_year = int(request.args.get("end", DEFAULT_END_YEAR))
+    except ValueError:
+        abort(400, "Ungültiger Zeitraum")
+    if not 1900 <= start_year <= end_year <= datetime.now().year:
+        abort(400, "Ungültiger Zeitraum")
+    
+    station_ids = request.args.getlist("station") or [None]
+    if len(station_ids) > MAX_DOWNLOAD_STATIONS:
+        abort(400, f"Höchstens {MAX_DOWNLOAD_STATIONS} Stationen je Download")
+    if any(station_id is not None and not _STATION_ID_PATTERN.match(station_id) for station_id in station_ids):
+        abort(400, "Ungültige Stations-ID")
+    
+    def chunks():
+        for station_id in station_ids:
+            for chunk in data_handler.iter_data(datetime(start_year, 1, 1), datetime(end_year, 12, 31),
+                                                station_id, product):
+                yield station_id, chunk
+    
+    extension, mimetype = EXPORT_FORMATS[fmt]
+    filename = f"wetter_kassel_{product}_{start_year}-{end_year}.{extension}"
+    return Response(
+        stream_with_context(STREAM_WRITERS[fmt](chunks())),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+# Kennzahlen des Figuren-Caches zum Zeitpunkt der Abfrage
+FIGURE_CACHE_ENTRIES = REGISTRY.gauge('wetter_figure_cache_entries', "Figuren im Figuren-Cache")
+FIGURE_CACHE_BYTES = REGISTRY.gauge('wetter_figure_cache_bytes', "Geschätzte Größe des Figuren-Caches in Bytes")
+
+@server.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    # Vorgänge früherer Anfragen dieses Threads nicht der aktuellen Anfrage zuordnen
+    finished_traces()
+
+@server.after_request
+def record_callback_metrics(response):
+    """
+    Ergänzt die Messwerte der Callbacks dieser Anfrage um die Arbeit von Dash
+    
+    Die Zeit zwischen Ende des Callbacks und Ende der Anfrage ist im Wesentlichen die
+    JSON-Serialisierung der Figuren und wird als Stufe 'serialize' erfasst.
+    """
+    start = g.get('request_start')
+    if start is None:
+        return response
+    elapsed = time.perf_counter() - start
+    for trace in finished_traces():
+        STAGE_SECONDS.observe(max(elapsed - trace.total, 0.0), operation=trace.operation, stage='serialize')
+        if response.content_length is not None:
+            RESPONSE_BYTES.observe(response.content_length, operation=trace.operation)
+    return response
+
+# Messwerte im Prometheus-Textformat
+@server.route("/metrics")
+def metrics():
+    cache_stats = figure_cache.stats()
+    FIGURE_CACHE_ENTRIES.set(cache_stats['entries'])
+    FIGURE_CACHE_BYTES.set(cache_stats['bytes'])
+    return Response(REGISTRY.render(), content_type=PROMETHEUS_CONTENT_TYPE)
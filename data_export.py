@@ -0,0 +1,145 @@
+import io
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Spalten der exportierten Tageswerte (feste Reihenfolge, damit alle Blöcke dasselbe Schema haben)
+EXPORT_COLUMNS = ['tavg', 'tmin', 'tmax', 'prcp', 'wspd', 'wpgt', 'pres', 'tsun']
+
+# Dateiformate: Endung und MIME-Typ
+EXPORT_FORMATS = {
+    'csv': ('csv', 'text/csv'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'arrow': ('arrows', 'application/vnd.apache.arrow.stream')
+}
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Schreibziel für pyarrow, das geschriebene Bytes sammelt, bis sie abgeholt werden
+
+    Damit können Parquet- und Arrow-Writer direkt in eine HTTP-Antwort streamen,
+    ohne dass die ganze Datei im Speicher oder auf der Platte entsteht.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        """Gibt die seit dem letzten Aufruf geschriebenen Bytes zurück"""
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+def _prepare(chunk, station_id, columns):
+    """Bringt einen Datenblock in die Exportform: Spalten 'station', 'time' und feste Datenspalten"""
+    frame = chunk.reindex(columns=columns)
+    # Messwerte einheitlich als float32 (kompakte Darstellung des Speichers), Zusatzspalten
+    # (z.B. Abdeckung der Monatswerte) behalten ihren Typ
+    frame = frame.astype({col: 'float32' for col in columns if col in EXPORT_COLUMNS})
+    frame.insert(0, 'station', station_id if station_id is not None else 'kassel')
+    frame.index = pd.DatetimeIndex(frame.index, name='time').astype('datetime64[ns]')
+    return frame.reset_index()
+
+def _blocks(chunks, columns=None):
+    """
+    Bereitet Blöcke (Stations-ID, DataFrame) vor
+
+    Die Spalten des ersten Blocks legen das Schema fest, fehlende Spalten späterer
+    Blöcke werden mit NaN aufgefüllt.
+    """
+    for station_id, chunk in chunks:
+        if columns is None:
+            columns = [col for col in EXPORT_COLUMNS if col in chunk.columns] + \
+                      [col for col in chunk.columns if col not in EXPORT_COLUMNS]
+        yield _prepare(chunk, station_id, columns)
+
+def _empty_frame():
+    """Leerer Block im Exportformat (für Exporte ohne Daten)"""
+    return _prepare(pd.DataFrame(columns=EXPORT_COLUMNS, index=pd.DatetimeIndex([])), None, EXPORT_COLUMNS).iloc[0:0]
+
+def stream_csv(chunks):
+    """
+    Kodiert Datenblöcke fortlaufend als CSV
+
+    Args:
+        chunks: Iterator von Tupeln (Stations-ID, DataFrame mit DateTimeIndex)
+
+    Yields:
+        UTF-8-kodierte CSV-Abschnitte (Kopfzeile nur im ersten Abschnitt)
+    """
+    header = True
+    for frame in _blocks(chunks):
+        yield frame.to_csv(index=False, header=header, date_format='%Y-%m-%d').encode('utf-8')
+        header = False
+    if header:
+        yield _empty_frame().to_csv(index=False).encode('utf-8')
+
+def _stream_arrow(chunks, open_writer):
+    """Gemeinsamer Ablauf für Parquet und Arrow IPC: Block schreiben, Bytes sofort weitergeben"""
+    sink = _ChunkSink()
+    writer = None
+    schema = None
+
+    for frame in _blocks(chunks):
+        if writer is None:
+            schema = pa.Schema.from_pandas(frame, preserve_index=False)
+            writer = open_writer(sink, schema)
+        writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+        data = sink.drain()
+        if data:
+            yield data
+
+    if writer is None:
+        frame = _empty_frame()
+        writer = open_writer(sink, pa.Schema.from_pandas(frame, preserve_index=False))
+    writer.close()
+    yield sink.drain()
+
+def stream_parquet(chunks):
+    """
+    Kodiert Datenblöcke fortlaufend als Parquet-Datei (ein Row Group je Block)
+
+    Args:
+        chunks: Iterator von Tupeln (Stations-ID, DataFrame mit DateTimeIndex)
+
+    Yields:
+        Bytes der Parquet-Datei; die Fußzeile mit den Metadaten folgt im letzten Abschnitt
+    """
+    return _stream_arrow(
+        chunks,
+        lambda sink, schema: pq.ParquetWriter(sink, schema, compression='snappy')
+    )
+
+def stream_arrow(chunks):
+    """
+    Kodiert Datenblöcke fortlaufend im Arrow-IPC-Streamformat (ein Record Batch je Block)
+
+    Args:
+        chunks: Iterator von Tupeln (Stations-ID, DataFrame mit DateTimeIndex)
+
+    Yields:
+        Bytes des Arrow-Streams
+    """
+    return _stream_arrow(
+        chunks,
+        lambda sink, schema: pa.ipc.new_stream(sink, schema)
+    )
+
+STREAM_WRITERS = {
+    'csv': stream_csv,
+    'parquet': stream_parquet,
+    'arrow': stream_arrow
+}
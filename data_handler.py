@@ -1,15 +1,117 @@
 import pandas as pd
 import numpy as np
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
-from meteostat import Point, Daily, Monthly, Stations
+from meteostat import Point
+
+from data_store import WeatherDataStore
+from stations import StationIndex, haversine_km
+from stats_engine import STAT_VARIABLES, batch_statistics, statistics_table
+from station_array import StationArray
+from hourly import aggregate_hourly
+from compact import dense_frame, frame_nbytes
+from events import EVENT_DEFINITIONS, event_summary, event_table
+from climatology import NORMAL_HARMONICS, REFERENCE_PERIOD, NormalsCache, anomalies, compute_normals
+from data_sources import MeteostatSource, point_coordinates
+from metrics import CACHE_REQUESTS, FETCHED_BYTES, FETCHED_ROWS, FETCHES, span
+
+# Vorgang, unter dem die Stufen der Datenschicht gemessen werden (Abrufe laufen in eigenen Threads)
+DATA_OPERATION = 'data'
+
+# Aggregationsregel je Variable: Mittelwerte für Zustandsgrößen, Summen für Mengen, Maximum für Böen
+AGGREGATION_RULES = {
+    'tavg': 'mean',
+    'tmin': 'mean',
+    'tmax': 'mean',
+    'wspd': 'mean',
+    'pres': 'mean',
+    'prcp': 'sum',
+    'tsun': 'sum',
+    'snow': 'max',
+    'wpgt': 'max'
+}
+
+# Meteorologische Jahreszeiten in der Reihenfolge der Quartale 'Q-NOV' (Dezember bis Februar = Q1)
+SEASON_NAMES = ['Winter', 'Frühling', 'Sommer', 'Herbst']
+
+# Reihenfolge der Jahreszeiten in Auswertungen und Diagrammen
+SEASON_ORDER = ['Frühling', 'Sommer', 'Herbst', 'Winter']
+
+class SeasonalView:
+    """
+    Saisonale Sicht auf Tagesdaten ohne kopierte Teil-DataFrames
+    
+    Jeder Tag erhält eine kategoriale Jahreszeit und ein Saisonjahr, wobei der Dezember
+    zum Winter des Folgejahres zählt. Auswertungen laufen über groupby oder Indexarrays
+    auf dem ursprünglichen DataFrame.
+    """
+    
+    def __init__(self, data):
+        self.data = data
+        
+        # Quartale mit Geschäftsjahresende im November entsprechen den meteorologischen Jahreszeiten
+        periods = data.index.to_period('Q-NOV')
+        self.season = pd.Categorical.from_codes(np.asarray(periods.quarter) - 1, categories=SEASON_NAMES)
+        self.season_year = np.asarray(periods.qyear)
+        self._indices = None
+    
+    def indices(self):
+        """Positionsindizes der Tage je Jahreszeit (einmalig berechnet)"""
+        if self._indices is None:
+            codes = self.season.codes
+            self._indices = {name: np.flatnonzero(codes == code) for code, name in enumerate(SEASON_NAMES)}
+        return self._indices
+    
+    def groupby(self, columns=None, by_year=False):
+        """
+        Gruppiert die Tagesdaten nach Jahreszeit (und optional Saisonjahr)
+        
+        Args:
+            columns: Spalte oder Liste von Spalten (default: alle)
+            by_year: Zusätzlich nach Saisonjahr gruppieren
+        """
+        data = self.data if columns is None else self.data[columns]
+        keys = [self.season, self.season_year] if by_year else self.season
+        return data.groupby(keys, observed=True)
+    
+    def series(self, variable):
+        """Werte einer Variable mit der Jahreszeit als kategorialem Index"""
+        return pd.Series(self.data[variable].to_numpy(), index=pd.CategoricalIndex(self.season, name='Jahreszeit'), name=variable)
+    
+    def keys(self):
+        return [season for season in SEASON_ORDER if len(self.indices()[season])]
+    
+    def __getitem__(self, season):
+        return self.data.iloc[self.indices()[season]]
+    
+    def __iter__(self):
+        return iter(self.keys())
+    
+    def __contains__(self, season):
+        return season in self.keys()
+    
+    def __len__(self):
+        return len(self.keys())
+    
+    def items(self):
+        for season in self.keys():
+            yield season, self[season]
 
 class KasselWeatherData:
     """Klasse zur Verarbeitung und Analyse von Wetterdaten für Kassel"""
     
-    def __init__(self):
+    def __init__(self, cache_dir='cache', max_workers=4, fetch_timeout=60, sparse_threshold=None, source=None):
         # Koordinaten für Kassel
         self.kassel_coords = Point(51.3127, 9.4797)  # Breitengrad, Längengrad für Kassel-Mitte
         
+        # Datenquelle (default: Meteostat); andere Quellen erhalten wegen eigener Stations-IDs einen eigenen Speicher
+        self.source = source if source is not None else MeteostatSource()
+        if self.source.name:
+            cache_dir = os.path.join(cache_dir, self.source.name)
+        
         # Wetterstationen werden später bei Bedarf geladen
         self.stations_df = None
         
@@ -17,35 +119,53 @@ class KasselWeatherData:
         self.end_date = datetime.now()
         self.start_date = datetime(self.end_date.year - 10, 1, 1)
         
+        # Lokaler Parquet-Speicher, damit bereits geladene Jahre nicht erneut abgerufen werden
+        # Messwerte werden kompakt gespeichert und als float32 gelesen; optional fast leere Spalten dünn besetzt
+        self.store = WeatherDataStore(cache_dir, sparse_threshold=sparse_threshold)
+        
+        # Tagesnormalwerte werden je Station und Referenzperiode einmal berechnet und gespeichert
+        self.normals_cache = NormalsCache(os.path.join(cache_dir, 'normals'))
+        
+        # Stationsindex für die Auflösung von Stations-IDs ohne erneute Abfrage der Datenquelle
+        self.station_index = StationIndex(os.path.join(cache_dir, 'stations.parquet'))
+        self._stations_lock = threading.Lock()
+        
+        # Gemeinsamer Thread-Pool begrenzt die Anzahl gleichzeitiger Abrufe bei der Datenquelle
+        self.fetch_timeout = fetch_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='weather-fetch')
+        
     def get_station_info(self):
         """Gibt Informationen über verfügbare Wetterstationen in der Nähe von Kassel zurück"""
+        # Parallele Abrufe sollen den Katalog nur einmal laden
+        with self._stations_lock:
+            return self._load_station_info()
+    
+    def _load_station_info(self):
+        """Lädt den Stationskatalog (Aufruf nur unter self._stations_lock)"""
         # Lade die Stationen nur wenn nötig
+        if self.stations_df is None:
+            # Gespeicherten Stationskatalog verwenden, solange er gültig ist
+            self.stations_df = self.station_index.load()
+            CACHE_REQUESTS.inc(cache='stations', result='miss' if self.stations_df is None else 'hit')
+            
         if self.stations_df is None:
             try:
                 # Wetterstationen in der Nähe von Kassel finden
-                stations = Stations()
-                stations = stations.nearby(51.3127, 9.4797)
-                self.stations_df = stations.fetch()
+                self.stations_df = self.source.stations(*point_coordinates(self.kassel_coords))
                 
                 # Entfernung zur Station in km berechnen
                 if not self.stations_df.empty:
-                    # Berechne Entfernung für jede Station (vereinfachte Formel)
-                    for idx, row in self.stations_df.iterrows():
-                        lat1, lon1 = self.kassel_coords.lat, self.kassel_coords.lon
-                        lat2, lon2 = row['latitude'], row['longitude']
-                        
-                        # Einfache Entfernungsberechnung (Luftlinie in km)
-                        dlat = lat2 - lat1
-                        dlon = lon2 - lon1
-                        # Umrechnung in Bogenmaß
-                        a = np.sin(np.radians(dlat)/2)**2 + np.cos(np.radians(lat1)) * np.cos(np.radians(lat2)) * np.sin(np.radians(dlon)/2)**2
-                        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
-                        distance = 6371 * c  # Erdradius in km
-                        
-                        self.stations_df.at[idx, 'distance'] = distance
+                    # Entfernung für alle Stationen auf einmal berechnen (Luftlinie in km)
+                    self.stations_df['distance'] = haversine_km(
+                        *point_coordinates(self.kassel_coords),
+                        self.stations_df['latitude'].to_numpy(), self.stations_df['longitude'].to_numpy()
+                    )
                     
                     # Nach Entfernung sortieren
                     self.stations_df = self.stations_df.sort_values('distance')
+                    
+                    self.station_index.build(self.stations_df)
+                    self.station_index.save()
                 
                 print(f"Gefundene Wetterstationen: {len(self.stations_df)}")
             except Exception as e:
@@ -55,6 +175,30 @@ class KasselWeatherData:
         
         return self.stations_df
     
+    def find_stations(self, lat=None, lon=None, k=None, radius_km=None):
+        """
+        Sucht Wetterstationen in der Nähe eines beliebigen Punktes
+        
+        Args:
+            lat: Breitengrad (default: Kassel-Mitte)
+            lon: Längengrad (default: Kassel-Mitte)
+            k: Anzahl der nächsten Stationen (default: 5, wenn kein Radius angegeben ist)
+            radius_km: Suchradius in km; zusammen mit k werden höchstens k Stationen zurückgegeben
+            
+        Returns:
+            DataFrame der Stationen, nach Entfernung sortiert, mit Spalte 'distance' in km
+        """
+        if lat is None or lon is None:
+            lat, lon = point_coordinates(self.kassel_coords)
+            
+        # Sicherstellen, dass der Stationskatalog geladen und indiziert ist
+        self.get_station_info()
+        
+        if radius_km is not None:
+            stations = self.station_index.within_radius(lat, lon, radius_km)
+            return stations.head(k) if k is not None else stations
+        return self.station_index.nearest(lat, lon, k if k is not None else 5)
+    
     def get_daily_data(self, start_date=None, end_date=None, station_id=None):
         """
         Lädt tägliche Wetterdaten für Kassel herunter
@@ -72,30 +216,8 @@ class KasselWeatherData:
         if end_date is None:
             end_date = self.end_date
             
-        # Wenn keine spezifische Station angegeben ist, verwende den Punkt für Kassel
         try:
-            if station_id is None:
-                data = Daily(self.kassel_coords, start_date, end_date)
-            else:
-                try:
-                    # Versuche, eine Station anhand der ID zu finden
-                    station = Stations().id(station_id).fetch(1)
-                    if station.empty:
-                        # Fallback auf Kassel-Koordinaten, wenn Station nicht gefunden wurde
-                        print(f"Station ID {station_id} nicht gefunden. Verwende Kassel-Koordinaten.")
-                        data = Daily(self.kassel_coords, start_date, end_date)
-                    else:
-                        # Station gefunden, verwende deren Koordinaten
-                        station_point = Point(station.iloc[0]['latitude'], station.iloc[0]['longitude'])
-                        data = Daily(station_point, start_date, end_date)
-                except Exception as e:
-                    # Bei einem Fehler verwende die Kassel-Koordinaten
-                    print(f"Fehler beim Laden der Station {station_id}: {e}. Verwende Kassel-Koordinaten.")
-                    data = Daily(self.kassel_coords, start_date, end_date)
-                
-            # Daten abrufen und in DataFrame umwandeln
-            data = data.fetch()
-            return data
+            return self._load_from_store('daily', self._fetch_daily, start_date, end_date, station_id)
         except Exception as e:
             print(f"Fehler beim Laden der täglichen Daten: {e}")
             # Rückgabe eines leeren DataFrames mit den erwarteten Spalten
@@ -103,7 +225,10 @@ class KasselWeatherData:
     
     def get_monthly_data(self, start_date=None, end_date=None, station_id=None):
         """
-        Lädt monatliche Wetterdaten für Kassel herunter
+        Erzeugt monatliche Wetterdaten für Kassel aus den täglichen Daten
+        
+        Statt das Meteostat-Produkt Monthly separat herunterzuladen, werden die
+        Monatswerte lokal aus den (gespeicherten) Tageswerten aggregiert.
         
         Args:
             start_date: Startdatum (default: 10 Jahre zurück)
@@ -113,39 +238,416 @@ class KasselWeatherData:
         Returns:
             DataFrame mit monatlichen Wetterdaten
         """
+        return self.aggregate(self.get_daily_data(start_date, end_date, station_id), freq='M')
+    
+    def load_datasets(self, start_date, end_date, station_ids, products=('daily', 'monthly'), timeout=None):
+        """
+        Lädt die Daten mehrerer Stationen gleichzeitig
+        
+        Die Abrufe laufen im gemeinsamen Thread-Pool, sodass die Gesamtdauer von der
+        langsamsten Anfrage und nicht von der Summe aller Anfragen bestimmt wird.
+        Pro Station wird nur das Tagesprodukt geladen, Monatswerte werden daraus aggregiert.
+        
+        Args:
+            start_date: Startdatum
+            end_date: Enddatum
+            station_ids: Liste von Stations-IDs (None steht für die Kassel-Koordinaten)
+            products: Datenprodukte ('daily' und/oder 'monthly')
+            timeout: Zeitlimit pro Anfrage in Sekunden ab deren Start (default: fetch_timeout)
+            
+        Returns:
+            Dictionary {(Produkt, Stations-ID): DataFrame}; bei Fehlern oder Zeitüberschreitung leer
+        """
+        if timeout is None:
+            timeout = self.fetch_timeout
+        started = {}
+        
+        def run(station_id):
+            # Zeitlimit zählt erst ab dem tatsächlichen Start im Pool
+            started[station_id] = time.monotonic()
+            return self.get_daily_data(start_date, end_date, station_id)
+        
+        futures = {self._executor.submit(run, station_id): station_id for station_id in station_ids}
+        daily = {}
+        pending = set(futures)
+        
+        while pending:
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                station_id = futures[future]
+                try:
+                    daily[station_id] = future.result()
+                except Exception as e:
+                    print(f"Fehler beim Laden der Daten für Station {station_id}: {e}")
+                    daily[station_id] = pd.DataFrame(columns=['tavg', 'tmin', 'tmax', 'prcp', 'wspd', 'wpgt', 'pres', 'tsun'])
+            
+            now = time.monotonic()
+            for future in list(pending):
+                station_id = futures[future]
+                if station_id in started and now - started[station_id] > timeout:
+                    # Der Thread läuft im Hintergrund weiter, sein Ergebnis wird verworfen
+                    print(f"Zeitüberschreitung beim Laden der Daten für Station {station_id} nach {timeout} s")
+                    future.cancel()
+                    pending.discard(future)
+                    daily[station_id] = pd.DataFrame(columns=['tavg', 'tmin', 'tmax', 'prcp', 'wspd', 'wpgt', 'pres', 'tsun'])
+        
+        results = {}
+        for station_id, data in daily.items():
+            if 'daily' in products:
+                results[('daily', station_id)] = data
+            if 'monthly' in products:
+                results[('monthly', station_id)] = self.aggregate(data, freq='M')
+        return results
+    
+    def load_station_array(self, start_date=None, end_date=None, station_ids=None, k=None, radius_km=None,
+                           variables=None, timeout=None):
+        """
+        Lädt mehrere Stationen gleichzeitig und richtet sie auf einen gemeinsamen Tagesindex aus
+        
+        Args:
+            start_date: Startdatum (default: 10 Jahre zurück)
+            end_date: Enddatum (default: heute)
+            station_ids: Liste von Stations-IDs
+            k: Anzahl der nächsten Stationen zu Kassel, wenn keine IDs angegeben sind
+            radius_km: Suchradius um Kassel in km, wenn keine IDs angegeben sind
+            variables: Variablen der dritten Achse (default: alle vorhandenen aus STAT_VARIABLES)
+            timeout: Zeitlimit pro Station in Sekunden (default: fetch_timeout)
+            
+        Returns:
+            StationArray (Station × Tag × Variable) mit Maske für fehlende Werte
+            
+        Raises:
+            ValueError: Wenn weder station_ids noch k oder radius_km angegeben sind
+        """
+        # Der ungefilterte Katalog kann zehntausende Stationen umfassen
+        if station_ids is None and k is None and radius_km is None:
+            raise ValueError("Stationen über station_ids, k oder radius_km auswählen")
+        
+        if start_date is None:
+            start_date = self.start_date
+        if end_date is None:
+            end_date = self.end_date
+        
+        catalog = self.get_station_info()
+        if station_ids is None:
+            station_ids = StationIndex.station_ids(self.find_stations(k=k, radius_km=radius_km))
+        
+        # Stationsangaben nach ID indiziert (Meteostat liefert die ID je nach Version als Index oder Spalte)
+        stations = catalog.set_axis(StationIndex.station_ids(catalog)).reindex(station_ids) if not catalog.empty else None
+        
+        results = self.load_datasets(start_date, end_date, station_ids, products=('daily',), timeout=timeout)
+        frames = {station_id: results[('daily', station_id)] for station_id in station_ids}
+        
+        index = pd.date_range(pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize(), freq='D', name='time')
+        return StationArray.from_frames(frames, index, variables, stations)
+    
+    def get_daily_and_monthly_data(self, start_date=None, end_date=None, station_id=None):
+        """
+        Lädt tägliche Wetterdaten einer Station und leitet die Monatswerte daraus ab
+        
+        Returns:
+            Tupel (tägliche Daten, monatliche Daten)
+        """
         if start_date is None:
             start_date = self.start_date
         if end_date is None:
             end_date = self.end_date
             
+        results = self.load_datasets(start_date, end_date, [station_id])
+        return results[('daily', station_id)], results[('monthly', station_id)]
+    
+    def _station_point(self, station_id):
+        """
+        Löst eine Stations-ID über den Stationsindex in einen Point auf
+        
+        Args:
+            station_id: ID der Wetterstation (None für Kassel-Koordinaten)
+            
+        Returns:
+            Point mit den Koordinaten der Station (Fallback: Kassel-Koordinaten)
+        """
+        # Wenn keine spezifische Station angegeben ist, verwende den Punkt für Kassel
+        if station_id is None:
+            return self.kassel_coords
+        
+        # Stationskatalog einmalig laden, falls noch nicht geschehen
+        if self.stations_df is None:
+            self.get_station_info()
+        
+        coords = self.station_index.get(station_id)
+        if coords is None:
+            try:
+                # Station ist nicht im Katalog, einzeln nachschlagen und im Index ergänzen
+                station = self.source.station(station_id)
+                if not station.empty:
+                    self.station_index.add(station)
+                    coords = self.station_index.get(station_id)
+            except Exception as e:
+                # Bei einem Fehler verwende die Kassel-Koordinaten
+                print(f"Fehler beim Laden der Station {station_id}: {e}. Verwende Kassel-Koordinaten.")
+                return self.kassel_coords
+        
+        if coords is None:
+            # Fallback auf Kassel-Koordinaten, wenn Station nicht gefunden wurde
+            print(f"Station ID {station_id} nicht gefunden. Verwende Kassel-Koordinaten.")
+            return self.kassel_coords
+        
+        return Point(coords[0], coords[1])
+    
+    def _load_from_store(self, frequency, fetch, start_date, end_date, station_id):
+        """
+        Liest Daten aus dem lokalen Speicher und lädt nur fehlende Jahre nach
+        
+        Args:
+            frequency: Datenprodukt (z.B. 'daily')
+            fetch: Funktion (start_date, end_date, station_id) für den Abruf bei der Datenquelle
+            start_date: Startdatum
+            end_date: Enddatum
+            station_id: ID der Wetterstation (None für Kassel-Koordinaten)
+            
+        Returns:
+            DataFrame mit den Daten im angeforderten Zeitraum
+        """
+        station_key = station_id if station_id is not None else 'kassel'
+        years = list(range(start_date.year, end_date.year + 1))
+        missing = self.store.missing_years(frequency, station_key, years)
+        self._count_store_requests(frequency, years, missing)
+        
+        # Fehlende Jahre in einem Abruf komplett laden, damit die Partitionen vollständig sind;
+        # liefert der Abruf nichts, bleiben die bereits gespeicherten Jahre trotzdem lesbar
+        if missing:
+            try:
+                self._fill_store(frequency, fetch, station_id, missing)
+            except Exception as e:
+                print(f"Fehler beim Abruf der Jahre {missing[0]}-{missing[-1]} für Station {station_key}: {e}")
+        
+        with span('store_read', DATA_OPERATION):
+            data = self.store.read(frequency, station_key, years)
+        if data.empty:
+            return pd.DataFrame(columns=['tavg', 'tmin', 'tmax', 'prcp', 'wspd', 'wpgt', 'pres', 'tsun'])
+        return data.loc[start_date:end_date]
+    
+    def _fill_store(self, frequency, fetch, station_id, years):
+        """
+        Ruft die angegebenen Jahre in einem Abruf ab und schreibt sie in den Speicher
+        
+        Liefert der Abruf keine Daten, werden nur für Jahre ohne gespeicherte Partition leere
+        Partitionen geschrieben, damit sie nicht bei jedem Aufruf erneut angefragt werden.
+        Veraltete Partitionen mit Daten bleiben erhalten und werden weiter gelesen.
+        
+        Returns:
+            False, wenn der Abruf keine Daten geliefert hat
+        """
+        station_key = station_id if station_id is not None else 'kassel'
+        fetch_start = datetime(min(years), 1, 1)
+        # Bis zum Ende des letzten Tages abrufen, damit auch die Stundenwerte des 31.12. enthalten sind
+        fetch_end = min(datetime(max(years), 12, 31, 23, 59), datetime.now())
         try:
-            # Wenn keine spezifische Station angegeben ist, verwende den Punkt für Kassel
-            if station_id is None:
-                data = Monthly(self.kassel_coords, start_date, end_date)
-            else:
-                try:
-                    # Versuche, eine Station anhand der ID zu finden
-                    station = Stations().id(station_id).fetch(1)
-                    if station.empty:
-                        # Fallback auf Kassel-Koordinaten, wenn Station nicht gefunden wurde
-                        print(f"Station ID {station_id} nicht gefunden. Verwende Kassel-Koordinaten.")
-                        data = Monthly(self.kassel_coords, start_date, end_date)
-                    else:
-                        # Station gefunden, verwende deren Koordinaten
-                        station_point = Point(station.iloc[0]['latitude'], station.iloc[0]['longitude'])
-                        data = Monthly(station_point, start_date, end_date)
-                except Exception as e:
-                    # Bei einem Fehler verwende die Kassel-Koordinaten
-                    print(f"Fehler beim Laden der Station {station_id}: {e}. Verwende Kassel-Koordinaten.")
-                    data = Monthly(self.kassel_coords, start_date, end_date)
-                
-            # Daten abrufen und in DataFrame umwandeln
-            data = data.fetch()
-            return data
+            fetched = fetch(fetch_start, fetch_end, station_id)
+        except Exception:
+            FETCHES.inc(product=frequency, result='error')
+            raise
+        
+        if fetched.empty:
+            FETCHES.inc(product=frequency, result='empty')
+            # Vorhandene Daten nicht durch ein leeres Ergebnis überschreiben
+            empty_years = [year for year in years if not self.store.exists(frequency, station_key, year)]
+            if empty_years:
+                with span('store_write', DATA_OPERATION):
+                    self.store.write(frequency, station_key, fetched, empty_years)
+            return False
+        FETCHES.inc(product=frequency, result='ok')
+        FETCHED_ROWS.inc(len(fetched), product=frequency)
+        FETCHED_BYTES.inc(frame_nbytes(fetched), product=frequency)
+        
+        with span('store_write', DATA_OPERATION):
+            self.store.write(frequency, station_key, fetched, years)
+        return True
+    
+    def _count_store_requests(self, frequency, years, missing):
+        """Zählt gespeicherte (hit) und nachzuladende (miss) Jahrespartitionen"""
+        cache = f"{frequency}_store"
+        if len(years) > len(missing):
+            CACHE_REQUESTS.inc(len(years) - len(missing), cache=cache, result='hit')
+        if missing:
+            CACHE_REQUESTS.inc(len(missing), cache=cache, result='miss')
+    
+    def iter_data(self, start_date, end_date, station_id=None, product='daily', batch_years=5):
+        """
+        Liefert die Daten einer Station jahresweise, ohne den ganzen Zeitraum im Speicher zu halten
+        
+        Fehlende Jahre werden in Blöcken von höchstens `batch_years` Jahren abgerufen und
+        gespeichert; danach wird jede Jahrespartition einzeln gelesen und weitergegeben.
+        
+        Args:
+            start_date: Startdatum
+            end_date: Enddatum
+            station_id: ID der Wetterstation (None für Kassel-Koordinaten)
+            product: 'daily' oder 'monthly' (aus den Tageswerten des Jahres aggregiert)
+            batch_years: Maximale Anzahl Jahre je Abruf bei der Datenquelle
+            
+        Yields:
+            DataFrame je Jahr mit den Daten im angeforderten Zeitraum
+        """
+        station_key = station_id if station_id is not None else 'kassel'
+        years = list(range(start_date.year, end_date.year + 1))
+        
+        missing = self.store.missing_years('daily', station_key, years)
+        self._count_store_requests('daily', years, missing)
+        for i in range(0, len(missing), batch_years):
+            try:
+                self._fill_store('daily', self._fetch_daily, station_id, missing[i:i + batch_years])
+            except Exception as e:
+                print(f"Fehler beim Laden der täglichen Daten für Station {station_key}: {e}")
+        
+        for year, data in self.store.iter_read('daily', station_key, years):
+            data = data.loc[start_date:end_date]
+            if data.empty:
+                continue
+            # Monate reichen nicht über Jahresgrenzen, daher kann jahresweise aggregiert werden
+            yield self.aggregate(data, freq='M') if product == 'monthly' else data
+    
+    def _fetch_daily(self, start_date, end_date, station_id):
+        """Ruft tägliche Wetterdaten direkt bei der Datenquelle ab"""
+        with span('station_lookup', DATA_OPERATION):
+            point = self._station_point(station_id)
+        with span('fetch_daily', DATA_OPERATION):
+            return self.source.daily(start_date, end_date, station_id, point)
+    
+    def bulk_import(self, station_ids=None, max_workers=None):
+        """
+        Übernimmt die Daten vieler Stationen in einem Durchgang in den lokalen Speicher
+        
+        Nur für Datenquellen mit Massenimport (z.B. DWDArchiveSource). Danach werden
+        die importierten Jahre aus dem Speicher gelesen, ohne die Quelle erneut abzufragen.
+        
+        Args:
+            station_ids: Stations-IDs (default: alle Stationen der Quelle)
+            max_workers: Anzahl der Prozesse (default: Anzahl der CPU-Kerne)
+            
+        Returns:
+            DataFrame mit einer Zeile je importierter Station
+        """
+        if not hasattr(self.source, 'bulk_import'):
+            print(f"Die Datenquelle {type(self.source).__name__} unterstützt keinen Massenimport")
+            return pd.DataFrame()
+        
+        summary = self.source.bulk_import(self.store.base_dir, station_ids, max_workers)
+        
+        # Stationskatalog beim nächsten Zugriff neu aus der Quelle aufbauen
+        with self._stations_lock:
+            self.stations_df = None
+            if self.station_index.path is not None and os.path.exists(self.station_index.path):
+                os.remove(self.station_index.path)
+        return summary
+    
+    def get_normals(self, station_id=None, reference=REFERENCE_PERIOD, harmonics=NORMAL_HARMONICS):
+        """
+        Geglättete Tagesnormalwerte einer Station für die Referenzperiode
+        
+        Die Tageswerte der Referenzperiode werden nur beim ersten Aufruf gelesen;
+        danach kommt die Tabelle aus dem Normalwertspeicher.
+        
+        Args:
+            station_id: ID der Wetterstation (None für Kassel-Koordinaten)
+            reference: Referenzperiode (Startjahr, Endjahr)
+            harmonics: Anzahl der Harmonischen für die Glättung
+            
+        Returns:
+            DataFrame mit 366 Zeilen (Position im Schaltjahreskalender) und einer Spalte je Variable
+        """
+        station_key = station_id if station_id is not None else 'kassel'
+        
+        def compute():
+            reference_data = self.get_daily_data(datetime(reference[0], 1, 1), datetime(reference[1], 12, 31), station_id)
+            return compute_normals(reference_data, reference=reference, harmonics=harmonics)
+        
+        return self.normals_cache.get(station_key, reference, harmonics, compute)
+    
+    def get_anomalies(self, data, station_id=None, reference=REFERENCE_PERIOD, variables=None):
+        """
+        Abweichungen der Tageswerte von den Normalwerten der Referenzperiode
+        
+        Args:
+            data: DataFrame mit täglichen Wetterdaten und DateTimeIndex
+            station_id: ID der Wetterstation, zu der die Daten gehören
+            reference: Referenzperiode (Startjahr, Endjahr)
+            variables: Variablen (default: alle mit Normalwerten)
+            
+        Returns:
+            DataFrame mit den Abweichungen je Tag und Variable
+        """
+        try:
+            return anomalies(data, self.get_normals(station_id, reference), variables)
         except Exception as e:
-            print(f"Fehler beim Laden der monatlichen Daten: {e}")
-            # Rückgabe eines leeren DataFrames mit den erwarteten Spalten
-            return pd.DataFrame(columns=['tavg', 'tmin', 'tmax', 'prcp', 'wspd', 'wpgt', 'pres', 'tsun'])
+            print(f"Fehler bei der Berechnung der Normalwerte: {e}")
+            return pd.DataFrame(index=data.index, columns=variables or [], dtype=float)
+    
+    def _fetch_hourly(self, start_date, end_date, station_id):
+        """Ruft stündliche Wetterdaten (UTC) direkt bei der Datenquelle ab"""
+        with span('station_lookup', DATA_OPERATION):
+            point = self._station_point(station_id)
+        with span('fetch_hourly', DATA_OPERATION):
+            return self.source.hourly(start_date, end_date, station_id, point)
+    
+    def iter_hourly(self, start_date=None, end_date=None, station_id=None):
+        """
+        Liefert die Stundenwerte einer Station jahresweise
+        
+        Fehlende Jahre werden in einem Abruf geladen und gespeichert; Jahre ohne
+        Stundenwerte (z.B. bei Datenquellen ohne Stundenwerte) werden als leere
+        Partitionen gespeichert und nicht erneut angefragt. Gelesen wird danach
+        jahresweise, sodass höchstens ein Jahr (~8.800 Zeilen) weitergegeben wird.
+        
+        Args:
+            start_date: Startdatum (default: 10 Jahre zurück)
+            end_date: Enddatum (default: heute)
+            station_id: ID der Wetterstation (None für Kassel-Koordinaten)
+            
+        Yields:
+            DataFrame je Jahr mit Stundenwerten (UTC) im angeforderten Zeitraum
+        """
+        if start_date is None:
+            start_date = self.start_date
+        if end_date is None:
+            end_date = self.end_date
+        station_key = station_id if station_id is not None else 'kassel'
+        end = end_date.replace(hour=23, minute=59) if end_date.hour == 0 and end_date.minute == 0 else end_date
+        years = list(range(start_date.year, end_date.year + 1))
+        
+        missing = self.store.missing_years('hourly', station_key, years)
+        self._count_store_requests('hourly', years, missing)
+        if missing:
+            try:
+                self._fill_store('hourly', self._fetch_hourly, station_id, missing)
+            except Exception as e:
+                print(f"Fehler beim Laden der stündlichen Daten für {missing[0]}-{missing[-1]}: {e}")
+        
+        for _, data in self.store.iter_read('hourly', station_key, years):
+            data = data.loc[start_date:end]
+            if not data.empty:
+                yield data
+    
+    def get_hourly_aggregates(self, start_date=None, end_date=None, station_id=None, variables=('temp',)):
+        """
+        Tageskennwerte und Tagesgang aus Stundenwerten in einem Durchlauf
+        
+        Args:
+            start_date: Startdatum (default: 10 Jahre zurück)
+            end_date: Enddatum (default: heute)
+            station_id: ID der Wetterstation (default: nächste Station zu Kassel)
+            variables: Stundenvariablen für die Stunde × Monat-Matrizen
+            
+        Returns:
+            Tupel (DataFrame mit Tageskennwerten in Ortszeit, HourMonthAccumulator)
+        """
+        if start_date is None:
+            start_date = self.start_date
+        if end_date is None:
+            end_date = self.end_date
+        daily, hour_month = aggregate_hourly(self.iter_hourly(start_date, end_date, station_id), variables)
+        # Die letzten UTC-Stunden fallen in Ortszeit auf den Folgetag und werden abgeschnitten
+        return daily.loc[start_date.date().isoformat():end_date.date().isoformat()], hour_month
     
     def calculate_statistics(self, data):
         """
@@ -158,73 +660,113 @@ class KasselWeatherData:
             Dictionary mit statistischen Auswertungen
         """
         stats = {}
+        variables = [col for col in STAT_VARIABLES if col in data.columns]
+        if data.empty or not variables:
+            return stats
+        
+        # Alle Kennzahlen in einem Durchlauf über das NumPy-Array berechnen
+        batch = batch_statistics(data[variables].to_numpy(dtype=float)[np.newaxis], variables)
+        pos = {variable: i for i, variable in enumerate(variables)}
+        
+        def value(name, variable):
+            return batch[name][0, pos[variable]]
+        
+        def extreme_day(name, variable, key):
+            # Ohne einen gültigen Wert gibt es keinen Extremtag
+            if batch['count'][0, pos[variable]] == 0:
+                return None
+            index = batch['arg' + name][0, pos[variable]]
+            return {'date': data.index[index], key: value(name, variable)}
         
         # Temperaturstatistiken
-        if 'tavg' in data.columns:
-            stats['temp_mean'] = data['tavg'].mean()
-            stats['temp_max'] = data['tmax'].max()
-            stats['temp_min'] = data['tmin'].min()
-            stats['temp_std'] = data['tavg'].std()
+        if all(col in pos for col in ['tavg', 'tmin', 'tmax']):
+            stats['temp_mean'] = value('mean', 'tavg')
+            stats['temp_max'] = value('max', 'tmax')
+            stats['temp_min'] = value('min', 'tmin')
+            stats['temp_std'] = value('std', 'tavg')
             
             # Extremwerte mit Datum
-            max_temp_idx = data['tmax'].idxmax()
-            min_temp_idx = data['tmin'].idxmin()
-            stats['hottest_day'] = {'date': max_temp_idx, 'temp': data.loc[max_temp_idx, 'tmax']}
-            stats['coldest_day'] = {'date': min_temp_idx, 'temp': data.loc[min_temp_idx, 'tmin']}
+            stats['hottest_day'] = extreme_day('max', 'tmax', 'temp')
+            stats['coldest_day'] = extreme_day('min', 'tmin', 'temp')
+            
+            # Kenntage
+            for name in ['frost_days', 'ice_days', 'summer_days', 'hot_days']:
+                stats[name] = int(batch[name][0])
         
         # Niederschlagsstatistiken
-        if 'prcp' in data.columns:
-            stats['prcp_total'] = data['prcp'].sum()
-            stats['prcp_mean'] = data['prcp'].mean()
-            stats['prcp_max'] = data['prcp'].max()
-            stats['rainy_days'] = (data['prcp'] > 0).sum()
+        if 'prcp' in pos:
+            stats['prcp_total'] = value('sum', 'prcp')
+            stats['prcp_mean'] = value('mean', 'prcp')
+            stats['prcp_max'] = value('max', 'prcp')
+            stats['rainy_days'] = int(batch['rainy_days'][0])
             
             # Tag mit höchstem Niederschlag
-            max_prcp_idx = data['prcp'].idxmax()
-            stats['rainiest_day'] = {'date': max_prcp_idx, 'prcp': data.loc[max_prcp_idx, 'prcp']}
+            stats['rainiest_day'] = extreme_day('max', 'prcp', 'prcp')
         
         # Windstatistiken
-        if 'wspd' in data.columns:
-            stats['wind_mean'] = data['wspd'].mean()
-            stats['wind_max'] = data['wspd'].max()
+        if 'wspd' in pos:
+            stats['wind_mean'] = value('mean', 'wspd')
+            stats['wind_max'] = value('max', 'wspd')
             
             # Tag mit höchstem Wind
-            max_wind_idx = data['wspd'].idxmax()
-            stats['windiest_day'] = {'date': max_wind_idx, 'wind': data.loc[max_wind_idx, 'wspd']}
+            stats['windiest_day'] = extreme_day('max', 'wspd', 'wind')
         
         # Sonnenscheindauer
-        if 'tsun' in data.columns:
-            stats['sunshine_total'] = data['tsun'].sum()
-            stats['sunshine_mean'] = data['tsun'].mean()
+        if 'tsun' in pos:
+            stats['sunshine_total'] = value('sum', 'tsun')
+            stats['sunshine_mean'] = value('mean', 'tsun')
+        
+        # Mehrtägige Ereignisse: Anzahl und längstes Ereignis je Typ
+        summary = event_summary(event_table(data))
+        for name, definition in EVENT_DEFINITIONS.items():
+            if definition[0] not in data.columns:
+                continue
+            if (name, 0) in summary.index:
+                row = summary.loc[(name, 0)]
+                stats[f'{name}s'] = int(row['count'])
+                stats[f'longest_{name}'] = {'start': row['longest_start'], 'duration': int(row['longest'])}
+            else:
+                stats[f'{name}s'] = 0
             
         return stats
     
-    def get_seasonal_data(self, data):
+    def get_events(self, data, names=None):
         """
-        Gruppiert Daten nach Jahreszeiten
+        Ermittelt Hitzewellen, Frost- und Trockenperioden in den Tageswerten
         
         Args:
-            data: DataFrame mit Wetterdaten und DateTimeIndex
+            data: DataFrame mit täglichen Wetterdaten und DateTimeIndex
+            names: Ereignistypen (default: alle aus events.EVENT_DEFINITIONS)
             
         Returns:
-            Dictionary mit saisonalen Daten
+            DataFrame mit Beginn, Ende, Dauer, Extremwert, Mittel und Intensität je Ereignis
         """
-        # Jahreszeiten definieren (meteorologisch)
-        seasons = {
-            'Frühling': [3, 4, 5],
-            'Sommer': [6, 7, 8],
-            'Herbst': [9, 10, 11],
-            'Winter': [12, 1, 2]
-        }
+        return event_table(data, names)
+    
+    def calculate_yearly_statistics(self, data):
+        """
+        Berechnet die Kennzahlen für alle Jahre gleichzeitig
         
-        seasonal_data = {}
+        Args:
+            data: DataFrame mit täglichen Wetterdaten und DateTimeIndex
+            
+        Returns:
+            DataFrame mit einer Zeile je Jahr (Mittel, Extremwerte mit Datum, Summen, Kenntage)
+        """
+        return statistics_table(data)
+    
+    def get_seasonal_data(self, data):
+        """
+        Gruppiert Daten nach Jahreszeiten
         
-        for season, months in seasons.items():
-            # Filter für die Monate der Jahreszeit
-            season_data = data[data.index.month.isin(months)]
-            seasonal_data[season] = season_data
+        Args:
+            data: DataFrame mit Wetterdaten und DateTimeIndex
             
-        return seasonal_data
+        Returns:
+            SeasonalView mit Jahreszeit und Saisonjahr je Tag; verhält sich wie das
+            bisherige Dictionary {Jahreszeit: DataFrame}, kopiert Teilmengen aber nur bei Zugriff
+        """
+        return SeasonalView(data)
     
     def get_yearly_averages(self, data, column='tavg'):
         """
@@ -242,4 +784,55 @@ class KasselWeatherData:
             
         # Gruppiere nach Jahr und berechne Durchschnitt
         yearly_avg = data[column].groupby(data.index.year).mean()
-        return yearly_avg.to_frame(name=column) 
\ No newline at end of file
+        return yearly_avg.to_frame(name=column)
+    
+    def aggregate(self, data, freq='M', min_coverage=0.9):
+        """
+        Aggregiert tägliche Wetterdaten in einem gruppierten Durchlauf
+        
+        Temperaturen, Wind und Luftdruck werden gemittelt, Niederschlag und Sonnenschein
+        summiert und Böen als Maximum übernommen. Zu jeder Variable wird die Anzahl der
+        vorhandenen Tageswerte mitgeliefert, damit unvollständige Zeiträume erkennbar sind.
+        
+        Args:
+            data: DataFrame mit täglichen Wetterdaten und DateTimeIndex
+            freq: 'M' (Monate), 'Y' (Jahre) oder 'S' (meteorologische Jahreszeiten,
+                  Dezember zählt zum Winter des Folgejahres)
+            min_coverage: Mindestanteil an Tagen mit Daten, ab dem ein Zeitraum als vollständig gilt
+            
+        Returns:
+            DataFrame mit einer Zeile je Zeitraum (Index: Beginn des Zeitraums), den aggregierten
+            Variablen, den Spalten '<variable>_count', 'days_in_period' und 'incomplete'
+            sowie bei freq='S' den Spalten 'season' und 'season_year'
+        """
+        columns = [col for col in AGGREGATION_RULES if col in data.columns]
+        if data.empty or not columns:
+            return pd.DataFrame(columns=['tavg', 'tmin', 'tmax', 'prcp', 'wspd', 'wpgt', 'pres', 'tsun'])
+        
+        # Jahreszeiten als Quartale mit Geschäftsjahresende im November
+        period_freq = {'M': 'M', 'Y': 'Y', 'S': 'Q-NOV'}[freq]
+        periods = data.index.to_period(period_freq)
+        
+        grouped = dense_frame(data[columns]).groupby(periods)
+        result = grouped.agg({col: AGGREGATION_RULES[col] for col in columns})
+        counts = grouped.count()
+        
+        # Summen ohne einen einzigen Tageswert sind fehlend und nicht 0
+        result = result.where(counts > 0)
+        
+        period_index = result.index
+        days_in_period = (period_index.end_time.normalize() - period_index.start_time).days + 1
+        days_with_data = data[columns].notna().any(axis=1).groupby(periods).sum()
+        
+        for col in columns:
+            result[f'{col}_count'] = counts[col]
+        result['days_in_period'] = np.asarray(days_in_period)
+        result['incomplete'] = days_with_data.to_numpy() < min_coverage * result['days_in_period'].to_numpy()
+        
+        if freq == 'S':
+            result['season'] = pd.Categorical.from_codes(period_index.quarter - 1, categories=SEASON_NAMES)
+            result['season_year'] = period_index.qyear
+        
+        result.index = period_index.start_time
+        result.index.name = 'time'
+        return result
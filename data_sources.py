@@ -0,0 +1,223 @@
+import os
+from abc import ABC, abstractmethod
+import numpy as np
+import pandas as pd
+from meteostat import Daily, Hourly, Stations
+
+from dwd_cdc import find_archives, import_archives, read_station_archives, read_station_metadata
+from stations import StationIndex, haversine_km
+
+# Spalten des Stationskatalogs, die jede Datenquelle mindestens liefert (ID als Index)
+CATALOG_COLUMNS = ['name', 'country', 'region', 'latitude', 'longitude', 'elevation']
+
+def point_coordinates(point):
+    """Breiten- und Längengrad eines Points (meteostat speichert sie je nach Version als lat/lon oder _lat/_lon)"""
+    return getattr(point, 'lat', getattr(point, '_lat', None)), getattr(point, 'lon', getattr(point, '_lon', None))
+
+class DataSource(ABC):
+    """
+    Schnittstelle einer Datenquelle für KasselWeatherData
+
+    Eine Datenquelle liefert den Stationskatalog und Rohdaten im Meteostat-Format
+    (DateTimeIndex 'time', Spalten wie Daily bzw. Hourly). Ruft KasselWeatherData
+    sie auf, wird das Ergebnis in den lokalen Parquet-Speicher geschrieben.
+    """
+
+    # Unterordner des Speichers; Quellen mit eigenen Stations-IDs dürfen sich den Speicher nicht teilen
+    name = None
+
+    @abstractmethod
+    def stations(self, lat, lon):
+        """
+        Stationskatalog (die Entfernung berechnet KasselWeatherData)
+
+        Args:
+            lat: Breitengrad des Suchmittelpunkts
+            lon: Längengrad des Suchmittelpunkts
+
+        Returns:
+            DataFrame mit Stations-ID als Index und mindestens den Spalten aus CATALOG_COLUMNS
+        """
+
+    def station(self, station_id):
+        """
+        Einzelne Station für IDs, die nicht im Katalog stehen
+
+        Returns:
+            DataFrame mit höchstens einer Zeile
+        """
+        catalog = self.stations(None, None)
+        return catalog[catalog.index.astype(str) == str(station_id)]
+
+    @abstractmethod
+    def daily(self, start_date, end_date, station_id, point):
+        """
+        Tageswerte einer Station
+
+        Args:
+            start_date: Startdatum
+            end_date: Enddatum
+            station_id: ID der Wetterstation (None für die Koordinaten von point)
+            point: Point mit den Koordinaten der Station
+
+        Returns:
+            DataFrame mit täglichen Wetterdaten
+        """
+
+    def hourly(self, start_date, end_date, station_id, point):
+        """Stundenwerte (UTC) einer Station; Quellen ohne Stundenwerte liefern ein leeres DataFrame"""
+        return pd.DataFrame()
+
+class MeteostatSource(DataSource):
+    """Daten über die Meteostat-API (Standard)"""
+
+    def stations(self, lat, lon):
+        stations = Stations()
+        if lat is not None and lon is not None:
+            stations = stations.nearby(lat, lon)
+        return stations.fetch()
+
+    def station(self, station_id):
+        return Stations().id(station_id).fetch(1)
+
+    def daily(self, start_date, end_date, station_id, point):
+        return Daily(point, start_date, end_date).fetch()
+
+    def hourly(self, start_date, end_date, station_id, point):
+        return Hourly(point, start_date, end_date).fetch()
+
+class LocalFileSource(DataSource):
+    """
+    Daten aus lokalen Dateien, z.B. eigenen Messungen oder exportierten Rohdaten
+
+    Erwartete Struktur des Verzeichnisses:
+        stations.csv             Spalten 'id', 'name', 'latitude', 'longitude', 'elevation'
+        daily/<ID>.csv           Spalte 'time' und Spalten wie Meteostat Daily (oder .parquet)
+        hourly/<ID>.csv          Spalte 'time' (UTC) und Spalten wie Meteostat Hourly (optional)
+    """
+
+    name = 'local'
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory: Wurzelverzeichnis der Dateien
+        """
+        self.directory = directory
+
+    def stations(self, lat, lon):
+        for filename in ('stations.parquet', 'stations.csv'):
+            path = os.path.join(self.directory, filename)
+            if os.path.exists(path):
+                if filename.endswith('.parquet'):
+                    catalog = pd.read_parquet(path)
+                else:
+                    catalog = pd.read_csv(path, dtype={'id': str})
+                if 'id' in catalog.columns:
+                    catalog = catalog.set_index('id')
+                return catalog.reindex(columns=list(dict.fromkeys(CATALOG_COLUMNS + list(catalog.columns))))
+        return pd.DataFrame(columns=CATALOG_COLUMNS, index=pd.Index([], name='id'))
+
+    def _nearest(self, point):
+        """ID der nächsten Station zu einem Punkt (für Abfragen ohne Stations-ID)"""
+        catalog = self.stations(None, None)
+        if catalog.empty:
+            return None
+        distance = haversine_km(*point_coordinates(point), catalog['latitude'].to_numpy(), catalog['longitude'].to_numpy())
+        return StationIndex.station_ids(catalog)[int(np.argmin(distance))]
+
+    def _read(self, product, start_date, end_date, station_id, point):
+        """Liest die Datei einer Station und schneidet sie auf den Zeitraum zu"""
+        if station_id is None:
+            station_id = self._nearest(point)
+        for extension in ('parquet', 'csv'):
+            path = os.path.join(self.directory, product, f"{station_id}.{extension}")
+            if not os.path.exists(path):
+                continue
+            data = pd.read_parquet(path) if extension == 'parquet' else pd.read_csv(path, parse_dates=['time'])
+            if 'time' in data.columns:
+                data = data.set_index('time')
+            data.index = pd.DatetimeIndex(data.index, name='time')
+            return data.sort_index().loc[start_date:end_date]
+        return pd.DataFrame()
+
+    def daily(self, start_date, end_date, station_id, point):
+        return self._read('daily', start_date, end_date, station_id, point)
+
+    def hourly(self, start_date, end_date, station_id, point):
+        return self._read('hourly', start_date, end_date, station_id, point)
+
+class DWDArchiveSource(DataSource):
+    """
+    Tageswerte aus den Archiven des DWD Climate Data Center (Produkt KL, tageswerte_KL_*.zip)
+
+    Die Stations-IDs sind die DWD-Stationskennungen (z.B. '02532' für Kassel), nicht die
+    WMO-Kennungen von Meteostat. Ganze Regionen werden mit bulk_import in einem Durchgang
+    in den Speicher übernommen; einzelne Abrufe lesen die ZIP-Dateien der Station direkt.
+    """
+
+    name = 'dwd'
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory: Verzeichnis mit den heruntergeladenen ZIP-Dateien (historisch und aktuell)
+        """
+        self.directory = directory
+        self._catalog = None
+
+    def archives(self):
+        """ZIP-Dateien je DWD-Stationskennung"""
+        return find_archives(self.directory)
+
+    def stations(self, lat, lon):
+        if self._catalog is None:
+            rows = [read_station_metadata(paths[-1]) for paths in self.archives().values()]
+            rows = [row for row in rows if row is not None]
+            self._catalog = pd.DataFrame(rows, columns=['id'] + CATALOG_COLUMNS).set_index('id')
+        return self._catalog
+
+    def daily(self, start_date, end_date, station_id, point):
+        if station_id is None:
+            catalog = self.stations(None, None)
+            if catalog.empty:
+                return pd.DataFrame()
+            distance = haversine_km(*point_coordinates(point), catalog['latitude'].to_numpy(), catalog['longitude'].to_numpy())
+            station_id = catalog.index[int(np.argmin(distance))]
+        paths = self.archives().get(str(station_id))
+        if not paths:
+            return pd.DataFrame()
+        return read_station_archives(paths).loc[start_date:end_date]
+
+    def bulk_import(self, cache_dir, station_ids=None, max_workers=None):
+        """
+        Übernimmt alle (bzw. die angegebenen) Stationen des Verzeichnisses in den Speicher
+
+        Returns:
+            DataFrame mit einer Zeile je importierter Station (siehe dwd_cdc.import_archives)
+        """
+        archives = self.archives()
+        if station_ids is not None:
+            archives = {station_id: archives[station_id] for station_id in map(str, station_ids) if station_id in archives}
+        summary = import_archives(archives, cache_dir, max_workers=max_workers)
+        self._catalog = None
+        return summary
+
+def source_from_spec(spec):
+    """
+    Erzeugt eine Datenquelle aus einer Kurzbeschreibung, z.B. aus einer Umgebungsvariable
+
+    Args:
+        spec: 'meteostat', 'local:<Verzeichnis>' oder 'dwd:<Verzeichnis>'
+
+    Returns:
+        DataSource
+    """
+    kind, _, directory = (spec or 'meteostat').partition(':')
+    if kind == 'meteostat':
+        return MeteostatSource()
+    if kind == 'local' and directory:
+        return LocalFileSource(directory)
+    if kind == 'dwd' and directory:
+        return DWDArchiveSource(directory)
+    raise ValueError(f"Unbekannte Datenquelle: {spec}")
@@ -0,0 +1,117 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+import pandas as pd
+
+from compact import compact_frame, encode_frame
+
+class WeatherDataStore:
+    """
+    Persistenter Parquet-Speicher für Wetterdaten, partitioniert nach Station und Jahr
+
+    Messwerte werden als skalierte Ganzzahlen mit Null-Maske gespeichert und beim Lesen
+    als float32 zurückgegeben (siehe compact.py).
+    """
+
+    def __init__(self, base_dir='cache', refresh_after=timedelta(hours=12), settle_period=timedelta(days=14),
+                 sparse_threshold=None):
+        """
+        Args:
+            base_dir: Wurzelverzeichnis des Speichers
+            refresh_after: Nach dieser Zeit gelten Partitionen noch laufender Jahre als veraltet
+            settle_period: Zeitraum nach Jahresende, in dem Meteostat noch Nachlieferungen einspielt
+            sparse_threshold: Fast leere Spalten ab diesem Anteil fehlender Werte dünn besetzt lesen (None: nie)
+        """
+        self.base_dir = base_dir
+        self.refresh_after = refresh_after
+        self.settle_period = settle_period
+        self.sparse_threshold = sparse_threshold
+
+    def _partition_path(self, frequency, station_key, year):
+        """Pfad der Parquet-Datei für eine Station und ein Jahr"""
+        return os.path.join(self.base_dir, frequency, f"station={station_key}", f"year={year}.parquet")
+
+    def exists(self, frequency, station_key, year):
+        """Prüft, ob für das Jahr eine Partition gespeichert ist, unabhängig von ihrem Alter"""
+        return os.path.exists(self._partition_path(frequency, station_key, year))
+
+    def has_partition(self, frequency, station_key, year):
+        """
+        Prüft, ob eine aktuelle Partition für das Jahr vorliegt
+
+        Abgeschlossene Jahre, die nach Ablauf der Nachlieferungsfrist gespeichert wurden,
+        gelten dauerhaft als vollständig. Alle anderen werden nach `refresh_after` neu geladen.
+        """
+        path = self._partition_path(frequency, station_key, year)
+        if not os.path.exists(path):
+            return False
+
+        written = datetime.fromtimestamp(os.path.getmtime(path))
+        if written >= datetime(year + 1, 1, 1) + self.settle_period:
+            return True
+        return datetime.now() - written < self.refresh_after
+
+    def missing_years(self, frequency, station_key, years):
+        """Gibt die Jahre zurück, für die keine aktuelle Partition vorliegt"""
+        return [year for year in years if not self.has_partition(frequency, station_key, year)]
+
+    def read(self, frequency, station_key, years):
+        """
+        Liest die vorhandenen Partitionen der angegebenen Jahre
+
+        Returns:
+            DataFrame mit allen gespeicherten Zeilen (leer, wenn nichts vorhanden ist)
+        """
+        frames = []
+        for year in years:
+            path = self._partition_path(frequency, station_key, year)
+            if os.path.exists(path):
+                frames.append(compact_frame(pd.read_parquet(path), self.sparse_threshold))
+
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames).sort_index()
+
+    def iter_read(self, frequency, station_key, years):
+        """
+        Liest die Partitionen einzeln, ohne sie zusammenzufügen
+
+        Yields:
+            Tupel (Jahr, DataFrame) für jede vorhandene, nicht leere Partition
+        """
+        for year in years:
+            path = self._partition_path(frequency, station_key, year)
+            if os.path.exists(path):
+                frame = pd.read_parquet(path)
+                if not frame.empty:
+                    yield year, compact_frame(frame, self.sparse_threshold)
+
+    def write(self, frequency, station_key, data, years):
+        """
+        Schreibt Daten jahresweise in den Speicher
+
+        Für Jahre ohne Daten wird eine leere Partition geschrieben, damit sie nicht
+        bei jedem Aufruf erneut angefragt werden.
+
+        Args:
+            frequency: Datenprodukt ('daily', 'monthly', ...)
+            station_key: Schlüssel der Station
+            data: DataFrame mit DateTimeIndex
+            years: Jahre, deren Partitionen geschrieben werden sollen
+        """
+        for year in years:
+            year_data = encode_frame(data[data.index.year == year] if not data.empty else data)
+            path = self._partition_path(frequency, station_key, year)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            # Atomar schreiben, damit parallele Leser nie eine halbe Datei sehen
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            os.close(fd)
+            try:
+                year_data.to_parquet(tmp_path)
+                os.replace(tmp_path, path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
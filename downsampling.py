@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+
+def lttb_indices(x, y, n_out):
+    """
+    Wählt Punkte einer Zeitreihe mit dem Largest-Triangle-Three-Buckets-Verfahren aus
+
+    Die Reihe wird in n_out - 2 Buckets geteilt. Aus jedem Bucket wird der Punkt gewählt,
+    der mit dem zuvor gewählten Punkt und dem Mittelwert des nächsten Buckets das größte
+    Dreieck bildet. Dadurch bleiben Spitzen und der Kurvenverlauf sichtbar.
+
+    Args:
+        x: Numerische x-Werte (aufsteigend sortiert)
+        y: y-Werte ohne NaN
+        n_out: Anzahl der auszuwählenden Punkte
+
+    Returns:
+        NumPy-Array mit den Indizes der ausgewählten Punkte
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Bucketgrenzen für die inneren Punkte (erster und letzter Punkt bleiben immer erhalten)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+
+    # Mittelwerte aller Buckets in einem Schritt über kumulierte Summen
+    cum_x = np.concatenate([[0.0], np.cumsum(x)])
+    cum_y = np.concatenate([[0.0], np.cumsum(y)])
+    counts = edges[1:] - edges[:-1]
+    mean_x = (cum_x[edges[1:]] - cum_x[edges[:-1]]) / counts
+    mean_y = (cum_y[edges[1:]] - cum_y[edges[:-1]]) / counts
+    # Für den letzten Bucket dient der letzte Punkt als Folgepunkt
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        bx = x[start:end]
+        by = y[start:end]
+        # Doppelte Dreiecksfläche aus vorherigem Punkt, Kandidat und Mittel des nächsten Buckets
+        area = np.abs((x[previous] - mean_x[bucket]) * (by - y[previous])
+                      - (x[previous] - bx) * (mean_y[bucket] - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+
+    return selected
+
+def downsample_series(series, max_points):
+    """
+    Reduziert eine Zeitreihe mit DateTimeIndex auf höchstens max_points Punkte (LTTB)
+
+    Die Auswahl erfolgt auf den gültigen Werten. Damit Datenlücken in der Grafik nicht
+    überbrückt werden, bleibt der erste fehlende Wert jeder Lücke als NaN erhalten
+    (je Lücke ein zusätzlicher Punkt über dem Budget).
+
+    Args:
+        series: pandas Series mit DateTimeIndex
+        max_points: Punktbudget (None oder 0 für keine Reduktion)
+
+    Returns:
+        pandas Series mit den ausgewählten Punkten
+    """
+    if not max_points or len(series) <= max_points:
+        return series
+
+    missing = series.isna().to_numpy()
+    valid = series[~missing]
+    if len(valid) > max_points:
+        x = valid.index.asi8.astype(float) if isinstance(valid.index, pd.DatetimeIndex) else valid.index.to_numpy(dtype=float)
+        valid = valid.iloc[lttb_indices(x, valid.to_numpy(dtype=float), max_points)]
+
+    # Erster fehlender Wert nach einem gültigen Wert markiert den Beginn einer Lücke
+    gap_starts = missing & ~np.concatenate([[True], missing[:-1]])
+    if not gap_starts.any():
+        return valid
+    return pd.concat([valid, series[gap_starts]]).sort_index()
+
+def downsample_band(lower, upper, max_points):
+    """
+    Reduziert Unter- und Obergrenze eines Bands auf gemeinsame Stützstellen
+
+    Jede Grenze wählt mit dem halben Budget ihre eigenen LTTB-Punkte; beide Reihen werden
+    auf die Vereinigung der Zeitpunkte reindiziert. So bleiben die Extreme beider Grenzen
+    erhalten und die Füllung verbindet Werte desselben Zeitpunkts.
+
+    Args:
+        lower: Untergrenze (z.B. tmin) als pandas Series mit DateTimeIndex
+        upper: Obergrenze (z.B. tmax) mit demselben Index
+        max_points: Punktbudget für beide Grenzen zusammen (None oder 0 für keine Reduktion)
+
+    Returns:
+        Tupel (lower, upper) mit identischem Index; Lücken bleiben als NaN erhalten
+    """
+    if not max_points or len(lower) <= max_points:
+        return lower, upper.reindex(lower.index)
+
+    budget = max(max_points // 2, 3)
+    index = downsample_series(lower, budget).index.union(downsample_series(upper, budget).index)
+    return lower.reindex(index), upper.reindex(index)
+
+def parse_x_range(relayout_data):
+    """
+    Liest den sichtbaren x-Bereich aus den relayoutData eines Dash-Graphen
+
+    Returns:
+        Tupel (Start, Ende) als Timestamps, 'reset' bei Zurücksetzen des Zooms oder None
+    """
+    if not relayout_data:
+        return None
+    if relayout_data.get('xaxis.autorange'):
+        return 'reset'
+    if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
+        return pd.Timestamp(relayout_data['xaxis.range[0]']), pd.Timestamp(relayout_data['xaxis.range[1]'])
+    if 'xaxis.range' in relayout_data:
+        start, end = relayout_data['xaxis.range']
+        return pd.Timestamp(start), pd.Timestamp(end)
+    return None
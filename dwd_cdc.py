@@ -0,0 +1,272 @@
+import argparse
+import glob
+import multiprocessing
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+
+from data_store import WeatherDataStore
+
+# Tageswerte des DWD (Produkt KL): Spalte -> (Meteostat-Spalte, Umrechnungsfaktor, Nachkommastellen)
+DWD_DAILY_COLUMNS = {
+    'TMK': ('tavg', 1, 1),
+    'TNK': ('tmin', 1, 1),
+    'TXK': ('tmax', 1, 1),
+    'RSK': ('prcp', 1, 1),
+    'SHK_TAG': ('snow', 10, 0),   # Schneehöhe cm -> mm
+    'FM': ('wspd', 3.6, 1),       # m/s -> km/h
+    'FX': ('wpgt', 3.6, 1),       # m/s -> km/h
+    'PM': ('pres', 1, 1),         # Stationsdruck, wird in read_archive auf Meereshöhe reduziert
+    'SDK': ('tsun', 60, 0)        # Stunden -> Minuten
+}
+
+# Kennung fehlender Werte in den DWD-Dateien
+DWD_MISSING = -999
+
+# Konstanten der barometrischen Höhenformel: Schwerebeschleunigung (m/s²),
+# Gaskonstante trockener Luft (J/(kg K)) und Temperaturgradient (K/m)
+GRAVITY = 9.80665
+GAS_CONSTANT_AIR = 287.05
+LAPSE_RATE = 0.0065
+
+# Dateinamen der Stationsarchive, z.B. tageswerte_KL_02532_19500101_20231231_hist.zip oder tageswerte_KL_02532_akt.zip
+ARCHIVE_PATTERN = re.compile(r'tageswerte_KL_(\d{5})_.*\.zip$')
+
+def find_archives(directory):
+    """
+    Sucht die Stationsarchive eines Verzeichnisses (auch in Unterordnern wie historical/ und recent/)
+
+    Returns:
+        Dictionary {DWD-Stationskennung: Liste der ZIP-Dateien}, historische vor aktuellen Dateien
+    """
+    archives = {}
+    for path in glob.glob(os.path.join(directory, '**', 'tageswerte_KL_*.zip'), recursive=True):
+        match = ARCHIVE_PATTERN.search(os.path.basename(path))
+        if match:
+            archives.setdefault(match.group(1), []).append(path)
+    # Aktuelle Daten ('akt') überschreiben beim Zusammenfügen die historischen
+    return {station_id: sorted(paths, key=lambda p: (p.endswith('_akt.zip'), p))
+            for station_id, paths in sorted(archives.items())}
+
+def _member(archive, prefix):
+    """Name der ersten Datei im Archiv mit dem angegebenen Präfix (oder None)"""
+    return next((name for name in archive.namelist() if os.path.basename(name).startswith(prefix)), None)
+
+def read_archive(path):
+    """
+    Liest die Tageswerte eines Stationsarchivs
+
+    Die Produktdatei wird direkt aus dem ZIP-Archiv gestreamt (ohne Entpacken) und nur
+    mit den benötigten Spalten eingelesen. Der Stationsluftdruck (PM) wird mit der
+    Stationshöhe aus der Stationsgeschichte auf Meereshöhe reduziert, wie ihn Meteostat
+    als 'pres' liefert; ohne Stationshöhe bleibt 'pres' leer.
+
+    Args:
+        path: Pfad der ZIP-Datei
+
+    Returns:
+        DataFrame mit DateTimeIndex 'time' und Spalten im Meteostat-Format
+    """
+    with zipfile.ZipFile(path) as archive:
+        member = _member(archive, 'produkt_klima_tag')
+        if member is None:
+            return pd.DataFrame()
+        with archive.open(member) as handle:
+            raw = pd.read_csv(
+                handle,
+                sep=';',
+                skipinitialspace=True,
+                usecols=lambda column: column.strip() in DWD_DAILY_COLUMNS or column.strip() == 'MESS_DATUM',
+                dtype={'MESS_DATUM': str},
+                na_values=[DWD_MISSING, str(DWD_MISSING)],
+                encoding='latin-1'
+            )
+        geography = _geography_rows(archive)
+
+    raw.columns = raw.columns.str.strip()
+    index = pd.DatetimeIndex(pd.to_datetime(raw['MESS_DATUM'].str.strip(), format='%Y%m%d'), name='time')
+    data = pd.DataFrame({
+        target: (pd.to_numeric(raw[column], errors='coerce').to_numpy() * factor).round(decimals)
+        for column, (target, factor, decimals) in DWD_DAILY_COLUMNS.items() if column in raw.columns
+    }, index=index)
+    if 'pres' in data.columns:
+        temperature = data['tavg'].to_numpy() if 'tavg' in data.columns else np.full(len(data), np.nan)
+        elevation = station_elevations(geography, index)
+        data['pres'] = reduce_to_sea_level(data['pres'].to_numpy(), elevation, temperature).round(1)
+    # Windrichtung ist im Produkt KL nicht enthalten
+    return data.reindex(columns=['tavg', 'tmin', 'tmax', 'prcp', 'snow', 'wdir', 'wspd', 'wpgt', 'pres', 'tsun'])
+
+def read_station_archives(paths):
+    """
+    Liest und vereint alle Archive einer Station
+
+    Args:
+        paths: ZIP-Dateien der Station, historische vor aktuellen (siehe find_archives)
+
+    Returns:
+        DataFrame mit einer Zeile je Tag; bei Überschneidungen gilt die spätere Datei
+    """
+    frames = [frame for frame in (read_archive(path) for path in paths) if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    data = pd.concat(frames)
+    return data[~data.index.duplicated(keep='last')].sort_index()
+
+def _decode(content):
+    """Dekodiert Metadaten (neuere Dateien UTF-8, ältere Latin-1)"""
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        return content.decode('latin-1')
+
+def _geography_rows(archive):
+    """Zeilen der Stationsgeschichte (Metadaten_Geographie_*.txt) als Feldlisten, ohne Kopfzeile"""
+    member = _member(archive, 'Metadaten_Geographie')
+    if member is None:
+        return []
+    lines = [line for line in _decode(archive.read(member)).splitlines() if line.strip()]
+    rows = [[field.strip() for field in line.split(';')] for line in lines[1:]]
+    return [row for row in rows if len(row) >= 7]
+
+def station_elevations(rows, dates):
+    """
+    Stationshöhe je Tag aus der Stationsgeschichte (Verlegungen ändern die Höhe)
+
+    Args:
+        rows: Zeilen der Stationsgeschichte (Felder wie in Metadaten_Geographie_*.txt)
+        dates: DatetimeIndex der Messwerte
+
+    Returns:
+        NumPy-Array mit der Höhe in m je Tag (NaN ohne Stationsgeschichte)
+    """
+    if not rows:
+        return np.full(len(dates), np.nan)
+    periods = sorted((pd.to_datetime(row[4], format='%Y%m%d'), float(row[1])) for row in rows)
+    starts = pd.DatetimeIndex([start for start, _ in periods])
+    heights = np.array([height for _, height in periods])
+    # Tage vor dem ersten Eintrag erhalten die älteste bekannte Höhe
+    position = np.clip(starts.searchsorted(dates, side='right') - 1, 0, None)
+    return heights[position]
+
+def reduce_to_sea_level(pressure, elevation, temperature):
+    """
+    Reduziert den Stationsluftdruck auf Meereshöhe (barometrische Höhenformel)
+
+    Als Temperatur der Luftsäule dient das Tagesmittel an der Station plus der halbe
+    Temperaturgradient über die Höhe; fehlt das Tagesmittel, wird die Temperatur der
+    Standardatmosphäre in Stationshöhe angenommen.
+
+    Args:
+        pressure: Stationsluftdruck in hPa
+        elevation: Stationshöhe in m
+        temperature: Tagesmitteltemperatur in °C
+
+    Returns:
+        NumPy-Array mit dem Luftdruck in Meereshöhe in hPa (NaN ohne Stationshöhe)
+    """
+    pressure = np.asarray(pressure, dtype=float)
+    elevation = np.asarray(elevation, dtype=float)
+    temperature = np.asarray(temperature, dtype=float)
+    temperature = np.where(np.isnan(temperature), 15.0 - LAPSE_RATE * elevation, temperature)
+    column_kelvin = temperature + 273.15 + LAPSE_RATE * elevation / 2
+    return pressure * np.exp(GRAVITY * elevation / (GAS_CONSTANT_AIR * column_kelvin))
+
+def read_station_metadata(path):
+    """
+    Liest Name und aktuelle Lage einer Station aus dem Archiv (Metadaten_Geographie_*.txt)
+
+    Returns:
+        Dictionary mit 'id', 'name', 'country', 'region', 'latitude', 'longitude', 'elevation' oder None
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            rows = _geography_rows(archive)
+    except (OSError, zipfile.BadZipFile) as e:
+        print(f"Fehler beim Lesen der Stationsdaten aus {path}: {e}")
+        return None
+
+    if not rows:
+        return None
+    # Die letzte Zeile beschreibt die aktuelle Lage der Station
+    fields = rows[-1]
+    return {
+        'id': f"{int(fields[0]):05d}",
+        'name': fields[6],
+        'country': 'DE',
+        'region': None,
+        'latitude': float(fields[2]),
+        'longitude': float(fields[3]),
+        'elevation': float(fields[1])
+    }
+
+def _import_station(cache_dir, station_id, paths):
+    """Liest die Archive einer Station und schreibt sie in den Speicher (läuft im Worker-Prozess)"""
+    data = read_station_archives(paths)
+    result = read_station_metadata(paths[-1]) or {'id': station_id}
+    if data.empty:
+        return dict(result, rows=0, start=None, end=None)
+
+    years = list(range(data.index.year.min(), data.index.year.max() + 1))
+    WeatherDataStore(cache_dir).write('daily', station_id, data, years)
+    return dict(result, rows=len(data), start=data.index.min(), end=data.index.max())
+
+def import_archives(archives, cache_dir, max_workers=None):
+    """
+    Übernimmt die Archive vieler Stationen parallel in den Speicher
+
+    Jede Station wird vollständig in einem Worker-Prozess gelesen und geschrieben, sodass
+    nie zwei Prozesse dieselbe Partition schreiben und keine Messwerte zwischen den
+    Prozessen übertragen werden.
+
+    Args:
+        archives: Dictionary {DWD-Stationskennung: ZIP-Dateien} (siehe find_archives)
+        cache_dir: Wurzelverzeichnis des Speichers
+        max_workers: Anzahl der Prozesse (default: Anzahl der CPU-Kerne)
+
+    Returns:
+        DataFrame mit einer Zeile je Station (Index 'id') mit Stationsangaben, Zeilenzahl und Zeitraum
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    results = []
+
+    if max_workers > 1 and len(archives) > 1:
+        # spawn, damit keine Threads des Webservers geforkt werden
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(archives)),
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = {pool.submit(_import_station, cache_dir, station_id, paths): station_id
+                       for station_id, paths in archives.items()}
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f"Fehler beim Import der Station {futures[future]}: {e}")
+    else:
+        for station_id, paths in archives.items():
+            try:
+                results.append(_import_station(cache_dir, station_id, paths))
+            except Exception as e:
+                print(f"Fehler beim Import der Station {station_id}: {e}")
+
+    columns = ['id', 'name', 'country', 'region', 'latitude', 'longitude', 'elevation', 'rows', 'start', 'end']
+    return pd.DataFrame(results, columns=columns).set_index('id').sort_index()
+
+def main():
+    from data_handler import KasselWeatherData
+    from data_sources import DWDArchiveSource
+
+    parser = argparse.ArgumentParser(description="DWD-Tageswerte (Produkt KL) in den lokalen Speicher importieren")
+    parser.add_argument('directory', help="Verzeichnis mit tageswerte_KL_*.zip")
+    parser.add_argument('--cache-dir', default='cache', help="Speicherverzeichnis der Anwendung")
+    parser.add_argument('--stations', nargs='+', help="Nur diese DWD-Stationskennungen importieren")
+    parser.add_argument('--workers', type=int, help="Anzahl der Prozesse (default: Anzahl der CPU-Kerne)")
+    args = parser.parse_args()
+
+    handler = KasselWeatherData(cache_dir=args.cache_dir, source=DWDArchiveSource(args.directory))
+    summary = handler.bulk_import(args.stations, args.workers)
+    print(f"{len(summary)} Stationen, {int(summary['rows'].sum()) if not summary.empty else 0} Tageswerte importiert")
+
+if __name__ == '__main__':
+    main()
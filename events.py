@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+
+# Ereignisse als Folgen von Tagen, an denen eine Bedingung erfüllt ist:
+# (Variable, Vergleich, Schwelle, Mindestdauer in Tagen)
+EVENT_DEFINITIONS = {
+    'heat_wave': ('tmax', '>=', 30.0, 3),
+    'frost_period': ('tmin', '<', 0.0, 3),
+    'dry_spell': ('prcp', '<', 0.1, 5)
+}
+
+# Anzeigenamen der Ereignisse
+EVENT_TITLES = {
+    'heat_wave': 'Hitzewelle',
+    'frost_period': 'Frostperiode',
+    'dry_spell': 'Trockenperiode'
+}
+
+_COMPARISONS = {'>': np.greater, '<': np.less, '>=': np.greater_equal, '<=': np.less_equal}
+
+EVENT_COLUMNS = ['event', 'group', 'start', 'end', 'duration', 'peak', 'mean', 'intensity']
+
+def find_runs(condition, min_length=1):
+    """
+    Findet zusammenhängende Folgen von True-Werten entlang der letzten Achse
+
+    Die Lauflängenkodierung erfolgt über die Differenz der mit False umrandeten Bedingung,
+    sodass alle Zeilen (Stationen, Jahrzehnte, ...) in einem Schritt ausgewertet werden.
+
+    Args:
+        condition: Boolesches Array (Gruppen, Tage) oder (Tage,)
+        min_length: Mindestlänge einer Folge
+
+    Returns:
+        Tupel von Arrays (Gruppe, erster Tag, letzter Tag) je Folge
+    """
+    condition = np.atleast_2d(np.asarray(condition, dtype=bool))
+    groups, days = condition.shape
+    padded = np.zeros((groups, days + 2), dtype=np.int8)
+    padded[:, 1:-1] = condition
+
+    # +1 markiert den Beginn, -1 den Tag nach dem Ende einer Folge
+    edges = np.diff(padded, axis=1)
+    start_group, start = np.nonzero(edges == 1)
+    _, stop = np.nonzero(edges == -1)
+
+    keep = stop - start >= min_length
+    return start_group[keep], start[keep], stop[keep] - 1
+
+def detect_events(values, index, definition, name=None, groups=None):
+    """
+    Ermittelt die Ereignisse einer Definition für viele Gruppen gleichzeitig
+
+    Fehlende Werte unterbrechen ein Ereignis. Höchst- bzw. Tiefstwert, Mittel und
+    Intensität (Summe der Überschreitung der Schwelle, z.B. Gradtage) werden über
+    kumulierte Summen bzw. np.maximum.reduceat je Ereignis berechnet.
+
+    Args:
+        values: Array (Gruppen, Tage) oder (Tage,) der Variable der Definition
+        index: Täglicher, lückenloser DateTimeIndex der Tage-Achse
+        definition: Tupel (Variable, Vergleich, Schwelle, Mindestdauer)
+        name: Name des Ereignistyps für die Spalte 'event'
+        groups: Bezeichnungen der Gruppen (default: 0..n-1)
+
+    Returns:
+        DataFrame mit einer Zeile je Ereignis und den Spalten aus EVENT_COLUMNS
+    """
+    _, op, threshold, min_days = definition
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    with np.errstate(invalid='ignore'):
+        condition = _COMPARISONS[op](values, threshold)
+
+    group, start, end = find_runs(condition, min_days)
+    if len(group) == 0:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+
+    # Innerhalb eines Ereignisses gibt es keine NaN, daher genügen Summen über die flache Folge
+    flat = np.where(condition, values, 0.0).ravel()
+    first = group * values.shape[1] + start
+    last = group * values.shape[1] + end
+    cumulative = np.concatenate([[0.0], np.cumsum(flat)])
+    total = cumulative[last + 1] - cumulative[first]
+    duration = end - start + 1
+
+    # reduceat über die Grenzen [Beginn, Ende + 1) aller Ereignisse; jedes zweite Ergebnis
+    # gehört zu den Lücken zwischen den Ereignissen und wird verworfen
+    bounds = np.column_stack([first, last + 1]).ravel()
+    padded = np.append(flat, 0.0)
+    # Der extremste Wert liegt bei Unterschreitungen im Minimum, sonst im Maximum
+    if op in ('<', '<='):
+        peak = np.minimum.reduceat(padded, bounds)[::2]
+    else:
+        peak = np.maximum.reduceat(padded, bounds)[::2]
+
+    mean = total / duration
+    intensity = np.abs(total - threshold * duration)
+    labels = np.asarray(groups if groups is not None else np.arange(values.shape[0]), dtype=object)
+
+    return pd.DataFrame({
+        'event': name,
+        'group': labels[group],
+        'start': index[start],
+        'end': index[end],
+        'duration': duration,
+        'peak': peak,
+        'mean': mean,
+        'intensity': intensity
+    }, columns=EVENT_COLUMNS)
+
+def batch_events(values, variables, index, names=None, groups=None):
+    """
+    Ermittelt alle Ereignistypen für ein Array (Gruppen, Tage, Variablen)
+
+    Args:
+        values: Array (Gruppen, Tage, Variablen), z.B. StationArray.values
+        variables: Variablennamen der letzten Achse
+        index: Täglicher, lückenloser DateTimeIndex der Tage-Achse
+        names: Ereignistypen aus EVENT_DEFINITIONS (default: alle mit vorhandener Variable)
+        groups: Bezeichnungen der Gruppen
+
+    Returns:
+        DataFrame mit einer Zeile je Ereignis, sortiert nach Typ, Gruppe und Beginn
+    """
+    variables = list(variables)
+    if names is None:
+        names = [name for name, definition in EVENT_DEFINITIONS.items() if definition[0] in variables]
+
+    tables = []
+    for name in names:
+        definition = EVENT_DEFINITIONS[name]
+        if definition[0] not in variables:
+            continue
+        table = detect_events(values[:, :, variables.index(definition[0])], index, definition, name, groups)
+        if not table.empty:
+            tables.append(table)
+
+    if not tables:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+    return pd.concat(tables, ignore_index=True)
+
+def event_table(data, names=None):
+    """
+    Ereignisse in den Tageswerten einer Station
+
+    Lücken im Index werden als fehlende Tage aufgefüllt, damit sie ein Ereignis unterbrechen.
+
+    Args:
+        data: DataFrame mit täglichen Wetterdaten und DateTimeIndex
+        names: Ereignistypen aus EVENT_DEFINITIONS (default: alle mit vorhandener Variable)
+
+    Returns:
+        DataFrame mit einer Zeile je Ereignis (Spalte 'group' ist 0)
+    """
+    variables = sorted({definition[0] for definition in EVENT_DEFINITIONS.values()} & set(data.columns))
+    if data.empty or not variables:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+
+    index = pd.date_range(data.index.min().normalize(), data.index.max().normalize(), freq='D')
+    values = data[variables].reindex(index).to_numpy(dtype=float, na_value=np.nan)
+    return batch_events(values[np.newaxis], variables, index, names)
+
+def event_summary(events):
+    """
+    Kennzahlen je Ereignistyp und Gruppe
+
+    Returns:
+        DataFrame mit Index (Ereignistyp, Gruppe) und den Spalten 'count', 'days',
+        'longest', 'longest_start', 'max_intensity'
+    """
+    if events.empty:
+        return pd.DataFrame(columns=['count', 'days', 'longest', 'longest_start', 'max_intensity'])
+
+    grouped = events.groupby(['event', 'group'])
+    longest = events.loc[grouped['duration'].idxmax()].set_index(['event', 'group'])
+    return pd.DataFrame({
+        'count': grouped.size(),
+        'days': grouped['duration'].sum(),
+        'longest': longest['duration'],
+        'longest_start': longest['start'],
+        'max_intensity': grouped['intensity'].max()
+    })
@@ -0,0 +1,303 @@
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+def _init_worker():
+    """Importiert Plotly, Matplotlib und Kaleido einmal pro Worker-Prozess, damit sie über alle Aufträge geladen bleiben"""
+    # Kein dauerhafter Kaleido-Server: schlägt dessen Start fehl (z.B. ohne Chrome),
+    # blockiert write_image sonst endlos statt einen Fehler zu melden
+    import plotly.io  # noqa: F401
+    import static_renderer  # noqa: F401
+    try:
+        import kaleido  # noqa: F401
+    except ImportError as e:
+        print(f"Kaleido ist nicht verfügbar: {e}")
+
+def _render_figure(figure_json, path):
+    """Rendert eine als JSON übergebene Plotly-Figur in eine Bilddatei (läuft im Worker-Prozess)"""
+    import plotly.io as pio
+    pio.from_json(figure_json).write_image(path)
+    return path
+
+# Auswertungen je Datenversion im Worker-Prozess, damit alle Grafiken eines Auftrags sie teilen
+_worker_bundles = {}
+_WORKER_BUNDLE_LIMIT = 4
+
+# Unterverzeichnis eines Auftrags, in dem die Daten für die Worker-Prozesse liegen
+_DATA_DIR = 'data'
+
+def _render_static(figure_type, variable, title, data_dir, version, path):
+    """
+    Rendert eine Grafik mit Matplotlib (Agg) direkt aus den Daten (läuft im Worker-Prozess)
+
+    Die Daten werden nur gelesen, wenn für die Version noch keine Auswertung im
+    Worker-Prozess vorliegt, statt sie mit jeder Aufgabe zu übertragen.
+    """
+    import pandas as pd
+    from analysis import AnalysisBundle
+    from compact import compact_frame
+    from static_renderer import StaticWeatherRenderer
+
+    bundle = _worker_bundles.get(version)
+    if bundle is None:
+        if len(_worker_bundles) >= _WORKER_BUNDLE_LIMIT:
+            _worker_bundles.pop(next(iter(_worker_bundles)))
+        daily_data = compact_frame(pd.read_parquet(os.path.join(data_dir, 'daily.parquet')))
+        monthly_data = compact_frame(pd.read_parquet(os.path.join(data_dir, 'monthly.parquet')))
+        bundle = _worker_bundles[version] = AnalysisBundle(daily_data, monthly_data)
+
+    StaticWeatherRenderer().render(figure_type, variable, bundle, title=title, save_path=path)
+    return path
+
+class ExportJobManager:
+    """
+    Führt Grafik-Exporte als Hintergrundaufträge in einem Prozess-Pool aus
+
+    Jeder Auftrag schreibt in ein eigenes Verzeichnis. Fortschritt und Abbruchwunsch
+    liegen als Dateien im Auftragsverzeichnis, sodass auch andere Worker-Prozesse
+    des Webservers den Stand abfragen und Aufträge abbrechen können. Beim Start
+    eines Auftrags werden alte Auftragsverzeichnisse nach Alter und Anzahl verdrängt.
+    """
+
+    def __init__(self, base_dir='exports', max_workers=None, max_jobs=50, max_age=7 * 24 * 3600):
+        """
+        Args:
+            base_dir: Wurzelverzeichnis für die Auftragsverzeichnisse
+            max_workers: Anzahl der Render-Prozesse (default: Anzahl der CPU-Kerne)
+            max_jobs: Maximale Anzahl aufbewahrter Auftragsverzeichnisse
+            max_age: Sekunden nach dem letzten Statuswechsel, nach denen ein Auftrag verworfen wird
+        """
+        self.base_dir = base_dir
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_jobs = max_jobs
+        self.max_age = max_age
+        self._pool = None
+        self._jobs = {}
+        # Reentrant, da abgebrochene Futures ihre Callbacks sofort im selben Thread auslösen
+        self._lock = threading.RLock()
+
+    def _get_pool(self):
+        """Erzeugt den Prozess-Pool beim ersten Export (spawn, damit keine Server-Threads geforkt werden)"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+            return self._pool
+
+    def _job_dir(self, job_id):
+        """Verzeichnis eines Auftrags (None bei ungültiger ID)"""
+        try:
+            return os.path.join(self.base_dir, uuid.UUID(job_id).hex)
+        except (TypeError, ValueError):
+            return None
+
+    def _write_status(self, job_dir, status):
+        """Schreibt den Auftragsstatus atomar"""
+        fd, tmp_path = tempfile.mkstemp(dir=job_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(status, f)
+        os.replace(tmp_path, os.path.join(job_dir, 'status.json'))
+
+    def submit(self, figures):
+        """
+        Startet einen Export von Plotly-Figuren (Rendering über Kaleido)
+
+        Args:
+            figures: Dictionary {Dateiname: Plotly Figure-Objekt}
+
+        Returns:
+            ID des Auftrags
+        """
+        job_id, _ = self._create_job()
+        return self._start(job_id, {
+            filename: (_render_figure, (fig.to_json(),))
+            for filename, fig in figures.items()
+        })
+
+    def submit_static(self, charts, daily_data, monthly_data, version):
+        """
+        Startet einen Export mit dem Matplotlib-Renderer (ohne Kaleido/Chrome)
+
+        Args:
+            charts: Dictionary {Dateiname: (Figurtyp, Variable, Titel)}
+            daily_data: DataFrame mit täglichen Wetterdaten
+            monthly_data: DataFrame mit monatlichen Wetterdaten
+            version: Datenversion; Worker berechnen die Auswertungen je Version nur einmal
+
+        Returns:
+            ID des Auftrags
+        """
+        from compact import encode_frame
+
+        # Daten einmal je Auftrag ablegen, die Aufgaben erhalten nur den Pfad
+        job_id, job_dir = self._create_job()
+        data_dir = os.path.join(job_dir, _DATA_DIR)
+        os.makedirs(data_dir)
+        encode_frame(daily_data).to_parquet(os.path.join(data_dir, 'daily.parquet'))
+        encode_frame(monthly_data).to_parquet(os.path.join(data_dir, 'monthly.parquet'))
+
+        return self._start(job_id, {
+            filename: (_render_static, (figure_type, variable, title, data_dir, version))
+            for filename, (figure_type, variable, title) in charts.items()
+        })
+
+    def _create_job(self):
+        """
+        Legt das Verzeichnis eines neuen Auftrags an
+
+        Returns:
+            Tupel (ID des Auftrags, Auftragsverzeichnis)
+        """
+        job_id = uuid.uuid4().hex
+        job_dir = self._job_dir(job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        return job_id, job_dir
+
+    def _start(self, job_id, tasks):
+        """
+        Verteilt die Aufgaben eines Auftrags auf den Prozess-Pool
+
+        Args:
+            job_id: ID des mit _create_job angelegten Auftrags
+            tasks: Dictionary {Dateiname: (Funktion, Argumente ohne Zielpfad)}
+
+        Returns:
+            ID des Auftrags
+        """
+        job_dir = self._job_dir(job_id)
+        status = {
+            'job_id': job_id,
+            'state': 'running',
+            'total': len(tasks),
+            'cancelled': 0,
+            'files': [],
+            'errors': []
+        }
+        self._write_status(job_dir, status)
+        self._evict(keep=job_dir)
+
+        pool = self._get_pool()
+        futures = []
+        with self._lock:
+            self._jobs[job_id] = {'status': status, 'futures': futures}
+
+        for filename, (function, args) in tasks.items():
+            future = pool.submit(function, *args, os.path.join(job_dir, filename))
+            future.add_done_callback(lambda f, name=filename: self._on_done(job_id, name, f))
+            futures.append(future)
+
+        return job_id
+
+    def _on_done(self, job_id, filename, future):
+        """Aktualisiert den Status nach jedem fertigen Bild"""
+        job_dir = self._job_dir(job_id)
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            status = job['status']
+            if future.cancelled():
+                status['cancelled'] += 1
+            elif future.exception() is not None:
+                status['errors'].append(f"{filename}: {future.exception()}")
+            else:
+                status['files'].append(filename)
+
+            cancel_requested = os.path.exists(os.path.join(job_dir, 'cancel'))
+            if cancel_requested and status['state'] == 'running':
+                status['state'] = 'cancelled'
+                for pending in job['futures']:
+                    pending.cancel()
+            finished = len(status['files']) + len(status['errors']) + status['cancelled']
+            if finished >= status['total']:
+                if status['state'] == 'running':
+                    status['state'] = 'error' if status['errors'] else 'done'
+                self._jobs.pop(job_id, None)
+                # Die Daten für die Worker werden nicht mehr benötigt
+                shutil.rmtree(os.path.join(job_dir, _DATA_DIR), ignore_errors=True)
+            self._write_status(job_dir, status)
+
+    def status(self, job_id):
+        """
+        Gibt den Status eines Auftrags zurück
+
+        Returns:
+            Dictionary mit 'state', 'total', 'cancelled', 'files', 'errors' oder None
+        """
+        job_dir = self._job_dir(job_id)
+        if job_dir is None:
+            return None
+        try:
+            with open(os.path.join(job_dir, 'status.json'), encoding='utf-8') as f:
+                status = json.load(f)
+        except (OSError, ValueError):
+            return None
+        status['directory'] = job_dir
+        return status
+
+    def cancel(self, job_id):
+        """Bricht einen Auftrag ab; bereits laufende Bilder werden noch fertig gerendert"""
+        job_dir = self._job_dir(job_id)
+        if job_dir is None or not os.path.isdir(job_dir):
+            return
+        # Abbruchwunsch auch für andere Worker-Prozesse sichtbar machen
+        open(os.path.join(job_dir, 'cancel'), 'w').close()
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job['status']['state'] = 'cancelled'
+            for future in job['futures']:
+                future.cancel()
+            self._write_status(job_dir, job['status'])
+
+    def _evict(self, keep=None):
+        """Entfernt abgelaufene und die ältesten beendeten Aufträge, bis die Grenzen eingehalten sind"""
+        jobs = []
+        try:
+            entries = os.listdir(self.base_dir)
+        except OSError:
+            return
+        for job_id in entries:
+            job_dir = self._job_dir(job_id)
+            if job_dir is None:
+                continue
+            status_path = os.path.join(job_dir, 'status.json')
+            try:
+                last_change = os.path.getmtime(status_path)
+                with open(status_path, encoding='utf-8') as f:
+                    state = json.load(f).get('state')
+            except (OSError, ValueError):
+                continue
+            jobs.append((last_change, state, job_dir))
+
+        count = len(jobs)
+        now = time.time()
+        for last_change, state, job_dir in sorted(jobs):
+            if job_dir == keep:
+                continue
+            expired = now - last_change > self.max_age
+            if not expired and count <= self.max_jobs:
+                break
+            # Laufende Aufträge nur verwerfen, wenn ihr Status veraltet ist (z.B. nach einem Absturz)
+            if state == 'running' and not expired:
+                continue
+            shutil.rmtree(job_dir, ignore_errors=True)
+            count -= 1
+
+    def shutdown(self):
+        """Beendet den Prozess-Pool"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
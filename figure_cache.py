@@ -0,0 +1,121 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+from metrics import CACHE_REQUESTS
+
+# Trace-Attribute, die bei der Größenabschätzung einer Figur berücksichtigt werden
+_DATA_ATTRIBUTES = ('x', 'y', 'z', 'q1', 'median', 'q3', 'lowerfence', 'upperfence', 'mean', 'text')
+
+def data_version(*frames):
+    """
+    Berechnet eine Versionskennung für geladene Daten
+
+    Die Kennung ändert sich, sobald sich Inhalt oder Index eines der DataFrames ändert,
+    sodass zwischengespeicherte Figuren nach einem Nachladen nicht wiederverwendet werden.
+    """
+    version = 0
+    for frame in frames:
+        if frame is None or frame.empty:
+            continue
+        version ^= int(pd.util.hash_pandas_object(frame, index=True).sum()) & 0xFFFFFFFFFFFFFFFF
+        version = (version * 1099511628211) & 0xFFFFFFFFFFFFFFFF
+    return f"{version:016x}"
+
+def estimate_figure_size(fig):
+    """Schätzt den Speicherbedarf einer Plotly-Figur anhand ihrer Datenarrays in Bytes"""
+    size = 0
+    for trace in fig.data:
+        for attribute in _DATA_ATTRIBUTES:
+            try:
+                value = trace[attribute]
+            except (KeyError, ValueError):
+                continue
+            if value is not None:
+                size += np.asarray(value).nbytes
+    return size
+
+class FigureCache:
+    """LRU-Cache für Plotly-Figuren, begrenzt nach Anzahl der Einträge und Speicherbedarf"""
+
+    def __init__(self, max_entries=64, max_bytes=256 * 1024 * 1024):
+        """
+        Args:
+            max_entries: Maximale Anzahl gespeicherter Figuren
+            max_bytes: Maximaler geschätzter Speicherbedarf aller Figuren
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(station_id, start_year, end_year, figure_type, variable=None, version=None):
+        """Erzeugt den Cache-Schlüssel einer Figur"""
+        return (station_id, start_year, end_year, figure_type, variable, version)
+
+    def get(self, key):
+        """Gibt eine gespeicherte Figur zurück oder None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                CACHE_REQUESTS.inc(cache='figures', result='miss')
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            CACHE_REQUESTS.inc(cache='figures', result='hit')
+            return entry[0]
+
+    def put(self, key, fig):
+        """Speichert eine Figur und verdrängt bei Bedarf die am längsten ungenutzten Einträge"""
+        size = estimate_figure_size(fig)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            self._entries[key] = (fig, size)
+            self._size += size
+
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def get_or_create(self, key, builder):
+        """
+        Gibt eine gespeicherte Figur zurück oder erzeugt sie mit `builder`
+
+        Args:
+            key: Cache-Schlüssel (siehe make_key)
+            builder: Funktion ohne Argumente, die die Figur erzeugt
+
+        Returns:
+            Plotly Figure-Objekt
+        """
+        fig = self.get(key)
+        if fig is None:
+            fig = builder()
+            self.put(key, fig)
+        return fig
+
+    def clear(self):
+        """Leert den Cache"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """Gibt Kennzahlen des Caches zurück"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'hits': self.hits,
+                'misses': self.misses
+            }
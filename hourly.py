@@ -0,0 +1,180 @@
+import numpy as np
+import pandas as pd
+
+# Zeitzone für Tagesgang und Tagesgrenzen (Meteostat liefert Stundenwerte in UTC)
+LOCAL_TIMEZONE = 'Europe/Berlin'
+
+# Tageskennwerte aus Stundenwerten: (Stundenvariable, Aggregation) je Spalte
+DAILY_FROM_HOURLY = {
+    'tavg': ('temp', 'mean'),
+    'tmin': ('temp', 'min'),
+    'tmax': ('temp', 'max'),
+    'prcp': ('prcp', 'sum'),
+    'wspd': ('wspd', 'mean'),
+    'wpgt': ('wpgt', 'max'),
+    'pres': ('pres', 'mean'),
+    'rhum': ('rhum', 'mean')
+}
+
+# Mindestanzahl Stundenwerte, ab der ein Tageswert berechnet wird
+MIN_HOURS_PER_DAY = 20
+
+class DailyExtremesAccumulator:
+    """
+    Berechnet Tageskennwerte blockweise aus Stundenwerten (nur die Tageswerte werden behalten)
+
+    Die Stunden des letzten Tages eines Blocks werden zurückgehalten und mit dem nächsten
+    Block verarbeitet, da ein Ortstag über die UTC-Jahresgrenze zweier Blöcke reichen kann.
+    """
+
+    def __init__(self, min_hours=MIN_HOURS_PER_DAY):
+        """
+        Args:
+            min_hours: Mindestanzahl Stundenwerte je Tag und Variable
+        """
+        self.min_hours = min_hours
+        self._frames = []
+        self._carry = None
+
+    @staticmethod
+    def _days(chunk):
+        """Kalendertag je Stunde (in der Zeitzone des Index)"""
+        index = chunk.index.tz_localize(None) if chunk.index.tz is not None else chunk.index
+        return index.normalize()
+
+    def _aggregate(self, chunk):
+        """Tageskennwerte für einen Block vollständiger Tage"""
+        rules = {column: rule for column, rule in DAILY_FROM_HOURLY.items() if rule[0] in chunk.columns}
+        if chunk.empty or not rules:
+            return
+        grouped = chunk.groupby(self._days(chunk))
+        daily = pd.DataFrame({column: grouped[source].agg(how) for column, (source, how) in rules.items()})
+        counts = grouped[sorted({source for source, _ in rules.values()})].count()
+        for column, (source, _) in rules.items():
+            daily[column] = daily[column].where(counts[source].to_numpy() >= self.min_hours)
+        self._frames.append(daily)
+
+    def update(self, chunk):
+        """Verarbeitet einen Block Stundenwerte mit (lokalem) DateTimeIndex"""
+        if self._carry is not None:
+            chunk = pd.concat([self._carry, chunk])
+            self._carry = None
+        if chunk.empty:
+            return
+        days = self._days(chunk)
+        last = days == days.max()
+        self._aggregate(chunk[~last])
+        self._carry = chunk[last]
+
+    def result(self):
+        """
+        Returns:
+            DataFrame mit einer Zeile je Tag (Index 'time')
+        """
+        if self._carry is not None:
+            self._aggregate(self._carry)
+            self._carry = None
+        if not self._frames:
+            return pd.DataFrame(columns=list(DAILY_FROM_HOURLY))
+        result = pd.concat(self._frames).sort_index()
+        result.index.name = 'time'
+        return result
+
+class HourMonthAccumulator:
+    """
+    Summiert Stundenwerte je (Monat, Stunde) für Tagesgänge und Stunde × Monat-Matrizen
+
+    Es werden nur Summen und Anzahlen (12 × 24 je Variable) gehalten, unabhängig von der
+    Anzahl verarbeiteter Stunden.
+    """
+
+    def __init__(self, variables=('temp',)):
+        """
+        Args:
+            variables: Stundenvariablen, für die Matrizen gebildet werden
+        """
+        self.variables = list(variables)
+        self._sum = {variable: np.zeros(12 * 24) for variable in self.variables}
+        self._sum_sq = {variable: np.zeros(12 * 24) for variable in self.variables}
+        self._count = {variable: np.zeros(12 * 24) for variable in self.variables}
+
+    def update(self, chunk):
+        """Verarbeitet einen Block Stundenwerte mit (lokalem) DateTimeIndex"""
+        if chunk.empty:
+            return
+        cell = (chunk.index.month.to_numpy() - 1) * 24 + chunk.index.hour.to_numpy()
+        for variable in self.variables:
+            if variable not in chunk.columns:
+                continue
+            values = chunk[variable].to_numpy(dtype=float)
+            valid = ~np.isnan(values)
+            self._sum[variable] += np.bincount(cell[valid], weights=values[valid], minlength=12 * 24)
+            self._sum_sq[variable] += np.bincount(cell[valid], weights=values[valid]**2, minlength=12 * 24)
+            self._count[variable] += np.bincount(cell[valid], minlength=12 * 24)
+
+    def matrix(self, variable='temp', statistic='mean'):
+        """
+        Stunde × Monat-Matrix einer Variable
+
+        Args:
+            variable: Stundenvariable
+            statistic: 'mean', 'std' oder 'count'
+
+        Returns:
+            DataFrame mit Stunden (0-23) als Index und Monaten (1-12) als Spalten
+        """
+        count = self._count[variable]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = self._sum[variable] / count
+            if statistic == 'mean':
+                values = mean
+            elif statistic == 'std':
+                values = np.sqrt(np.clip((self._sum_sq[variable] - count * mean**2) / (count - 1), 0, None))
+            else:
+                values = count
+        return pd.DataFrame(values.reshape(12, 24).T, index=pd.Index(range(24), name='hour'),
+                            columns=pd.Index(range(1, 13), name='month'))
+
+    def diurnal_profile(self, variable='temp', months=None):
+        """
+        Mittlerer Tagesgang einer Variable (optional nur für ausgewählte Monate)
+
+        Returns:
+            Series mit der Stunde (0-23) als Index
+        """
+        months = list(months) if months is not None else list(range(1, 13))
+        rows = np.array(months) - 1
+        total = self._sum[variable].reshape(12, 24)[rows].sum(axis=0)
+        count = self._count[variable].reshape(12, 24)[rows].sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return pd.Series(total / count, index=pd.Index(range(24), name='hour'), name=variable)
+
+def to_local_time(chunk, timezone=LOCAL_TIMEZONE):
+    """Wandelt einen Block mit UTC-Index in Ortszeit um (naive Indizes gelten als UTC)"""
+    if chunk.empty:
+        return chunk
+    index = chunk.index if chunk.index.tz is not None else chunk.index.tz_localize('UTC')
+    return chunk.set_axis(index.tz_convert(timezone))
+
+def aggregate_hourly(chunks, variables=('temp',), timezone=LOCAL_TIMEZONE):
+    """
+    Verarbeitet einen Strom von Stundenblöcken in einem Durchlauf
+
+    Jeder Block wird nach der Verarbeitung verworfen; gehalten werden nur die
+    Tageswerte und die Summen je (Monat, Stunde).
+
+    Args:
+        chunks: Iterator von DataFrames mit Stundenwerten (UTC)
+        variables: Stundenvariablen für die Stunde × Monat-Matrizen
+        timezone: Zeitzone für Tagesgrenzen und Tagesgang
+
+    Returns:
+        Tupel (DataFrame mit Tageskennwerten, HourMonthAccumulator)
+    """
+    daily = DailyExtremesAccumulator()
+    hour_month = HourMonthAccumulator(variables)
+    for chunk in chunks:
+        chunk = to_local_time(chunk, timezone)
+        daily.update(chunk)
+        hour_month.update(chunk)
+    return daily.result(), hour_month
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+from stations import haversine_km
+
+# Ausdehnung des Landkreises Kassel (einschließlich der Stadt Kassel) als Rechteck
+LANDKREIS_KASSEL_BOUNDS = {
+    'lat_min': 51.20,
+    'lat_max': 51.66,
+    'lon_min': 9.05,
+    'lon_max': 9.75
+}
+
+# Vertikaler Temperaturgradient der Standardatmosphäre in °C pro Meter
+LAPSE_RATE = 0.0065
+
+# Variablen, die vor der Interpolation auf Meereshöhe reduziert werden können
+ELEVATION_DEPENDENT = ('tavg', 'tmin', 'tmax')
+
+def regular_grid(bounds=None, resolution_km=2.0):
+    """
+    Erzeugt ein regelmäßiges Gitter in geographischen Koordinaten
+
+    Args:
+        bounds: Dictionary mit 'lat_min', 'lat_max', 'lon_min', 'lon_max' (default: Landkreis Kassel)
+        resolution_km: Ungefährer Abstand der Gitterpunkte in km
+
+    Returns:
+        Tupel (Breitengrade, Längengrade) der Gitterachsen
+    """
+    bounds = bounds or LANDKREIS_KASSEL_BOUNDS
+    center_lat = (bounds['lat_min'] + bounds['lat_max']) / 2
+    # Ein Breitengrad entspricht ~111 km, ein Längengrad ~111 km * cos(Breite)
+    lat_step = resolution_km / 111.0
+    lon_step = resolution_km / (111.0 * np.cos(np.radians(center_lat)))
+    lats = np.arange(bounds['lat_min'], bounds['lat_max'] + lat_step / 2, lat_step)
+    lons = np.arange(bounds['lon_min'], bounds['lon_max'] + lon_step / 2, lon_step)
+    return lats, lons
+
+class IDWGrid:
+    """
+    Interpolation von Stationswerten auf ein Gitter mit inverser Distanzgewichtung
+
+    Die Gewichtsmatrix (Gitterpunkte × Stationen) wird einmal je Stationsmenge und
+    Gitter berechnet. Die Interpolation aller Tage ist danach eine Matrixmultiplikation;
+    fehlende Stationswerte werden über eine zweite Multiplikation mit der Gültigkeitsmaske
+    aus der Normierung herausgenommen.
+    """
+
+    def __init__(self, station_lats, station_lons, grid_lats, grid_lons, power=2.0,
+                 station_elevations=None, grid_elevations=None, max_distance_km=None):
+        """
+        Args:
+            station_lats: Breitengrade der Stationen
+            station_lons: Längengrade der Stationen
+            grid_lats: Breitengrade der Gitterachse
+            grid_lons: Längengrade der Gitterachse
+            power: Exponent der Distanzgewichtung
+            station_elevations: Höhe der Stationen in m (für die Höhenkorrektur)
+            grid_elevations: Höhe der Gitterpunkte in m, Form (Breiten, Längen); ohne Angabe
+                             wird die Höhe aus den Stationshöhen interpoliert
+            max_distance_km: Stationen weiter entfernt als dieser Wert erhalten kein Gewicht
+        """
+        self.grid_lats = np.asarray(grid_lats, dtype=float)
+        self.grid_lons = np.asarray(grid_lons, dtype=float)
+        self.power = power
+
+        lat_mesh, lon_mesh = np.meshgrid(self.grid_lats, self.grid_lons, indexing='ij')
+        distance = haversine_km(
+            lat_mesh.ravel()[:, np.newaxis], lon_mesh.ravel()[:, np.newaxis],
+            np.asarray(station_lats, dtype=float)[np.newaxis, :], np.asarray(station_lons, dtype=float)[np.newaxis, :]
+        )
+
+        # Gitterpunkte direkt auf einer Station übernehmen deren Wert
+        with np.errstate(divide='ignore'):
+            weights = 1.0 / np.maximum(distance, 1e-6)**power
+        if max_distance_km is not None:
+            weights[distance > max_distance_km] = 0.0
+        self.weights = weights
+
+        self.station_elevations = None
+        self.grid_elevations = None
+        if station_elevations is not None:
+            self.station_elevations = np.asarray(station_elevations, dtype=float)
+            if grid_elevations is None:
+                grid_elevations = self._apply(self.station_elevations[:, np.newaxis])[0]
+            self.grid_elevations = np.asarray(grid_elevations, dtype=float).reshape(-1)
+
+    @property
+    def shape(self):
+        """Form des Gitters (Breiten, Längen)"""
+        return len(self.grid_lats), len(self.grid_lons)
+
+    def _apply(self, values):
+        """
+        Gewichtetes Mittel für alle Gitterpunkte und Zeitschritte
+
+        Args:
+            values: Array (Stationen, Tage) mit NaN für fehlende Werte
+
+        Returns:
+            Array (Tage, Gitterpunkte)
+        """
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+        numerator = self.weights @ filled
+        denominator = self.weights @ valid.astype(float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (numerator / denominator).T
+
+    def interpolate(self, values, elevation_correction=False):
+        """
+        Interpoliert die Stationswerte aller Tage auf das Gitter
+
+        Args:
+            values: Array (Stationen, Tage) oder (Stationen,) mit NaN für fehlende Werte
+            elevation_correction: Temperaturen vor der Interpolation mit dem Standardgradienten
+                                  auf Meereshöhe reduzieren und danach auf die Gitterhöhe umrechnen
+
+        Returns:
+            Array (Tage, Breiten, Längen) bzw. (Breiten, Längen) bei eindimensionaler Eingabe
+        """
+        values = np.asarray(values, dtype=float)
+        single = values.ndim == 1
+        if single:
+            values = values[:, np.newaxis]
+
+        if elevation_correction:
+            if self.station_elevations is None:
+                raise ValueError("Für die Höhenkorrektur werden die Stationshöhen benötigt")
+            elevations = np.nan_to_num(self.station_elevations, nan=np.nanmean(self.station_elevations))
+            values = values + LAPSE_RATE * elevations[:, np.newaxis]
+            grid = self._apply(values) - LAPSE_RATE * self.grid_elevations[np.newaxis, :]
+        else:
+            grid = self._apply(values)
+
+        grid = grid.reshape((grid.shape[0],) + self.shape)
+        return grid[0] if single else grid
+
+    @classmethod
+    def for_stations(cls, stations, bounds=None, resolution_km=2.0, power=2.0, max_distance_km=None):
+        """
+        Erzeugt das Gitter für einen Stations-DataFrame (Spalten 'latitude', 'longitude', 'elevation')
+
+        Args:
+            stations: DataFrame der Stationen in der Reihenfolge der Werte
+            bounds: Gitterausdehnung (default: Landkreis Kassel)
+            resolution_km: Gitterabstand in km
+            power: Exponent der Distanzgewichtung
+            max_distance_km: Maximale Einflussentfernung einer Station
+        """
+        lats, lons = regular_grid(bounds, resolution_km)
+        elevations = stations['elevation'].to_numpy(dtype=float) if 'elevation' in stations.columns else None
+        return cls(stations['latitude'].to_numpy(dtype=float), stations['longitude'].to_numpy(dtype=float),
+                   lats, lons, power=power, station_elevations=elevations, max_distance_km=max_distance_km)
+
+    def to_frame(self, grid):
+        """Ein Gitter (Breiten, Längen) als DataFrame mit Breitengraden als Index und Längengraden als Spalten"""
+        return pd.DataFrame(grid, index=pd.Index(self.grid_lats, name='lat'), columns=pd.Index(self.grid_lons, name='lon'))
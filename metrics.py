@@ -0,0 +1,273 @@
+import functools
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Grenzen der Latenz-Histogramme in Sekunden
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Grenzen der Histogramme für Antwortgrößen in Bytes
+SIZE_BUCKETS = (1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 1e7, 5e7)
+
+# Ab dieser Gesamtdauer wird ein Vorgang mit seinen Stufen protokolliert
+SLOW_OPERATION_SECONDS = 2.0
+
+# Content-Type des Prometheus-Textformats
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def _escape(value):
+    """Maskiert einen Label-Wert für das Prometheus-Textformat"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels):
+    """Formatiert Labels als {name="wert",...} (leer ohne Labels)"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+def _format_value(value):
+    """Formatiert einen Messwert (Ganzzahlen ohne Nachkommastellen)"""
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class _Metric:
+    """Gemeinsame Grundlage der Metriken: Name, Beschreibung und Werte je Label-Kombination"""
+
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        """
+        Args:
+            name: Name der Metrik (z.B. 'wetter_stage_seconds')
+            documentation: Beschreibung für die HELP-Zeile
+            labelnames: Namen der Labels
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        """Label-Werte in der Reihenfolge der Label-Namen"""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} erwartet die Labels {self.labelnames}, erhalten: {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self, const_labels=()):
+        """
+        Zeilen der Metrik im Prometheus-Textformat
+
+        Args:
+            const_labels: Labels (Name, Wert), die jeder Zeile vorangestellt werden
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._samples(list(const_labels) + list(zip(self.labelnames, key)), value))
+        return lines
+
+    def _samples(self, labels, value):
+        return [f"{self.name}{_format_labels(labels)} {_format_value(value)}"]
+
+class Counter(_Metric):
+    """Monoton steigender Zähler"""
+
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("Zähler können nur erhöht werden")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    """Momentanwert (z.B. Größe eines Caches)"""
+
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+class Histogram(_Metric):
+    """Verteilung von Messwerten in festen Klassen (kumulativ wie bei Prometheus)"""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        """
+        Args:
+            buckets: Obergrenzen der Klassen; +Inf wird automatisch ergänzt
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            # Neue Liste, damit render() außerhalb der Sperre eine unveränderte Kopie ausgibt
+            counts = list(counts)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    def _samples(self, labels, value):
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', _format_value(bound))])} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """
+    Sammlung aller Metriken eines Prozesses
+
+    Die Werte liegen im Speicher des Prozesses und werden nicht zwischen Prozessen
+    zusammengeführt. Unter einem Server mit mehreren Worker-Prozessen (z.B. gunicorn -w 4)
+    beantwortet jeweils ein zufälliger Prozess die Abfrage; jede Zeile trägt daher
+    das Label pid, damit die Reihen der Prozesse unterscheidbar bleiben. Vollständige
+    Werte liefert nur ein einzelner Server-Prozess (z.B. gunicorn -w 1 --threads 8).
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        """Gibt die Metrik mit diesem Namen zurück oder legt sie an"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metrik {name} ist bereits als {metric.type} registriert")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self):
+        """Alle Metriken im Prometheus-Textformat, jede Zeile mit der ID des Prozesses"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        # Erst beim Abruf ermitteln, da Worker-Prozesse nach dem Import geforkt werden können
+        const_labels = [('pid', os.getpid())]
+        return '\n'.join(line for metric in metrics for line in metric.render(const_labels)) + '\n'
+
+REGISTRY = MetricsRegistry()
+
+# Vorgänge (Callbacks) und ihre Stufen
+OPERATION_SECONDS = REGISTRY.histogram(
+    'wetter_operation_seconds', "Gesamtdauer eines Vorgangs ohne JSON-Serialisierung durch Dash", ('operation',))
+OPERATION_ERRORS = REGISTRY.counter(
+    'wetter_operation_errors_total', "Vorgänge, die mit einer Ausnahme beendet wurden", ('operation',))
+STAGE_SECONDS = REGISTRY.histogram(
+    'wetter_stage_seconds', "Dauer einer Stufe eines Vorgangs", ('operation', 'stage'))
+RESPONSE_BYTES = REGISTRY.histogram(
+    'wetter_response_bytes', "Größe der Antworten von Dash-Callbacks in Bytes", ('operation',), buckets=SIZE_BUCKETS)
+
+# Datenschicht
+CACHE_REQUESTS = REGISTRY.counter(
+    'wetter_cache_requests_total', "Zugriffe auf Speicher und Caches nach Ergebnis (hit/miss)", ('cache', 'result'))
+FETCHES = REGISTRY.counter(
+    'wetter_fetches_total', "Abrufe bei der Datenquelle nach Ergebnis (ok/empty/error)", ('product', 'result'))
+FETCHED_ROWS = REGISTRY.counter(
+    'wetter_fetched_rows_total', "Von der Datenquelle abgerufene Zeilen", ('product',))
+FETCHED_BYTES = REGISTRY.counter(
+    'wetter_fetched_bytes_total', "Größe der abgerufenen Daten im Arbeitsspeicher in Bytes", ('product',))
+
+_local = threading.local()
+
+class Trace:
+    """Zeitmessung eines Vorgangs mit seinen Stufen"""
+
+    def __init__(self, operation):
+        self.operation = operation
+        self.stages = []
+        self.total = None
+        self._start = time.perf_counter()
+
+    def summary(self):
+        """Einzeilige Zusammenfassung, z.B. 'vorgang: 2.31 s (load_data 2.00 s, figures 0.25 s)'"""
+        stages = ', '.join(f"{stage} {seconds:.2f} s" for stage, seconds in self.stages)
+        return f"{self.operation}: {self.total:.2f} s ({stages})"
+
+def current_trace():
+    """Vorgang, der im aktuellen Thread läuft (oder None)"""
+    return getattr(_local, 'trace', None)
+
+def finished_traces():
+    """Gibt die im aktuellen Thread abgeschlossenen Vorgänge zurück und vergisst sie"""
+    traces = getattr(_local, 'finished', [])
+    _local.finished = []
+    return traces
+
+def traced(operation):
+    """
+    Dekorator: misst die Gesamtdauer einer Funktion als Vorgang
+
+    Stufen innerhalb der Funktion werden mit span() gemessen und dem Vorgang zugeordnet.
+    Vorgänge über SLOW_OPERATION_SECONDS werden mit ihren Stufen ausgegeben.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            trace = Trace(operation)
+            parent, _local.trace = current_trace(), trace
+            try:
+                return function(*args, **kwargs)
+            except Exception:
+                OPERATION_ERRORS.inc(operation=operation)
+                raise
+            finally:
+                _local.trace = parent
+                trace.total = time.perf_counter() - trace._start
+                OPERATION_SECONDS.observe(trace.total, operation=operation)
+                _local.finished = getattr(_local, 'finished', []) + [trace]
+                if trace.total >= SLOW_OPERATION_SECONDS:
+                    print(f"Langsamer Vorgang {trace.summary()}")
+        return wrapper
+    return decorator
+
+@contextmanager
+def span(stage, operation=None):
+    """
+    Misst eine Stufe
+
+    Args:
+        stage: Name der Stufe
+        operation: Vorgang, dem die Stufe zugeordnet wird (default: der laufende Vorgang des Threads;
+                   ohne laufenden Vorgang wird nichts gemessen)
+    """
+    trace = current_trace()
+    if operation is None and trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if operation is None or (trace is not None and trace.operation == operation):
+            trace.stages.append((stage, elapsed))
+        STAGE_SECONDS.observe(elapsed, operation=operation or trace.operation, stage=stage)
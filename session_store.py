@@ -0,0 +1,145 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import pandas as pd
+
+from compact import compact_frame, encode_frame
+
+# Sitzungs-IDs werden als Verzeichnisnamen verwendet und müssen daher streng geprüft werden
+_SESSION_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+class SessionDataStore:
+    """
+    Serverseitiger Speicher für die Daten einer Browser-Sitzung
+
+    Die Daten liegen im Dateisystem, damit alle Worker-Prozesse (z.B. unter gunicorn)
+    auf denselben Stand zugreifen. Alte Sitzungen werden nach Alter, Anzahl und
+    Gesamtgröße verdrängt.
+    """
+
+    def __init__(self, base_dir='sessions', max_sessions=200, max_bytes=2 * 1024**3, max_age=24 * 3600):
+        """
+        Args:
+            base_dir: Verzeichnis für die Sitzungsdaten
+            max_sessions: Maximale Anzahl gespeicherter Sitzungen
+            max_bytes: Maximale Gesamtgröße aller Sitzungen in Bytes
+            max_age: Sekunden ohne Zugriff, nach denen eine Sitzung verworfen wird
+        """
+        self.base_dir = base_dir
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(base_dir, exist_ok=True)
+
+    def _session_dir(self, session_id):
+        """Verzeichnis einer Sitzung (None bei ungültiger ID)"""
+        if not session_id or not _SESSION_ID_PATTERN.match(session_id):
+            return None
+        return os.path.join(self.base_dir, session_id)
+
+    @staticmethod
+    def _write_atomic(path, write):
+        """Schreibt eine Datei über eine temporäre Datei, damit Leser nie halbe Dateien sehen"""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def save(self, session_id, datasets, meta=None):
+        """
+        Speichert die Datensätze einer Sitzung
+
+        Args:
+            session_id: ID der Sitzung
+            datasets: Dictionary {Name: DataFrame}
+            meta: Zusätzliche JSON-serialisierbare Angaben (z.B. Station und Zeitraum)
+        """
+        session_dir = self._session_dir(session_id)
+        if session_dir is None:
+            raise ValueError(f"Ungültige Sitzungs-ID: {session_id!r}")
+        os.makedirs(session_dir, exist_ok=True)
+
+        for name, data in datasets.items():
+            self._write_atomic(os.path.join(session_dir, f"{name}.parquet"), encode_frame(data).to_parquet)
+
+        # Metadaten zuletzt schreiben, sie markieren einen vollständigen Stand
+        meta = dict(meta or {}, datasets=list(datasets))
+
+        def write_meta(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+
+        self._write_atomic(os.path.join(session_dir, 'meta.json'), write_meta)
+        self._evict(keep=session_id)
+
+    def load(self, session_id):
+        """
+        Lädt die Datensätze einer Sitzung
+
+        Returns:
+            Tupel (Dictionary {Name: DataFrame}, Metadaten) oder None, wenn keine Daten vorliegen
+        """
+        session_dir = self._session_dir(session_id)
+        if session_dir is None:
+            return None
+        meta_path = os.path.join(session_dir, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            datasets = {name: compact_frame(pd.read_parquet(os.path.join(session_dir, f"{name}.parquet")))
+                        for name in meta.get('datasets', [])}
+        except Exception as e:
+            print(f"Fehler beim Laden der Sitzungsdaten {session_id}: {e}")
+            return None
+
+        # Zugriffszeit für die Verdrängung aktualisieren
+        os.utime(meta_path)
+        return datasets, meta
+
+    def delete(self, session_id):
+        """Entfernt die Daten einer Sitzung"""
+        session_dir = self._session_dir(session_id)
+        if session_dir is not None:
+            shutil.rmtree(session_dir, ignore_errors=True)
+
+    def _sessions(self):
+        """Liste (letzter Zugriff, Größe in Bytes, ID) aller gespeicherten Sitzungen"""
+        sessions = []
+        for session_id in os.listdir(self.base_dir):
+            session_dir = os.path.join(self.base_dir, session_id)
+            meta_path = os.path.join(session_dir, 'meta.json')
+            try:
+                last_access = os.path.getmtime(meta_path)
+                size = sum(entry.stat().st_size for entry in os.scandir(session_dir) if entry.is_file())
+            except OSError:
+                continue
+            sessions.append((last_access, size, session_id))
+        return sorted(sessions)
+
+    def _evict(self, keep=None):
+        """Verdrängt abgelaufene und die am längsten ungenutzten Sitzungen, bis alle Grenzen eingehalten sind"""
+        sessions = self._sessions()
+        total_bytes = sum(size for _, size, _ in sessions)
+        count = len(sessions)
+        now = time.time()
+
+        for last_access, size, session_id in sessions:
+            if session_id == keep:
+                continue
+            expired = now - last_access > self.max_age
+            if not expired and count <= self.max_sessions and total_bytes <= self.max_bytes:
+                break
+            self.delete(session_id)
+            count -= 1
+            total_bytes -= size
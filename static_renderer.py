@@ -0,0 +1,302 @@
+import numpy as np
+import matplotlib.dates as mdates
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from downsampling import downsample_band, downsample_series
+from visualizations import WeatherVisualizer, VAR_TITLES, VAR_UNITS, format_trend
+
+# Feste Ränder statt tight_layout (das jede Achsenbeschriftung vorab vermisst)
+_MARGINS = dict(left=0.1, right=0.97, bottom=0.1, top=0.84)
+_DASHBOARD_MARGINS = dict(left=0.06, right=0.98, bottom=0.07, top=0.9, hspace=0.35, wspace=0.18)
+
+class StaticWeatherRenderer:
+    """
+    Schneller Bildexport der Wettergrafiken mit Matplotlib (Agg)
+
+    Erzeugt dieselben fünf Diagrammtypen wie der WeatherVisualizer aus denselben
+    Auswertungen eines AnalysisBundle, aber ohne Plotly-JSON und Kaleido/Chrome.
+    Es wird nicht über pyplot gearbeitet, sodass keine globalen Figuren entstehen
+    und mehrere Threads gleichzeitig rendern können.
+    """
+
+    def __init__(self, visualizer=None, dpi=100, points_per_pixel=2):
+        """
+        Args:
+            visualizer: WeatherVisualizer, dessen Farben und Boxplot-Kennwerte verwendet werden
+            dpi: Auflösung der erzeugten Bilder
+            points_per_pixel: Punktbudget je Pixel Bildbreite für lange Linien (LTTB, 0 = alle Punkte)
+        """
+        self.visualizer = visualizer or WeatherVisualizer()
+        self.colors = self.visualizer.colors
+        self.season_colors = self.visualizer.season_colors
+        self.dpi = dpi
+        self.points_per_pixel = points_per_pixel
+
+    def _figure(self, width, height, rows=1, cols=1):
+        """Erzeugt eine Figur mit Agg-Canvas und den Achsen (Größe in Pixeln wie bei Plotly)"""
+        fig = Figure(figsize=(width / self.dpi, height / self.dpi), dpi=self.dpi)
+        FigureCanvasAgg(fig)
+        axes = fig.subplots(rows, cols, squeeze=False)
+        fig.subplots_adjust(**(_DASHBOARD_MARGINS if rows * cols > 1 else _MARGINS))
+        return fig, axes
+
+    def _max_points(self, ax):
+        """Punktbudget einer Linie nach der Breite der Achsen in Pixeln"""
+        if not self.points_per_pixel:
+            return None
+        return int(ax.get_position().width * ax.figure.get_figwidth() * self.dpi * self.points_per_pixel)
+
+    def _save(self, fig, save_path):
+        """Speichert die Figur, falls ein Pfad angegeben ist"""
+        if save_path:
+            fig.savefig(save_path, dpi=self.dpi)
+        return fig
+
+    @staticmethod
+    def _legend(ax):
+        """Horizontale Legende oberhalb der Achsen (wie bei den Plotly-Grafiken)"""
+        ax.legend(loc='lower right', bbox_to_anchor=(1, 1.0), ncol=2, fontsize=8, frameon=False)
+
+    def _draw_temperature(self, ax, bundle, full=True):
+        """Zeichnet den Temperaturverlauf (optional mit Min/Max-Band)"""
+        daily = bundle.daily
+        max_points = self._max_points(ax)
+        if full:
+            # Band auf gemeinsamen Stützstellen, damit Minimum und Maximum zusammenpassen
+            tmin, tmax = downsample_band(daily['tmin'], daily['tmax'], max_points)
+            ax.fill_between(tmax.index, tmin.values, tmax.values, color=self.colors['temp'], alpha=0.1,
+                            linewidth=0, label='Min/Max Temperatur')
+        tavg = downsample_series(daily['tavg'], max_points)
+        rolling_avg = downsample_series(bundle.rolling_tavg, max_points)
+        ax.plot(tavg.index, tavg.values, color=self.colors['temp'], linewidth=0.6, label='Durchschnittstemperatur')
+        ax.plot(rolling_avg.index, rolling_avg.values, color='red', linewidth=2,
+                label='Gleitender Durchschnitt (365 Tage)')
+        ax.set_xlabel('Datum')
+        ax.set_ylabel('Temperatur (°C)')
+
+    def _draw_precipitation(self, ax, bundle):
+        """Zeichnet Monatssummen des Niederschlags und das gleitende Mittel"""
+        monthly_prcp = bundle.monthly_prcp
+        # Alle Monatsbalken als eine PolyCollection statt einzelner Rechtecke (ax.bar)
+        left = mdates.date2num(monthly_prcp.index)
+        right = left + 25
+        heights = np.nan_to_num(monthly_prcp.to_numpy(dtype=float))
+        verts = np.stack([
+            np.column_stack([left, np.zeros_like(left)]),
+            np.column_stack([left, heights]),
+            np.column_stack([right, heights]),
+            np.column_stack([right, np.zeros_like(left)])
+        ], axis=1)
+        ax.add_collection(PolyCollection(verts, facecolors=self.colors['prcp'], edgecolors='none',
+                                         label='Monatlicher Niederschlag'))
+        ax.xaxis_date()
+        ax.autoscale_view()
+        rolling_avg = bundle.rolling_monthly_prcp
+        ax.plot(rolling_avg.index, rolling_avg.values, color='red', linewidth=2,
+                label='Gleitender Durchschnitt (12 Monate)')
+        ax.set_xlabel('Datum')
+        ax.set_ylabel('Niederschlag (mm)')
+
+    def _draw_seasonal(self, ax, bundle, variable, annotate=True):
+        """Zeichnet die saisonalen Boxplots aus den Kennwerten des Bundles"""
+        box, outliers = self.visualizer._box_statistics(bundle.seasonal, variable, bundle)
+        if box.empty:
+            return
+
+        # Boxplots direkt aus den vorberechneten Kennwerten zeichnen
+        stats = [{
+            'label': season,
+            'q1': row['q1'],
+            'med': row['median'],
+            'q3': row['q3'],
+            'mean': row['mean'],
+            'whislo': row['lowerfence'],
+            'whishi': row['upperfence'],
+            'fliers': outliers.get(season, np.array([]))
+        } for season, row in box.iterrows()]
+
+        artists = ax.bxp(stats, showmeans=True, patch_artist=True,
+                         flierprops=dict(marker='o', markersize=3, markeredgewidth=0))
+        for patch, flier, season in zip(artists['boxes'], artists['fliers'], box.index):
+            patch.set_facecolor(self.season_colors[season])
+            patch.set_alpha(0.7)
+            flier.set_markerfacecolor(self.season_colors[season])
+
+        if annotate:
+            # Mittelwerte oberhalb des höchsten Wertes anzeigen
+            highest = max([box['upperfence'].max()] + [values.max() for values in outliers.values()])
+            for position, mean in enumerate(box['mean'], start=1):
+                ax.text(position, highest * 1.1, f"Ø {mean:.1f}", ha='center', fontsize=9)
+            ax.set_ylim(top=max(ax.get_ylim()[1], highest * 1.2))
+
+        ax.set_xlabel('Jahreszeit')
+        ax.set_ylabel(f"{VAR_TITLES.get(variable, variable)} ({VAR_UNITS.get(variable, '')})")
+
+    def _draw_trend(self, ax, bundle, variable, label='Jährlicher Mittelwert', annotate=True):
+        """Zeichnet Jahresmittel und Trendgerade"""
+        yearly_data = bundle.yearly_means[variable]
+        p = bundle.trend(variable)
+        trend = p(range(len(yearly_data)))
+
+        ax.plot(yearly_data.index, yearly_data.values, marker='o', markersize=4, color=self.colors['temp'], label=label)
+        ax.plot(yearly_data.index, trend, color='red', linestyle='--', label='Trend')
+
+        if annotate and len(yearly_data):
+            ax.annotate(format_trend(p.coeffs[0], bundle.trend_test(variable), separator='\n'),
+                        xy=(yearly_data.index[-1], trend[-1]),
+                        xytext=(-20, 30), textcoords='offset points', ha='right', fontsize=9,
+                        arrowprops=dict(arrowstyle='->'), bbox=dict(boxstyle='round', fc='white', alpha=0.8))
+        ax.set_xlabel('Jahr')
+        ax.set_ylabel(f"{VAR_TITLES.get(variable, variable)} ({VAR_UNITS.get(variable, '')})")
+
+    def plot_temperature_trend(self, bundle, title="Temperaturverlauf Kassel", save_path=None):
+        """
+        Liniendiagramm mit dem Temperaturverlauf (Min/Max-Band, Mittel, gleitendes Mittel)
+
+        Args:
+            bundle: AnalysisBundle der Datenladung
+            title: Titel des Diagramms
+            save_path: Wenn angegeben, wird das Diagramm als Datei gespeichert
+
+        Returns:
+            Matplotlib Figure-Objekt
+        """
+        if not all(col in bundle.daily.columns for col in ['tavg', 'tmin', 'tmax']):
+            raise ValueError("Daten müssen die Spalten 'tavg', 'tmin' und 'tmax' enthalten")
+
+        fig, axes = self._figure(700, 500)
+        ax = axes[0, 0]
+        self._draw_temperature(ax, bundle)
+        self._legend(ax)
+        fig.suptitle(title, x=0.02, ha='left')
+        return self._save(fig, save_path)
+
+    def plot_precipitation(self, bundle, title="Niederschlag Kassel", save_path=None):
+        """
+        Balkendiagramm der monatlichen Niederschlagssummen mit gleitendem Mittel
+
+        Args:
+            bundle: AnalysisBundle der Datenladung
+            title: Titel des Diagramms
+            save_path: Wenn angegeben, wird das Diagramm als Datei gespeichert
+
+        Returns:
+            Matplotlib Figure-Objekt
+        """
+        if 'prcp' not in bundle.daily.columns:
+            raise ValueError("Daten müssen die Spalte 'prcp' enthalten")
+
+        fig, axes = self._figure(700, 500)
+        ax = axes[0, 0]
+        self._draw_precipitation(ax, bundle)
+        self._legend(ax)
+        fig.suptitle(title, x=0.02, ha='left')
+        return self._save(fig, save_path)
+
+    def plot_seasonal_comparison(self, bundle, variable='tavg', title=None, save_path=None):
+        """
+        Boxplots der saisonalen Verteilung einer Variable aus vorberechneten Kennwerten
+
+        Args:
+            bundle: AnalysisBundle der Datenladung
+            variable: Zu visualisierende Variable ('tavg', 'prcp', 'wspd', etc.)
+            title: Titel des Diagramms
+            save_path: Wenn angegeben, wird das Diagramm als Datei gespeichert
+
+        Returns:
+            Matplotlib Figure-Objekt
+        """
+        if title is None:
+            title = f"Saisonale Verteilung: {VAR_TITLES.get(variable, variable)} in Kassel"
+
+        fig, axes = self._figure(700, 500)
+        self._draw_seasonal(axes[0, 0], bundle, variable)
+        fig.suptitle(title, x=0.02, ha='left')
+        return self._save(fig, save_path)
+
+    def plot_yearly_trend(self, bundle, variable='tavg', title=None, save_path=None):
+        """
+        Jahresmittel einer Variable mit linearer Trendlinie
+
+        Args:
+            bundle: AnalysisBundle der Datenladung
+            variable: Zu visualisierende Variable ('tavg', 'prcp', 'wspd', etc.)
+            title: Titel des Diagramms
+            save_path: Wenn angegeben, wird das Diagramm als Datei gespeichert
+
+        Returns:
+            Matplotlib Figure-Objekt
+        """
+        if title is None:
+            title = f"Jährlicher Trend: {VAR_TITLES.get(variable, variable)} in Kassel"
+
+        fig, axes = self._figure(700, 500)
+        ax = axes[0, 0]
+        self._draw_trend(ax, bundle, variable)
+        self._legend(ax)
+        fig.suptitle(title, x=0.02, ha='left')
+        return self._save(fig, save_path)
+
+    def plot_weather_dashboard(self, bundle, title="Wetterdashboard Kassel", save_path=None):
+        """
+        Dashboard mit Temperaturverlauf, Niederschlag, Jahreszeiten und Temperaturtrend (2x2)
+
+        Args:
+            bundle: AnalysisBundle der Datenladung
+            title: Titel des Dashboards
+            save_path: Wenn angegeben, wird das Diagramm als Datei gespeichert
+
+        Returns:
+            Matplotlib Figure-Objekt
+        """
+        fig, axes = self._figure(1200, 800, rows=2, cols=2)
+
+        self._draw_temperature(axes[0, 0], bundle, full=False)
+        axes[0, 0].set_title("Temperaturverlauf", fontsize=10)
+
+        if 'prcp' in bundle.daily.columns:
+            self._draw_precipitation(axes[0, 1], bundle)
+        axes[0, 1].set_title("Niederschlag", fontsize=10)
+
+        self._draw_seasonal(axes[1, 0], bundle, 'tavg', annotate=False)
+        axes[1, 0].set_ylabel("Temperatur (°C)")
+        axes[1, 0].set_title("Temperatur nach Jahreszeit", fontsize=10)
+
+        self._draw_trend(axes[1, 1], bundle, 'tavg', label='Jährliche Durchschnittstemperatur', annotate=False)
+        axes[1, 1].set_ylabel("Temperatur (°C)")
+        axes[1, 1].set_title("Jährlicher Temperaturtrend", fontsize=10)
+
+        fig.suptitle(title, x=0.02, ha='left')
+        return self._save(fig, save_path)
+
+    def render(self, figure_type, variable, bundle, title=None, save_path=None):
+        """
+        Erzeugt eine Grafik nach Figurtyp (gleiche Schlüssel wie der Figuren-Cache der App)
+
+        Args:
+            figure_type: 'dashboard', 'temperature', 'precipitation', 'seasonal' oder 'trend'
+            variable: Variable der Grafik (für 'seasonal' und 'trend')
+            bundle: AnalysisBundle der Datenladung
+            title: Titel der Grafik (default: Titel des jeweiligen Diagrammtyps)
+            save_path: Wenn angegeben, wird das Diagramm als Datei gespeichert
+
+        Returns:
+            Matplotlib Figure-Objekt
+        """
+        kwargs = {'save_path': save_path}
+        if title is not None:
+            kwargs['title'] = title
+
+        if figure_type == 'dashboard':
+            return self.plot_weather_dashboard(bundle, **kwargs)
+        if figure_type == 'temperature':
+            return self.plot_temperature_trend(bundle, **kwargs)
+        if figure_type == 'precipitation':
+            return self.plot_precipitation(bundle, **kwargs)
+        if figure_type == 'seasonal':
+            return self.plot_seasonal_comparison(bundle, variable, **kwargs)
+        if figure_type == 'trend':
+            return self.plot_yearly_trend(bundle, variable, **kwargs)
+        raise ValueError(f"Unbekannter Figurtyp: {figure_type}")
@@ -0,0 +1,179 @@
+import numpy as np
+import pandas as pd
+
+from stats_engine import STAT_VARIABLES, THRESHOLD_DAYS, batch_statistics
+from events import batch_events
+
+class StationArray:
+    """
+    Tageswerte mehrerer Stationen als dichtes Array (Station × Tag × Variable)
+
+    Alle Stationen sind auf einen gemeinsamen täglichen DateTimeIndex ausgerichtet.
+    Fehlende Werte sind NaN und zusätzlich in der Maske `missing` markiert, sodass
+    regionale Kennzahlen und Vergleiche als Array-Operationen über alle Stationen
+    gleichzeitig laufen.
+    """
+
+    def __init__(self, values, missing, station_ids, index, variables, stations=None):
+        """
+        Args:
+            values: Array der Form (Stationen, Tage, Variablen) mit NaN für fehlende Werte
+            missing: Boolesches Array derselben Form, True für fehlende Werte
+            station_ids: Stations-IDs in der Reihenfolge der ersten Achse
+            index: Gemeinsamer täglicher DateTimeIndex (zweite Achse)
+            variables: Variablennamen (dritte Achse)
+            stations: Optionaler DataFrame mit Stationsangaben (Name, Koordinaten, Entfernung)
+        """
+        self.values = values
+        self.missing = missing
+        self.station_ids = list(station_ids)
+        self.index = index
+        self.variables = list(variables)
+        self.stations = stations
+
+    @classmethod
+    def from_frames(cls, frames, index, variables=None, stations=None):
+        """
+        Richtet die DataFrames mehrerer Stationen auf einen gemeinsamen Index aus
+
+        Args:
+            frames: Dictionary {Stations-ID: DataFrame mit täglichem DateTimeIndex}
+            index: Gemeinsamer täglicher DateTimeIndex
+            variables: Variablen (default: alle in mindestens einem Frame vorhandenen aus STAT_VARIABLES)
+            stations: Optionaler DataFrame mit Stationsangaben
+
+        Returns:
+            StationArray; Stationen ohne Daten bleiben vollständig als fehlend markiert
+        """
+        if variables is None:
+            present = set().union(*(frame.columns for frame in frames.values())) if frames else set()
+            variables = [col for col in STAT_VARIABLES if col in present]
+
+        # float32 reicht für die Auflösung der Messwerte und halbiert den Speicherbedarf
+        values = np.full((len(frames), len(index), len(variables)), np.nan, dtype=np.float32)
+        for i, data in enumerate(frames.values()):
+            if data.empty:
+                continue
+            # Zeilenpositionen im gemeinsamen Index in einem Schritt bestimmen
+            positions = index.get_indexer(pd.DatetimeIndex(data.index).normalize())
+            inside = positions >= 0
+            block = data.reindex(columns=variables).to_numpy(dtype=np.float32, na_value=np.nan)
+            values[i, positions[inside], :] = block[inside]
+
+        return cls(values, np.isnan(values), frames.keys(), index, variables, stations)
+
+    @property
+    def shape(self):
+        """Form des Arrays (Stationen, Tage, Variablen)"""
+        return self.values.shape
+
+    @property
+    def nbytes(self):
+        """Speicherbedarf von Werten und Maske in Bytes"""
+        return self.values.nbytes + self.missing.nbytes
+
+    def _position(self, variable):
+        """Position einer Variable in der letzten Achse"""
+        if variable not in self.variables:
+            raise KeyError(f"Variable {variable!r} ist nicht geladen")
+        return self.variables.index(variable)
+
+    def variable(self, variable):
+        """Werte einer Variable als Array (Stationen, Tage)"""
+        return self.values[:, :, self._position(variable)]
+
+    def masked(self, variable=None):
+        """Maskiertes Array (ganz oder für eine Variable) für np.ma-Auswertungen"""
+        if variable is None:
+            return np.ma.MaskedArray(self.values, mask=self.missing)
+        i = self._position(variable)
+        return np.ma.MaskedArray(self.values[:, :, i], mask=self.missing[:, :, i])
+
+    def coverage(self):
+        """Anteil vorhandener Tageswerte je Station und Variable"""
+        valid = (~self.missing).mean(axis=1) if len(self.index) else np.zeros((len(self.station_ids), len(self.variables)))
+        return pd.DataFrame(valid, index=pd.Index(self.station_ids, name='station'), columns=self.variables)
+
+    def regional_mean(self, min_stations=1):
+        """
+        Gebietsmittel je Tag über alle Stationen
+
+        Args:
+            min_stations: Mindestanzahl Stationen mit Wert, sonst ist der Tag fehlend
+
+        Returns:
+            DataFrame (Tage × Variablen) mit zusätzlicher Spalte '<variable>_stations'
+        """
+        valid = ~self.missing
+        count = valid.sum(axis=0)
+        total = np.where(valid, self.values, 0.0).sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count >= min_stations, total / count, np.nan)
+
+        result = pd.DataFrame(mean, index=self.index, columns=self.variables)
+        for i, variable in enumerate(self.variables):
+            result[f'{variable}_stations'] = count[:, i]
+        return result
+
+    def deviation_from_regional(self, variable, min_others=1):
+        """
+        Abweichung jeder Station vom Gebietsmittel der übrigen Stationen
+
+        Args:
+            variable: Variable des Vergleichs
+            min_others: Mindestanzahl anderer Stationen mit Wert am selben Tag
+
+        Returns:
+            DataFrame (Tage × Stationen); NaN, wenn die Station oder zu wenige andere Stationen fehlen
+        """
+        values = self.variable(variable)
+        valid = ~self.missing[:, :, self._position(variable)]
+        filled = np.where(valid, values, 0.0)
+
+        # Mittel der jeweils anderen Stationen aus Gesamtsumme minus eigenem Wert
+        others_count = valid.sum(axis=0)[np.newaxis, :] - valid
+        others_sum = filled.sum(axis=0)[np.newaxis, :] - filled
+        with np.errstate(invalid='ignore', divide='ignore'):
+            others_mean = np.where(others_count >= min_others, others_sum / others_count, np.nan)
+        deviation = np.where(valid, values - others_mean, np.nan)
+
+        return pd.DataFrame(deviation.T, index=self.index, columns=self.station_ids)
+
+    def station_statistics(self):
+        """
+        Kennzahlen je Station in einem Durchlauf über das gesamte Array
+
+        Returns:
+            DataFrame mit einer Zeile je Station und Spalten '<variable>_<kennzahl>' sowie Kenntagen
+        """
+        stats = batch_statistics(self.values, self.variables)
+
+        columns = {}
+        for i, variable in enumerate(self.variables):
+            for name in ('mean', 'std', 'max', 'min', 'sum', 'count'):
+                columns[f'{variable}_{name}'] = stats[name][:, i]
+        for name in THRESHOLD_DAYS:
+            if name in stats:
+                columns[name] = stats[name]
+
+        result = pd.DataFrame(columns, index=pd.Index(self.station_ids, name='station'))
+        if self.stations is not None and 'name' in self.stations.columns:
+            result.insert(0, 'name', self.stations['name'].reindex(self.station_ids).to_numpy())
+        return result
+
+    def events(self, names=None):
+        """
+        Hitzewellen, Frost- und Trockenperioden aller Stationen in einem Durchlauf
+
+        Args:
+            names: Ereignistypen aus events.EVENT_DEFINITIONS (default: alle mit geladener Variable)
+
+        Returns:
+            DataFrame mit einer Zeile je Ereignis; die Spalte 'group' enthält die Stations-ID
+        """
+        return batch_events(self.values, self.variables, self.index, names, self.station_ids)
+
+    def to_frame(self, station_id):
+        """Tageswerte einer Station als DataFrame"""
+        i = self.station_ids.index(station_id)
+        return pd.DataFrame(self.values[i], index=self.index, columns=self.variables)
@@ -0,0 +1,181 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy ist optional, ohne KD-Baum wird vektorisiert über alle Stationen gesucht
+    cKDTree = None
+
+# Mittlerer Erdradius in km
+EARTH_RADIUS_KM = 6371.0
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Vektorisierte Großkreisentfernung in km
+
+    Alle Argumente können Skalare oder NumPy-Arrays sein und werden gebroadcastet.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2)**2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+def _unit_vectors(lat, lon):
+    """Wandelt Koordinaten in Einheitsvektoren auf der Kugel um (Sehnenabstand ist monoton zur Entfernung)"""
+    lat, lon = np.radians(np.asarray(lat, dtype=float)), np.radians(np.asarray(lon, dtype=float))
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+class StationIndex:
+    """Index der Wetterstationen für die schnelle Zuordnung von Stations-ID zu Koordinaten"""
+
+    def __init__(self, path=None, ttl=timedelta(days=7)):
+        """
+        Args:
+            path: Parquet-Datei, in der der Stationskatalog zwischengespeichert wird
+            ttl: Gültigkeitsdauer des gespeicherten Katalogs
+        """
+        self.path = path
+        self.ttl = ttl
+        self.stations_df = None
+        self._coords = {}
+        self._xyz = None
+        self._tree = None
+
+    @staticmethod
+    def station_ids(stations_df):
+        """Stations-IDs als Strings (Meteostat liefert sie je nach Version als Index oder Spalte)"""
+        if 'id' in stations_df.columns:
+            return stations_df['id'].astype(str).tolist()
+        return stations_df.index.astype(str).tolist()
+
+    def build(self, stations_df):
+        """Baut den Index aus einem Stations-DataFrame auf"""
+        self.stations_df = stations_df
+        elevation = stations_df['elevation'] if 'elevation' in stations_df.columns else [None] * len(stations_df)
+        self._coords = dict(zip(
+            self.station_ids(stations_df),
+            zip(stations_df['latitude'].tolist(), stations_df['longitude'].tolist(), list(elevation))
+        ))
+        
+        # Räumlicher Index über den gesamten Katalog
+        self._xyz = _unit_vectors(stations_df['latitude'].to_numpy(), stations_df['longitude'].to_numpy())
+        self._tree = cKDTree(self._xyz) if cKDTree is not None and len(self._xyz) else None
+
+    def add(self, stations_df):
+        """Ergänzt den Index um einzeln nachgeschlagene Stationen"""
+        elevation = stations_df['elevation'] if 'elevation' in stations_df.columns else [None] * len(stations_df)
+        self._coords.update(zip(
+            self.station_ids(stations_df),
+            zip(stations_df['latitude'].tolist(), stations_df['longitude'].tolist(), list(elevation))
+        ))
+
+    def get(self, station_id):
+        """
+        Gibt die Koordinaten einer Station zurück
+
+        Returns:
+            Tupel (Breitengrad, Längengrad, Höhe) oder None, wenn die Station unbekannt ist
+        """
+        return self._coords.get(str(station_id))
+
+    def nearest(self, lat, lon, k=5):
+        """
+        Findet die k nächsten Stationen zu einem Punkt
+
+        Args:
+            lat: Breitengrad des Punktes
+            lon: Längengrad des Punktes
+            k: Anzahl der Stationen
+
+        Returns:
+            DataFrame der Stationen, nach Entfernung sortiert, mit Spalte 'distance' in km
+        """
+        if self._xyz is None or not len(self._xyz):
+            return pd.DataFrame(columns=['name', 'latitude', 'longitude', 'elevation', 'distance'])
+
+        k = min(k, len(self._xyz))
+        point = _unit_vectors(lat, lon)[0]
+        if self._tree is not None:
+            _, positions = self._tree.query(point, k=k)
+            positions = np.atleast_1d(positions)
+        else:
+            chord = np.linalg.norm(self._xyz - point, axis=1)
+            positions = np.argpartition(chord, k - 1)[:k]
+        return self._result(positions, lat, lon)
+
+    def within_radius(self, lat, lon, radius_km):
+        """
+        Findet alle Stationen im Umkreis eines Punktes
+
+        Args:
+            lat: Breitengrad des Punktes
+            lon: Längengrad des Punktes
+            radius_km: Suchradius in km
+
+        Returns:
+            DataFrame der Stationen, nach Entfernung sortiert, mit Spalte 'distance' in km
+        """
+        if self._xyz is None or not len(self._xyz):
+            return pd.DataFrame(columns=['name', 'latitude', 'longitude', 'elevation', 'distance'])
+
+        # Großkreisradius in Sehnenlänge auf der Einheitskugel umrechnen
+        chord_radius = 2 * np.sin(min(radius_km / EARTH_RADIUS_KM, np.pi) / 2)
+        point = _unit_vectors(lat, lon)[0]
+        if self._tree is not None:
+            positions = np.asarray(self._tree.query_ball_point(point, chord_radius), dtype=int)
+        else:
+            positions = np.flatnonzero(np.linalg.norm(self._xyz - point, axis=1) <= chord_radius)
+        return self._result(positions, lat, lon)
+
+    def _result(self, positions, lat, lon):
+        """Stationen an den gegebenen Positionen mit Entfernung zum Punkt"""
+        result = self.stations_df.iloc[positions].copy()
+        result['distance'] = haversine_km(lat, lon, result['latitude'].to_numpy(), result['longitude'].to_numpy())
+        return result.sort_values('distance')
+
+    def __contains__(self, station_id):
+        return str(station_id) in self._coords
+
+    def __len__(self):
+        return len(self._coords)
+
+    def is_fresh(self):
+        """Prüft, ob ein gespeicherter Katalog vorliegt und noch gültig ist"""
+        if self.path is None or not os.path.exists(self.path):
+            return False
+        written = datetime.fromtimestamp(os.path.getmtime(self.path))
+        return datetime.now() - written < self.ttl
+
+    def load(self):
+        """
+        Lädt den gespeicherten Stationskatalog, sofern er noch gültig ist
+
+        Returns:
+            DataFrame mit Stationen oder None
+        """
+        if not self.is_fresh():
+            return None
+        try:
+            stations_df = pd.read_parquet(self.path)
+        except Exception as e:
+            print(f"Fehler beim Lesen des Stationskatalogs: {e}")
+            return None
+        self.build(stations_df)
+        return stations_df
+
+    def save(self):
+        """Speichert den aktuellen Stationskatalog"""
+        if self.path is None or self.stations_df is None or self.stations_df.empty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.', suffix='.tmp')
+        os.close(fd)
+        try:
+            self.stations_df.to_parquet(tmp_path)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Fehler beim Speichern des Stationskatalogs: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
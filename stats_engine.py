@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+# Variablen, für die Kennzahlen berechnet werden
+STAT_VARIABLES = ['tavg', 'tmin', 'tmax', 'prcp', 'wspd', 'tsun']
+
+# Schwellenwerte für Kenntage: (Variable, Vergleich, Schwelle)
+THRESHOLD_DAYS = {
+    'rainy_days': ('prcp', '>', 0.0),
+    'frost_days': ('tmin', '<', 0.0),
+    'ice_days': ('tmax', '<', 0.0),
+    'summer_days': ('tmax', '>=', 25.0),
+    'hot_days': ('tmax', '>=', 30.0)
+}
+
+def batch_statistics(values, variables):
+    """
+    Berechnet Kennzahlen für viele Gruppen (Stationen, Jahre, ...) in einem Durchlauf
+
+    Alle Kennzahlen werden aus denselben Zwischenergebnissen (Gültigkeitsmaske, Summe,
+    Quadratsumme) über das gesamte Array berechnet, statt jede Kennzahl einzeln pro
+    Spalte auszuwerten.
+
+    Args:
+        values: Array der Form (Gruppen, Tage, Variablen) mit NaN für fehlende Werte
+        variables: Namen der Variablen in der letzten Achse
+
+    Returns:
+        Dictionary mit Arrays der Form (Gruppen, Variablen) für 'count', 'sum', 'mean',
+        'std', 'max', 'min', 'argmax', 'argmin' sowie Arrays der Form (Gruppen,) für
+        jeden Kenntag aus THRESHOLD_DAYS (sofern die Variable vorhanden ist);
+        ohne gültige Werte (count == 0) sind 'argmax' und 'argmin' -1
+    """
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+
+    count = valid.sum(axis=1)
+    total = filled.sum(axis=1)
+    sum_sq = np.einsum('gdv,gdv->gv', filled, filled)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+        var = (sum_sq - count * mean**2) / (count - 1)
+    std = np.sqrt(np.clip(var, 0, None))
+
+    argmax = np.where(valid, values, -np.inf).argmax(axis=1)
+    argmin = np.where(valid, values, np.inf).argmin(axis=1)
+    maximum = np.take_along_axis(values, argmax[:, None, :], axis=1)[:, 0, :]
+    minimum = np.take_along_axis(values, argmin[:, None, :], axis=1)[:, 0, :]
+    # Ohne gültige Werte liefert argmax die Position 0, die keinen Extremwert bezeichnet
+    argmax = np.where(count > 0, argmax, -1)
+    argmin = np.where(count > 0, argmin, -1)
+
+    result = {
+        'count': count,
+        'sum': total,
+        'mean': mean,
+        'std': std,
+        'max': maximum,
+        'min': minimum,
+        'argmax': argmax,
+        'argmin': argmin
+    }
+
+    positions = {variable: i for i, variable in enumerate(variables)}
+    comparisons = {'>': np.greater, '<': np.less, '>=': np.greater_equal}
+    for name, (variable, op, threshold) in THRESHOLD_DAYS.items():
+        if variable in positions:
+            column = values[:, :, positions[variable]]
+            with np.errstate(invalid='ignore'):
+                result[name] = comparisons[op](column, threshold).sum(axis=1)
+
+    return result
+
+def stack_by_year(data, variables):
+    """
+    Ordnet Tageswerte in ein Array (Jahre, 366 Tage, Variablen) ein
+
+    Returns:
+        Tupel (Array, Jahre, Array der Datumsangaben (Jahre, 366) mit NaT für leere Tage)
+    """
+    years, year_idx = np.unique(data.index.year, return_inverse=True)
+    day_idx = data.index.dayofyear.to_numpy() - 1
+
+    values = np.full((len(years), 366, len(variables)), np.nan)
+    values[year_idx, day_idx, :] = data[variables].to_numpy(dtype=float)
+
+    dates = np.full((len(years), 366), np.datetime64('NaT'), dtype='datetime64[ns]')
+    dates[year_idx, day_idx] = data.index.to_numpy(dtype='datetime64[ns]')
+    return values, years, dates
+
+def statistics_table(data, variables=None):
+    """
+    Kennzahlen je Jahr als DataFrame (eine Zeile pro Jahr)
+
+    Args:
+        data: DataFrame mit täglichen Wetterdaten und DateTimeIndex
+        variables: Variablen (default: alle vorhandenen aus STAT_VARIABLES)
+
+    Returns:
+        DataFrame mit Spalten '<variable>_<kennzahl>' und den Kenntagen
+    """
+    if variables is None:
+        variables = [col for col in STAT_VARIABLES if col in data.columns]
+    if data.empty or not variables:
+        return pd.DataFrame()
+
+    values, years, dates = stack_by_year(data, variables)
+    stats = batch_statistics(values, variables)
+
+    columns = {}
+    for i, variable in enumerate(variables):
+        for name in ('mean', 'std', 'max', 'min', 'sum', 'count'):
+            columns[f'{variable}_{name}'] = stats[name][:, i]
+        has_values = stats['count'][:, i] > 0
+        columns[f'{variable}_max_date'] = np.where(
+            has_values, dates[np.arange(len(years)), stats['argmax'][:, i]], np.datetime64('NaT'))
+        columns[f'{variable}_min_date'] = np.where(
+            has_values, dates[np.arange(len(years)), stats['argmin'][:, i]], np.datetime64('NaT'))
+    for name in THRESHOLD_DAYS:
+        if name in stats:
+            columns[name] = stats[name]
+
+    return pd.DataFrame(columns, index=pd.Index(years, name='year'))
@@ -0,0 +1,300 @@
+import math
+import multiprocessing
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy import special as _special, stats as _stats
+except ImportError:  # scipy ist optional, ohne scipy werden die p-Werte über die Normalverteilung genähert
+    _special = _stats = None
+
+from data_handler import AGGREGATION_RULES, SEASON_NAMES
+from events import find_runs
+from figure_cache import data_version
+
+# Variablen der Trendanalyse
+TREND_VARIABLES = ['tavg', 'tmin', 'tmax', 'prcp', 'wspd', 'tsun']
+
+# Zeiträume je Jahr: das ganze Jahr und die meteorologischen Jahreszeiten
+TREND_PERIODS = ['Jahr'] + SEASON_NAMES
+
+# Mindestanzahl Jahre mit Werten für einen Trend
+MIN_TREND_YEARS = 8
+
+# Mindestanteil an Tagen mit Daten, ab dem ein Jahr bzw. eine Jahreszeit in den Trend eingeht
+MIN_PERIOD_COVERAGE = 0.9
+
+# Irrtumswahrscheinlichkeit für die Kennzeichnung signifikanter Trends
+SIGNIFICANCE_LEVEL = 0.05
+
+TREND_COLUMNS = ['n', 'ols_slope', 'ols_intercept', 'ols_p', 'sen_slope', 'sen_intercept',
+                 'mk_s', 'mk_z', 'mk_p', 'significant']
+
+def _erfc(values):
+    """Komplementäre Fehlerfunktion für Arrays"""
+    if _special is not None:
+        return _special.erfc(values)
+    return np.vectorize(math.erfc, otypes=[float])(values)
+
+def _t_pvalue(t, dof):
+    """Zweiseitiger p-Wert der t-Verteilung (ohne scipy über die Normalverteilung genähert)"""
+    if _stats is not None:
+        return 2 * _stats.t.sf(np.abs(t), dof)
+    return _erfc(np.abs(t) / np.sqrt(2))
+
+def batch_trends(values, x):
+    """
+    OLS-Regression, Sen-Steigung und Mann-Kendall-Test für viele Zeitreihen gleichzeitig
+
+    Alle Paare (i < j) einer Reihe werden als Array (Reihen, Paare) gebildet; daraus
+    ergeben sich Sen-Steigung (Median der Paarsteigungen) und die Mann-Kendall-Statistik S
+    ohne Schleife über die Reihen. Bindungen werden über die Lauflängen der sortierten
+    Werte berücksichtigt.
+
+    Args:
+        values: Array (Reihen, Jahre) mit NaN für fehlende Jahre
+        x: Jahre (Länge der zweiten Achse)
+
+    Returns:
+        Dictionary mit Arrays der Länge Reihen für alle Spalten aus TREND_COLUMNS
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    x = np.asarray(x, dtype=float)
+    rows, years = values.shape
+    valid = ~np.isnan(values)
+    n = valid.sum(axis=1)
+
+    # Reihen ohne Werte erzeugen leere Mediane und Divisionen durch null; sie werden unten auf NaN gesetzt
+    with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        # Kleinste Quadrate nur über vorhandene Jahre
+        x_mean = (valid * x).sum(axis=1) / n
+        y_mean = np.nansum(values, axis=1) / n
+        dx = np.where(valid, x - x_mean[:, np.newaxis], 0.0)
+        dy = np.where(valid, values - y_mean[:, np.newaxis], 0.0)
+        sxx = (dx * dx).sum(axis=1)
+        ols_slope = (dx * dy).sum(axis=1) / sxx
+        ols_intercept = y_mean - ols_slope * x_mean
+        residuals = np.where(valid, values - (ols_intercept[:, np.newaxis] + ols_slope[:, np.newaxis] * x), 0.0)
+        stderr = np.sqrt((residuals * residuals).sum(axis=1) / (n - 2) / sxx)
+        ols_p = _t_pvalue(ols_slope / stderr, np.maximum(n - 2, 1))
+
+        # Paarweise Differenzen (i < j)
+        first, second = np.triu_indices(years, k=1)
+        pair_dy = values[:, second] - values[:, first]
+        pair_dx = x[second] - x[first]
+        sen_slope = np.nanmedian(pair_dy / pair_dx, axis=1) if len(first) else np.full(rows, np.nan)
+        sen_intercept = np.nanmedian(values - sen_slope[:, np.newaxis] * x, axis=1)
+
+        s = np.nansum(np.sign(pair_dy), axis=1)
+        sorted_values = np.sort(values, axis=1)
+        group, start, end = find_runs(sorted_values[:, 1:] == sorted_values[:, :-1])
+        ties = end - start + 2
+        tie_term = np.bincount(group, weights=ties * (ties - 1) * (2 * ties + 5), minlength=rows)
+        variance = (n * (n - 1) * (2 * n + 5) - tie_term) / 18.0
+        z = np.where(s > 0, (s - 1) / np.sqrt(variance), np.where(s < 0, (s + 1) / np.sqrt(variance), 0.0))
+        mk_p = _erfc(np.abs(z) / np.sqrt(2))
+
+    result = {
+        'n': n,
+        'ols_slope': ols_slope,
+        'ols_intercept': ols_intercept,
+        'ols_p': ols_p,
+        'sen_slope': sen_slope,
+        'sen_intercept': sen_intercept,
+        'mk_s': s,
+        'mk_z': z,
+        'mk_p': mk_p
+    }
+    # Zu kurze Reihen erhalten keinen Trend
+    too_short = n < MIN_TREND_YEARS
+    for name in result:
+        if name != 'n':
+            result[name] = np.where(too_short, np.nan, result[name])
+    result['significant'] = result['mk_p'] < SIGNIFICANCE_LEVEL
+    return result
+
+def _period_codes(index, years):
+    """
+    Position (Jahr) jedes Tages für jeden Zeitraum aus TREND_PERIODS (-1: Tag gehört nicht dazu)
+
+    Der Dezember zählt zum Winter des Folgejahres.
+    """
+    year = index.year.to_numpy()
+    month = index.month.to_numpy()
+    season = (month % 12) // 3
+    season_year = year + (month == 12)
+    codes = [year - years[0]]
+    for k in range(len(SEASON_NAMES)):
+        codes.append(np.where(season == k, season_year - years[0], -1))
+    codes = np.stack(codes)
+    codes[(codes < 0) | (codes >= len(years))] = -1
+    return codes
+
+def period_series(values, index, variables):
+    """
+    Jahres- und Jahreszeitenwerte für alle Gruppen und Variablen in einem Durchlauf
+
+    Mittel bzw. Summen je Zeitraum und Jahr werden mit np.bincount über kombinierte
+    Gruppen-/Jahreskodes gebildet. Zeiträume mit weniger als MIN_PERIOD_COVERAGE Tagen
+    mit Daten sind fehlend.
+
+    Args:
+        values: Array (Gruppen, Tage, Variablen) auf einem lückenlosen täglichen Index
+        index: Täglicher DateTimeIndex der Tage-Achse
+        variables: Variablennamen der letzten Achse
+
+    Returns:
+        Tupel (Array (Gruppen, Variablen, Zeiträume, Jahre), Jahre)
+    """
+    groups = values.shape[0]
+    years = np.arange(index.year.min(), index.year.max() + 1)
+    codes = _period_codes(index, years)
+
+    # Kalendertage je Zeitraum und Jahr als Bezug für die Abdeckung
+    calendar = pd.date_range(f'{years[0] - 1}-12-01', f'{years[-1]}-12-31', freq='D')
+    calendar_codes = _period_codes(calendar, years)
+
+    result = np.full((groups, len(variables), len(TREND_PERIODS), len(years)), np.nan)
+    group_offset = (np.arange(groups) * len(years))[:, np.newaxis]
+    for p in range(len(TREND_PERIODS)):
+        inside = codes[p] >= 0
+        expected = np.bincount(calendar_codes[p][calendar_codes[p] >= 0], minlength=len(years))
+        combined = (group_offset + codes[p][inside]).ravel()
+        for v, variable in enumerate(variables):
+            block = values[:, inside, v]
+            valid = ~np.isnan(block)
+            total = np.bincount(combined, weights=np.where(valid, block, 0.0).ravel(), minlength=groups * len(years))
+            count = np.bincount(combined, weights=valid.ravel(), minlength=groups * len(years))
+            total, count = total.reshape(groups, -1), count.reshape(groups, -1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                aggregated = total if AGGREGATION_RULES.get(variable) == 'sum' else total / count
+            result[:, v, p, :] = np.where(count >= MIN_PERIOD_COVERAGE * expected, aggregated, np.nan)
+    return result, years
+
+class TrendEngine:
+    """
+    Trendanalyse für alle Variablen, Jahreszeiten und Stationen mit Ergebnis-Cache
+
+    Ergebnisse werden nach Datenversion zwischengespeichert. Große Stationsmengen werden
+    in Blöcken auf einen Prozess-Pool verteilt.
+    """
+
+    def __init__(self, max_workers=None, parallel_threshold=2000, max_entries=64):
+        """
+        Args:
+            max_workers: Anzahl der Rechenprozesse (default: Anzahl der CPU-Kerne)
+            parallel_threshold: Blockgröße in Zeitreihen; ab zwei Blöcken wird im Prozess-Pool gerechnet
+            max_entries: Maximale Anzahl zwischengespeicherter Ergebnistabellen
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+        self.max_entries = max_entries
+        self._pool = None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        """Erzeugt den Prozess-Pool bei der ersten großen Berechnung (spawn, damit keine Server-Threads geforkt werden)"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+            return self._pool
+
+    def _compute(self, values, x):
+        """
+        Berechnet die Trends in Blöcken von höchstens `parallel_threshold` Reihen
+
+        Die Paar-Arrays wachsen mit Reihen × Jahre², daher werden auch ohne Pool
+        nie alle Reihen auf einmal gerechnet. Ab zwei Blöcken rechnet der Prozess-Pool.
+        """
+        if len(values) <= self.parallel_threshold:
+            return batch_trends(values, x)
+        chunks = np.array_split(values, -(-len(values) // self.parallel_threshold))
+        if self.max_workers < 2:
+            parts = [batch_trends(chunk, x) for chunk in chunks]
+        else:
+            parts = list(self._get_pool().map(batch_trends, chunks, [x] * len(chunks)))
+        return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+    def _cached(self, key, compute):
+        """Gibt eine gespeicherte Tabelle zurück oder berechnet sie einmalig"""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        result = compute()
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return result
+
+    def _table(self, values, index, variables, groups):
+        """Trendtabelle für ein Array (Gruppen, Tage, Variablen)"""
+        series, years = period_series(values, index, variables)
+        stats = self._compute(series.reshape(-1, len(years)), years)
+        labels = pd.MultiIndex.from_product([groups, variables, TREND_PERIODS], names=['station', 'variable', 'period'])
+        return pd.DataFrame({name: stats[name] for name in TREND_COLUMNS}, index=labels)
+
+    def table(self, data, variables=None, version=None):
+        """
+        Trends aller Variablen und Jahreszeiten einer Station
+
+        Args:
+            data: DataFrame mit täglichen Wetterdaten und DateTimeIndex
+            variables: Variablen (default: alle vorhandenen aus TREND_VARIABLES)
+            version: Datenversion für den Cache (default: aus den Daten berechnet)
+
+        Returns:
+            DataFrame mit Index (Variable, Zeitraum) und den Spalten aus TREND_COLUMNS
+        """
+        if variables is None:
+            variables = [col for col in TREND_VARIABLES if col in data.columns]
+        if data.empty or not variables:
+            return pd.DataFrame(columns=TREND_COLUMNS)
+        version = version or data_version(data)
+
+        def compute():
+            index = pd.date_range(data.index.min().normalize(), data.index.max().normalize(), freq='D')
+            values = data[variables].reindex(index).to_numpy(dtype=float, na_value=np.nan)
+            return self._table(values[np.newaxis], index, variables, [None]).droplevel('station')
+
+        return self._cached(('table', version, tuple(variables)), compute)
+
+    def station_table(self, array, variables=None):
+        """
+        Trends aller Stationen, Variablen und Jahreszeiten eines StationArray
+
+        Args:
+            array: StationArray mit lückenlosem täglichem Index
+            variables: Variablen (default: alle geladenen aus TREND_VARIABLES)
+
+        Returns:
+            DataFrame mit Index (Station, Variable, Zeitraum) und den Spalten aus TREND_COLUMNS
+        """
+        if variables is None:
+            variables = [col for col in TREND_VARIABLES if col in array.variables]
+        if not variables or not len(array.index):
+            return pd.DataFrame(columns=TREND_COLUMNS)
+        key = ('stations', tuple(array.station_ids), array.index[0], array.index[-1], tuple(variables),
+               hash(array.values.tobytes()))
+
+        def compute():
+            positions = [array.variables.index(variable) for variable in variables]
+            return self._table(array.values[:, :, positions], array.index, variables, array.station_ids)
+
+        return self._cached(key, compute)
+
+    def shutdown(self):
+        """Beendet den Prozess-Pool"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
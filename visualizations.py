@@ -6,6 +6,54 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from downsampling import downsample_band, downsample_series
+from trends import SIGNIFICANCE_LEVEL, batch_trends
+from analysis import ROLLING_MIN_DAYS, AnalysisBundle
+
+# Anzeigenamen und Einheiten der Variablen (gemeinsam für Plotly- und Matplotlib-Grafiken)
+VAR_TITLES = {
+    'tavg': 'Durchschnittstemperatur',
+    'tmax': 'Maximale Temperatur',
+    'tmin': 'Minimale Temperatur',
+    'prcp': 'Niederschlag',
+    'wspd': 'Windgeschwindigkeit',
+    'tsun': 'Sonnenscheindauer',
+    'temp': 'Lufttemperatur'
+}
+
+VAR_UNITS = {
+    'tavg': '°C',
+    'tmax': '°C',
+    'tmin': '°C',
+    'prcp': 'mm',
+    'wspd': 'km/h',
+    'tsun': 'min',
+    'temp': '°C'
+}
+
+# Monate je Jahreszeit für Tagesgänge (meteorologische Jahreszeiten)
+SEASON_MONTHS = {
+    'Winter': (12, 1, 2),
+    'Frühling': (3, 4, 5),
+    'Sommer': (6, 7, 8),
+    'Herbst': (9, 10, 11)
+}
+
+def format_trend(slope, test, separator='<br>'):
+    """
+    Beschriftung einer Trendgeraden mit Sen-Steigung und Mann-Kendall-Test
+
+    Args:
+        slope: Steigung der Regressionsgeraden pro Jahr
+        test: Dictionary mit 'sen_slope' und 'mk_p' (z.B. AnalysisBundle.trend_test)
+        separator: Zeilenumbruch ('<br>' für Plotly, '\n' für Matplotlib)
+    """
+    text = f"Trend: {slope:.3f} pro Jahr"
+    if test is not None and not np.isnan(test['mk_p']):
+        verdict = "signifikant" if test['mk_p'] < SIGNIFICANCE_LEVEL else "nicht signifikant"
+        text += f"{separator}Sen: {test['sen_slope']:.3f} pro Jahr, p = {test['mk_p']:.3f} ({verdict})"
+    return text
+
 class WeatherVisualizer:
     """Klasse zur Visualisierung von Wetterdaten für Kassel"""
     
@@ -31,7 +79,8 @@ class WeatherVisualizer:
             'Herbst': self.colors['autumn']
         }
         
-    def plot_temperature_trend(self, data, title="Temperaturverlauf Kassel", save_path=None):
+    def plot_temperature_trend(self, data, title="Temperaturverlauf Kassel", save_path=None, max_points=None, x_range=None,
+                               bundle=None):
         """
         Erzeugt ein Liniendiagramm mit dem Temperaturverlauf
         
@@ -39,6 +88,9 @@ class WeatherVisualizer:
             data: DataFrame mit Wetterdaten und DateTimeIndex
             title: Titel des Diagramms
             save_path: Wenn angegeben, wird das Diagramm als Datei gespeichert
+            max_points: Punktbudget je Linie; längere Reihen werden per LTTB reduziert
+            x_range: Optionaler sichtbarer Zeitraum (Start, Ende); nur dieser wird übertragen
+            bundle: AnalysisBundle der Datenladung mit bereits berechneten Auswertungen
             
         Returns:
             Plotly Figure-Objekt
@@ -46,34 +98,48 @@ class WeatherVisualizer:
         if not all(col in data.columns for col in ['tavg', 'tmin', 'tmax']):
             raise ValueError("Daten müssen die Spalten 'tavg', 'tmin' und 'tmax' enthalten")
             
-        # Jährliche gleitende Mittelwerte berechnen
-        rolling_avg = data['tavg'].rolling(window=365, center=True).mean()
+        # Jährliche gleitende Mittelwerte berechnen (auf allen Daten, damit Ausschnitte keine Randlücken haben)
+        if bundle is not None:
+            rolling_avg = bundle.rolling_tavg
+        else:
+            rolling_avg = data['tavg'].rolling(window=365, center=True, min_periods=ROLLING_MIN_DAYS).mean()
+        
+        if x_range is not None:
+            data = data.loc[x_range[0]:x_range[1]]
+            rolling_avg = rolling_avg.loc[x_range[0]:x_range[1]]
+        
+        # Band auf gemeinsamen Stützstellen, damit die Füllung Werte desselben Tages verbindet
+        tmin, tmax = downsample_band(data['tmin'], data['tmax'], max_points)
+        tavg = downsample_series(data['tavg'], max_points)
+        rolling_avg = downsample_series(rolling_avg, max_points)
         
         fig = go.Figure()
         
         # Bereich zwischen min und max Temperatur
         fig.add_trace(go.Scatter(
-            x=data.index,
-            y=data['tmax'],
+            x=tmax.index,
+            y=tmax.values,
             fill=None,
             mode='lines',
             line_color='rgba(255, 149, 0, 0.1)',
+            connectgaps=False,
             name='Max Temperatur'
         ))
         
         fig.add_trace(go.Scatter(
-            x=data.index,
-            y=data['tmin'],
+            x=tmin.index,
+            y=tmin.values,
             fill='tonexty', # Füllen des Bereichs zwischen dieser Linie und der vorherigen
             mode='lines',
             line_color='rgba(255, 149, 0, 0.1)',
+            connectgaps=False,
             name='Min Temperatur'
         ))
         
         # Durchschnittstemperatur
         fig.add_trace(go.Scatter(
-            x=data.index,
-            y=data['tavg'],
+            x=tavg.index,
+            y=tavg.values,
             mode='lines',
             line=dict(color=self.colors['temp'], width=1),
             name='Durchschnittstemperatur'
@@ -81,8 +147,8 @@ class WeatherVisualizer:
         
         # Gleitender Mittelwert
         fig.add_trace(go.Scatter(
-            x=data.index,
-            y=rolling_avg,
+            x=rolling_avg.index,
+            y=rolling_avg.values,
             mode='lines',
             line=dict(color='red', width=2),
             name='Gleitender Durchschnitt (365 Tage)'
@@ -101,12 +167,15 @@ class WeatherVisualizer:
             )
         )
         
+        if x_range is not None:
+            fig.update_xaxes(range=[x_range[0], x_range[1]])
+        
         if save_path:
             fig.write_image(save_path)
             
         return fig
     
-    def plot_precipitation(self, data, title="Niederschlag Kassel", save_path=None):
+    def plot_precipitation(self, data, title="Niederschlag Kassel", save_path=None, bundle=None):
         """
         Erzeugt ein Balkendiagramm mit Niederschlagsdaten
         
@@ -114,6 +183,7 @@ class WeatherVisualizer:
             data: DataFrame mit Wetterdaten und DateTimeIndex
             title: Titel des Diagramms
             save_path: Wenn angegeben, wird das Diagramm als Datei gespeichert
+            bundle: AnalysisBundle der Datenladung mit bereits berechneten Auswertungen
             
         Returns:
             Plotly Figure-Objekt
@@ -122,7 +192,10 @@ class WeatherVisualizer:
             raise ValueError("Daten müssen die Spalte 'prcp' enthalten")
             
         # Monatliche Niederschlagssummen berechnen
-        monthly_prcp = data['prcp'].resample('M').sum()
+        if bundle is not None:
+            monthly_prcp = bundle.monthly_prcp
+        else:
+            monthly_prcp = data['prcp'].resample('M').sum()
         
         fig = go.Figure()
         
@@ -134,7 +207,10 @@ class WeatherVisualizer:
         ))
         
         # Gleitender Durchschnitt (12 Monate)
-        rolling_avg = monthly_prcp.rolling(window=12, center=True).mean()
+        if bundle is not None:
+            rolling_avg = bundle.rolling_monthly_prcp
+        else:
+            rolling_avg = monthly_prcp.rolling(window=12, center=True).mean()
         
         fig.add_trace(go.Scatter(
             x=rolling_avg.index,
@@ -162,37 +238,147 @@ class WeatherVisualizer:
             
         return fig
     
-    def plot_seasonal_comparison(self, seasonal_data, variable='tavg', title=None, save_path=None):
+    def seasonal_box_statistics(self, seasonal_data, variable='tavg', max_outliers=50):
+        """
+        Berechnet die Kennwerte der saisonalen Boxplots vektorisiert
+        
+        Quartile, Whisker (1,5-facher Interquartilsabstand nach Tukey) und Ausreißer werden
+        für alle Jahreszeiten in gruppierten Durchläufen bestimmt. Pro Jahreszeit werden
+        höchstens `max_outliers` der extremsten Ausreißer übernommen.
+        
+        Args:
+            seasonal_data: SeasonalView oder Dictionary mit DataFrames für jede Jahreszeit
+            variable: Auszuwertende Variable
+            max_outliers: Maximale Anzahl Ausreißer je Jahreszeit
+            
+        Returns:
+            Tupel (DataFrame mit Kennwerten je Jahreszeit, Dictionary {Jahreszeit: Ausreißer-Array})
+        """
+        season_order = ['Frühling', 'Sommer', 'Herbst', 'Winter']
+        
+        if hasattr(seasonal_data, 'series'):
+            # Saisonale Sicht: Werte direkt mit der Jahreszeit als Index, ohne Teilkopien
+            values = seasonal_data.series(variable).dropna() if variable in seasonal_data.data.columns else pd.Series(dtype=float)
+        else:
+            values = pd.concat(
+                {season: data[variable] for season, data in seasonal_data.items() if variable in data.columns},
+                names=['Jahreszeit']
+            ).dropna() if seasonal_data else pd.Series(dtype=float)
+            if not values.empty:
+                values = pd.Series(values.to_numpy(), index=values.index.get_level_values('Jahreszeit'))
+        
+        if values.empty:
+            return pd.DataFrame(columns=['q1', 'median', 'q3', 'mean', 'lowerfence', 'upperfence']), {}
+        
+        seasons = pd.Categorical(values.index, categories=season_order, ordered=True)
+        values = pd.Series(values.to_numpy(), index=seasons)
+        grouped = values.groupby(level=0, observed=True)
+        
+        quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+        box = pd.DataFrame({
+            'q1': quartiles[0.25],
+            'median': quartiles[0.5],
+            'q3': quartiles[0.75],
+            'mean': grouped.mean()
+        })
+        iqr = box['q3'] - box['q1']
+        
+        # Grenzen je Wert über die Jahreszeit ausrichten und Whisker/Ausreißer bestimmen
+        low_limit = (box['q1'] - 1.5 * iqr).reindex(values.index).to_numpy()
+        high_limit = (box['q3'] + 1.5 * iqr).reindex(values.index).to_numpy()
+        raw = values.to_numpy()
+        inside = (raw >= low_limit) & (raw <= high_limit)
+        
+        box['lowerfence'] = values[inside].groupby(level=0, observed=True).min()
+        box['upperfence'] = values[inside].groupby(level=0, observed=True).max()
+        
+        # Extremste Ausreißer je Jahreszeit (größter Abstand zum Median)
+        outlier_values = values[~inside]
+        distance = np.abs(outlier_values.to_numpy() - box['median'].reindex(outlier_values.index).to_numpy())
+        top = outlier_values.iloc[np.argsort(-distance, kind='stable')].groupby(level=0, observed=True).head(max_outliers)
+        outliers = {season: group.to_numpy() for season, group in top.groupby(level=0, observed=True)}
+        
+        return box, outliers
+    
+    def _box_statistics(self, seasonal_data, variable, bundle=None):
+        """Boxplot-Kennwerte, bei vorhandenem AnalysisBundle nur einmal je Variable berechnet"""
+        if bundle is None:
+            return self.seasonal_box_statistics(seasonal_data, variable)
+        return bundle.cached(('box', variable), lambda: self.seasonal_box_statistics(bundle.seasonal, variable))
+    
+    def _seasonal_box_traces(self, box, outliers, showlegend=True):
+        """Erzeugt go.Box-Traces aus vorberechneten Kennwerten sowie Ausreißer-Punkte"""
+        traces = []
+        for season, row in box.iterrows():
+            traces.append(go.Box(
+                x=[season],
+                q1=[row['q1']],
+                median=[row['median']],
+                q3=[row['q3']],
+                mean=[row['mean']],
+                lowerfence=[row['lowerfence']],
+                upperfence=[row['upperfence']],
+                name=season,
+                marker_color=self.season_colors[season],
+                showlegend=showlegend
+            ))
+            if season in outliers and len(outliers[season]):
+                traces.append(go.Scatter(
+                    x=[season] * len(outliers[season]),
+                    y=outliers[season],
+                    mode='markers',
+                    marker=dict(color=self.season_colors[season], size=4),
+                    name=f"Ausreißer {season}",
+                    showlegend=False
+                ))
+        return traces
+    
+    def plot_seasonal_comparison(self, seasonal_data, variable='tavg', title=None, save_path=None, precomputed=True,
+                                 bundle=None):
         """
         Erzeugt eine Boxplot zur Visualisierung der saisonalen Verteilung einer Variable
         
         Args:
-            seasonal_data: Dictionary mit DataFrames für jede Jahreszeit
+            seasonal_data: SeasonalView oder Dictionary mit DataFrames für jede Jahreszeit
             variable: Zu visualisierende Variable ('tavg', 'prcp', 'wspd', etc.)
             title: Titel des Diagramms
             save_path: Wenn angegeben, wird das Diagramm als Datei gespeichert
+            precomputed: Boxplots aus serverseitig berechneten Quartilen erzeugen, statt alle
+                         Einzelwerte an den Browser zu übertragen
+            bundle: AnalysisBundle der Datenladung; liefert die saisonale Sicht und
+                    zwischengespeicherte Boxplot-Kennwerte (seasonal_data darf dann None sein)
             
         Returns:
             Plotly Figure-Objekt
         """
-        var_titles = {
-            'tavg': 'Durchschnittstemperatur',
-            'tmax': 'Maximale Temperatur',
-            'tmin': 'Minimale Temperatur',
-            'prcp': 'Niederschlag',
-            'wspd': 'Windgeschwindigkeit'
-        }
+        if title is None:
+            title = f"Saisonale Verteilung: {VAR_TITLES.get(variable, variable)} in Kassel"
         
-        var_units = {
-            'tavg': '°C',
-            'tmax': '°C',
-            'tmin': '°C',
-            'prcp': 'mm',
-            'wspd': 'km/h'
-        }
+        if bundle is not None:
+            seasonal_data = bundle.seasonal
         
-        if title is None:
-            title = f"Saisonale Verteilung: {var_titles.get(variable, variable)} in Kassel"
+        if precomputed:
+            box, outliers = self._box_statistics(seasonal_data, variable, bundle)
+            
+            fig = go.Figure(self._seasonal_box_traces(box, outliers))
+            fig.update_layout(
+                title=title,
+                xaxis=dict(title='Jahreszeit', categoryorder='array', categoryarray=list(box.index)),
+                yaxis_title=f"{VAR_TITLES.get(variable, variable)} ({VAR_UNITS.get(variable, '')})",
+                legend_title_text='Jahreszeit'
+            )
+            
+            # Mittelwerte oberhalb des höchsten Wertes anzeigen
+            highest = max([box['upperfence'].max()] + [values.max() for values in outliers.values()])
+            fig.update_layout(annotations=[
+                dict(x=season, y=highest * 1.1, text=f"Ø {mean:.1f}", showarrow=False, font=dict(size=10))
+                for season, mean in box['mean'].items()
+            ])
+            
+            if save_path:
+                fig.write_image(save_path)
+                
+            return fig
             
         # Daten für den Plot vorbereiten
         plot_data = []
@@ -218,7 +404,7 @@ class WeatherVisualizer:
             color='Jahreszeit',
             color_discrete_map=self.season_colors,
             title=title,
-            labels={'Wert': f"{var_titles.get(variable, variable)} ({var_units.get(variable, '')})"}
+            labels={'Wert': f"{VAR_TITLES.get(variable, variable)} ({VAR_UNITS.get(variable, '')})"}
         )
         
         # Statistische Tests und Anmerkungen hinzufügen
@@ -246,7 +432,7 @@ class WeatherVisualizer:
             
         return fig
     
-    def plot_yearly_trend(self, data, variable='tavg', title=None, save_path=None):
+    def plot_yearly_trend(self, data, variable='tavg', title=None, save_path=None, bundle=None):
         """
         Erzeugt ein Liniendiagramm mit einem jährlichen Trend einer Variablen
         
@@ -255,31 +441,19 @@ class WeatherVisualizer:
             variable: Zu visualisierende Variable ('tavg', 'prcp', 'wspd', etc.)
             title: Titel des Diagramms
             save_path: Wenn angegeben, wird das Diagramm als Datei gespeichert
+            bundle: AnalysisBundle der Datenladung mit bereits berechneten Auswertungen
             
         Returns:
             Plotly Figure-Objekt
         """
-        var_titles = {
-            'tavg': 'Durchschnittstemperatur',
-            'tmax': 'Maximale Temperatur',
-            'tmin': 'Minimale Temperatur',
-            'prcp': 'Niederschlag',
-            'wspd': 'Windgeschwindigkeit'
-        }
-        
-        var_units = {
-            'tavg': '°C',
-            'tmax': '°C',
-            'tmin': '°C',
-            'prcp': 'mm',
-            'wspd': 'km/h'
-        }
-        
         if title is None:
-            title = f"Jährlicher Trend: {var_titles.get(variable, variable)} in Kassel"
+            title = f"Jährlicher Trend: {VAR_TITLES.get(variable, variable)} in Kassel"
             
         # Jährliche Mittelwerte berechnen
-        yearly_data = data[variable].groupby(data.index.year).mean()
+        if bundle is not None:
+            yearly_data = bundle.yearly_means[variable]
+        else:
+            yearly_data = data[variable].groupby(data.index.year).mean()
         
         fig = go.Figure()
         
@@ -293,8 +467,7 @@ class WeatherVisualizer:
         ))
         
         # Lineare Trendlinie
-        z = np.polyfit(range(len(yearly_data)), yearly_data.values, 1)
-        p = np.poly1d(z)
+        p = bundle.trend(variable) if bundle is not None else np.poly1d(np.polyfit(range(len(yearly_data)), yearly_data.values, 1))
         
         fig.add_trace(go.Scatter(
             x=yearly_data.index,
@@ -307,7 +480,7 @@ class WeatherVisualizer:
         fig.update_layout(
             title=title,
             xaxis_title='Jahr',
-            yaxis_title=f"{var_titles.get(variable, variable)} ({var_units.get(variable, '')})",
+            yaxis_title=f"{VAR_TITLES.get(variable, variable)} ({VAR_UNITS.get(variable, '')})",
             legend=dict(
                 orientation="h",
                 yanchor="bottom",
@@ -317,12 +490,17 @@ class WeatherVisualizer:
             )
         )
         
-        # Angabe der Trendsteigung
-        slope = z[0]
+        # Angabe der Trendsteigung mit Sen-Steigung und Mann-Kendall-Signifikanz
+        slope = p.coeffs[0]
+        if bundle is not None:
+            test = bundle.trend_test(variable)
+        else:
+            result = batch_trends(yearly_data.to_numpy(dtype=float)[np.newaxis], yearly_data.index.to_numpy())
+            test = {name: values[0] for name, values in result.items()}
         annotations = [dict(
             x=yearly_data.index[-1],
             y=p(len(yearly_data) - 1),
-            text=f"Trend: {slope:.3f} pro Jahr",
+            text=format_trend(slope, test),
             showarrow=True,
             arrowhead=1,
             ax=50,
@@ -336,7 +514,8 @@ class WeatherVisualizer:
             
         return fig
     
-    def plot_weather_dashboard(self, daily_data, monthly_data, title="Wetterdashboard Kassel", save_path=None):
+    def plot_weather_dashboard(self, daily_data, monthly_data, title="Wetterdashboard Kassel", save_path=None, max_points=None,
+                               bundle=None):
         """
         Erzeugt ein Dashboard mit mehreren Wettergrafiken
         
@@ -345,10 +524,15 @@ class WeatherVisualizer:
             monthly_data: DataFrame mit monatlichen Wetterdaten
             title: Titel des Dashboards
             save_path: Wenn angegeben, wird das Diagramm als Datei gespeichert
+            max_points: Punktbudget je Linie im Temperaturverlauf (LTTB)
+            bundle: AnalysisBundle der Datenladung (wird sonst aus daily_data und monthly_data erzeugt)
             
         Returns:
             Plotly Figure-Objekt
         """
+        if bundle is None:
+            bundle = AnalysisBundle(daily_data, monthly_data)
+        
         # Dashboard mit 2x2 Unterplots erstellen
         fig = make_subplots(
             rows=2, 
@@ -366,12 +550,13 @@ class WeatherVisualizer:
         )
         
         # 1. Temperaturverlauf (oben links)
-        rolling_avg = daily_data['tavg'].rolling(window=365, center=True).mean()
+        rolling_avg = downsample_series(bundle.rolling_tavg, max_points)
+        tavg = downsample_series(daily_data['tavg'], max_points)
         
         fig.add_trace(
             go.Scatter(
-                x=daily_data.index,
-                y=daily_data['tavg'],
+                x=tavg.index,
+                y=tavg.values,
                 mode='lines',
                 line=dict(color=self.colors['temp'], width=1),
                 name='Durchschnittstemperatur'
@@ -381,8 +566,8 @@ class WeatherVisualizer:
         
         fig.add_trace(
             go.Scatter(
-                x=daily_data.index,
-                y=rolling_avg,
+                x=rolling_avg.index,
+                y=rolling_avg.values,
                 mode='lines',
                 line=dict(color='red', width=2),
                 name='Gleitender Durchschnitt (365 Tage)'
@@ -391,7 +576,8 @@ class WeatherVisualizer:
         )
         
         # 2. Niederschlag (oben rechts)
-        monthly_prcp = monthly_data['prcp'].resample('M').sum() if 'prcp' in monthly_data.columns else pd.Series()
+        # Monatsdaten sind bereits Monatssummen, ein erneutes Resampling ist nicht nötig
+        monthly_prcp = bundle.monthly_prcp if 'prcp' in daily_data.columns else pd.Series()
         
         if not monthly_prcp.empty:
             fig.add_trace(
@@ -405,7 +591,7 @@ class WeatherVisualizer:
             )
             
             # Gleitender Durchschnitt (12 Monate)
-            rolling_prcp = monthly_prcp.rolling(window=12, center=True).mean()
+            rolling_prcp = bundle.rolling_monthly_prcp
             
             fig.add_trace(
                 go.Scatter(
@@ -419,28 +605,13 @@ class WeatherVisualizer:
             )
         
         # 3. Temperatur nach Jahreszeit (unten links)
-        from data_handler import KasselWeatherData
-        handler = KasselWeatherData()
-        seasonal_data = handler.get_seasonal_data(daily_data)
-        
-        # Daten für den Plot vorbereiten
-        seasons = ['Frühling', 'Sommer', 'Herbst', 'Winter']
-        season_data = []
-        
-        for season in seasons:
-            if season in seasonal_data and 'tavg' in seasonal_data[season].columns:
-                values = seasonal_data[season]['tavg'].dropna().values
-                season_data.append(go.Box(
-                    y=values,
-                    name=season,
-                    marker_color=self.season_colors[season]
-                ))
-        
-        for box in season_data:
-            fig.add_trace(box, row=2, col=1)
+        # Boxplots aus vorberechneten Quartilen
+        box, outliers = self._box_statistics(bundle.seasonal, 'tavg', bundle)
+        for trace in self._seasonal_box_traces(box, outliers, showlegend=False):
+            fig.add_trace(trace, row=2, col=1)
         
         # 4. Jährlicher Temperaturtrend (unten rechts)
-        yearly_data = daily_data['tavg'].groupby(daily_data.index.year).mean()
+        yearly_data = bundle.yearly_means['tavg']
         
         fig.add_trace(
             go.Scatter(
@@ -454,8 +625,7 @@ class WeatherVisualizer:
         )
         
         # Lineare Trendlinie
-        z = np.polyfit(range(len(yearly_data)), yearly_data.values, 1)
-        p = np.poly1d(z)
+        p = bundle.trend('tavg')
         
         fig.add_trace(
             go.Scatter(
@@ -491,4 +661,189 @@ class WeatherVisualizer:
         if save_path:
             fig.write_image(save_path)
             
-        return fig 
\ No newline at end of file
+        return fig 
+    
+    def plot_grid_map(self, grid_frame, stations=None, variable='tavg', title=None, save_path=None):
+        """
+        Erzeugt eine Heatmap interpolierter Gitterwerte mit den Stationen als Punkte
+        
+        Args:
+            grid_frame: DataFrame mit Breitengraden als Index und Längengraden als Spalten
+            stations: DataFrame der Stationen ('latitude', 'longitude', optional 'name') und
+                      optional einer Spalte 'value' mit dem Stationswert
+            variable: Dargestellte Variable ('tavg', 'prcp', etc.)
+            title: Titel des Diagramms
+            save_path: Wenn angegeben, wird das Diagramm als Datei gespeichert
+            
+        Returns:
+            Plotly Figure-Objekt
+        """
+        if title is None:
+            title = f"Räumliche Verteilung: {VAR_TITLES.get(variable, variable)} im Landkreis Kassel"
+        unit = VAR_UNITS.get(variable, '')
+        
+        fig = go.Figure()
+        fig.add_trace(go.Heatmap(
+            x=grid_frame.columns.to_numpy(),
+            y=grid_frame.index.to_numpy(),
+            z=grid_frame.to_numpy(),
+            colorscale='Blues' if variable == 'prcp' else 'RdYlBu_r',
+            colorbar=dict(title=unit),
+            hovertemplate=f"%{{y:.3f}}° N, %{{x:.3f}}° O<br>%{{z:.1f}} {unit}<extra></extra>",
+            name=VAR_TITLES.get(variable, variable)
+        ))
+        
+        if stations is not None and not stations.empty:
+            names = stations['name'] if 'name' in stations.columns else pd.Series('', index=stations.index)
+            if 'value' in stations.columns:
+                labels = [f"{name}: {value:.1f} {unit}" for name, value in zip(names, stations['value'])]
+            else:
+                labels = list(names)
+            fig.add_trace(go.Scatter(
+                x=stations['longitude'],
+                y=stations['latitude'],
+                mode='markers',
+                marker=dict(color='black', size=7, symbol='triangle-up'),
+                text=labels,
+                hoverinfo='text',
+                name='Wetterstationen'
+            ))
+        
+        fig.update_layout(
+            title=title,
+            xaxis=dict(title='Längengrad', range=[grid_frame.columns.min(), grid_frame.columns.max()]),
+            # Seitenverhältnis an die Breite anpassen, damit die Karte nicht verzerrt ist
+            yaxis=dict(title='Breitengrad', scaleanchor='x',
+                       scaleratio=1 / np.cos(np.radians(float(np.mean(grid_frame.index)))),
+                       range=[grid_frame.index.min(), grid_frame.index.max()]),
+            showlegend=False
+        )
+        
+        if save_path:
+            fig.write_image(save_path)
+            
+        return fig
+    
+    def plot_diurnal_cycle(self, hour_month, variable='temp', title=None, save_path=None):
+        """
+        Erzeugt eine Stunde × Monat-Heatmap und die mittleren Tagesgänge je Jahreszeit
+        
+        Args:
+            hour_month: HourMonthAccumulator mit den Summen der Stundenwerte
+            variable: Dargestellte Stundenvariable ('temp', 'rhum', etc.)
+            title: Titel des Diagramms
+            save_path: Wenn angegeben, wird das Diagramm als Datei gespeichert
+            
+        Returns:
+            Plotly Figure-Objekt
+        """
+        if title is None:
+            title = f"Tagesgang: {VAR_TITLES.get(variable, variable)} Kassel"
+        unit = VAR_UNITS.get(variable, '')
+        matrix = hour_month.matrix(variable)
+        
+        fig = make_subplots(
+            rows=1, cols=2,
+            subplot_titles=("Stunde × Monat", "Mittlerer Tagesgang je Jahreszeit"),
+            column_widths=[0.55, 0.45],
+            horizontal_spacing=0.12
+        )
+        
+        month_names = ['Jan', 'Feb', 'Mär', 'Apr', 'Mai', 'Jun', 'Jul', 'Aug', 'Sep', 'Okt', 'Nov', 'Dez']
+        fig.add_trace(go.Heatmap(
+            x=month_names,
+            y=matrix.index.to_numpy(),
+            z=matrix.to_numpy(),
+            colorscale='RdYlBu_r',
+            colorbar=dict(title=unit, x=0.46),
+            hovertemplate=f"%{{x}}, %{{y}} Uhr<br>%{{z:.1f}} {unit}<extra></extra>",
+            name=VAR_TITLES.get(variable, variable)
+        ), row=1, col=1)
+        
+        for season, months in SEASON_MONTHS.items():
+            profile = hour_month.diurnal_profile(variable, months)
+            fig.add_trace(go.Scatter(
+                x=profile.index,
+                y=profile.to_numpy(),
+                mode='lines+markers',
+                name=season,
+                line=dict(color=self.season_colors[season])
+            ), row=1, col=2)
+        
+        fig.update_yaxes(title_text='Stunde (Ortszeit)', autorange='reversed', row=1, col=1)
+        fig.update_xaxes(title_text='Stunde (Ortszeit)', dtick=3, row=1, col=2)
+        fig.update_yaxes(title_text=unit, row=1, col=2)
+        fig.update_layout(title=title, hovermode='closest')
+        
+        if save_path:
+            fig.write_image(save_path)
+            
+        return fig
+    
+    def plot_anomalies(self, anomaly_data, variable='tavg', reference=(1991, 2020), title=None, save_path=None):
+        """
+        Erzeugt ein Diagramm der Abweichungen vom Normalwert (Monats- und Jahresmittel)
+        
+        Args:
+            anomaly_data: DataFrame mit täglichen Abweichungen und DateTimeIndex
+            variable: Zu visualisierende Variable ('tavg', 'prcp', etc.)
+            reference: Referenzperiode der Normalwerte (Startjahr, Endjahr)
+            title: Titel des Diagramms
+            save_path: Wenn angegeben, wird das Diagramm als Datei gespeichert
+            
+        Returns:
+            Plotly Figure-Objekt
+        """
+        if title is None:
+            title = f"Abweichung vom Normalwert {reference[0]}-{reference[1]}: {VAR_TITLES.get(variable, variable)}"
+        unit = VAR_UNITS.get(variable, '')
+        
+        series = anomaly_data[variable]
+        monthly = series.resample('MS').mean()
+        yearly = series.groupby(series.index.year).mean()
+        
+        fig = make_subplots(
+            rows=2, cols=1,
+            subplot_titles=("Monatsmittel der Abweichung", "Jahresmittel der Abweichung"),
+            vertical_spacing=0.12
+        )
+        
+        # Positive Abweichungen rot, negative blau (bei Niederschlag umgekehrt: trocken = rot)
+        positive, negative = ('#1E88E5', '#E53935') if variable == 'prcp' else ('#E53935', '#1E88E5')
+        
+        fig.add_trace(go.Bar(
+            x=monthly.index,
+            y=monthly.values,
+            marker_color=np.where(monthly.values >= 0, positive, negative),
+            name='Monatsmittel'
+        ), row=1, col=1)
+        
+        fig.add_trace(go.Scatter(
+            x=monthly.index,
+            y=monthly.rolling(window=12, center=True, min_periods=6).mean().values,
+            mode='lines',
+            name='Gleitendes 12-Monats-Mittel',
+            line=dict(color='black', width=2)
+        ), row=1, col=1)
+        
+        fig.add_trace(go.Bar(
+            x=yearly.index,
+            y=yearly.values,
+            marker_color=np.where(yearly.values >= 0, positive, negative),
+            name='Jahresmittel',
+            showlegend=False
+        ), row=2, col=1)
+        
+        fig.update_yaxes(title_text=f"Abweichung ({unit})", row=1, col=1)
+        fig.update_yaxes(title_text=f"Abweichung ({unit})", row=2, col=1)
+        fig.update_xaxes(title_text='Jahr', row=2, col=1)
+        fig.update_layout(
+            title=title,
+            bargap=0,
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+        
+        if save_path:
+            fig.write_image(save_path)
+            
+        return fig